@@ -1,7 +1,7 @@
 import asyncio
-import json
 import os
 import sqlite3
+from functools import partial
 from pathlib import Path
 from typing import List, Optional
 
@@ -10,11 +10,13 @@ from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 
 # core exchange + live engine
-from exchange import init_exchange, fetch_ohlcv
+from execution import get_async_exchange
+from ohlcv_store import load_ohlcv, to_rows
 from logger import setup_logger
 from notifications import send_telegram
 from db import init_db, log_trade_db
 from config import (
+    SYMBOL,
     SYMBOLS,
     TIMEFRAME,
     USDT_AMOUNT,
@@ -28,19 +30,26 @@ from config import (
     MACD_SIGNAL_PERIOD,
     FEE_PCT,
     SLIPPAGE_PCT,
+    MC_GRID_PATHS,
+    SYNTHETIC_FEED,
+    STOP_TICK_STREAM,
 )
-from utils.indicators import atr
+from utils.streaming import Atr
+from utils.indicator_context import StreamingContext
+from utils.bar_buffer import BarBuffer
+from utils.stop_book import StopBook, stop_level
 from strategies.sma_crossover import SmaCrossover
 from strategies.rsi import RsiStrategy
 from strategies.macd import MacdStrategy
 from strategies.bollinger import BollingerStrategy
 
 # backtest endpoints
-from backtests.grid_backtest import grid_search_with_winrate
-from backtests.backtest_macd import run_backtest_macd
+from backtests.grid_backtest import sma_sweep
+from backtests.backtest_macd import macd_sweep
+from backtests.result_cache import ResultCache
 
 # real-time data feeder
-from realtime import Realtime
+from realtime import MultiTimeframe, get_feed_manager
 
 # ─── FastAPI setup ──────────────────────────────────────────────────────────
 app = FastAPI()
@@ -57,6 +66,7 @@ BASE_DIR = Path(__file__).resolve().parents[2]
 DB_PATH = BASE_DIR / "data" / "trades.db"
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 redis_client = redis.Redis.from_url(REDIS_URL, decode_responses=True)
+result_cache = ResultCache(redis_client)
 
 BOT_STATE_KEY = "bot:state"
 DRAWDOWN_KEY = "bot:drawdown_threshold"
@@ -77,10 +87,21 @@ def format_message(symbol, strategy_name, side, amount, price, reason=None):
         msg += f" ({reason})"
     return msg
 
+def record_trade(symbol, strategy_name, side, price, amount, reason=None):
+    """
+    Log a trade to the DB and notify Telegram. Both block, so the engine
+    runs this on an executor thread, never on the event loop.
+    """
+    log_trade_db(symbol, strategy_name, side, price, float(amount), price * float(amount), reason)
+    send_telegram(format_message(symbol, strategy_name, side, amount, price, reason))
+
 # ─── Real-time engine per-symbol ─────────────────────────────────────────────
 async def run_symbol(symbol: str):
     log = setup_logger()
-    exchange = init_exchange()
+    # shared non-blocking exchange; strategies read balances from its local ledger
+    exchange = get_async_exchange()
+    exchange.start()
+    await exchange.initial_balance()
 
     # instantiate strategies
     strategy_objs = []
@@ -96,38 +117,93 @@ async def run_symbol(symbol: str):
             })
         strategy_objs.append(cls(exchange, params))
 
-    ws_slow = Realtime(symbol=symbol, interval=TIMEFRAME)
-    ws_fast = Realtime(symbol=symbol, interval="1m")
-
-    # emergency stop-loss monitor
+    # one 1m stream per symbol; the strategy timeframe is resampled from it locally
+    feeds = MultiTimeframe(symbol)
+    ws_slow = feeds.feed(TIMEFRAME)
+    ws_fast = feeds.feed("1m")
+
+    def report_order(strategy_name, side, amount, task):
+        try:
+            order = task.result()
+            log.info(f"[{symbol}] {strategy_name}: {side.upper()} {amount} @ {order['price']:.2f}")
+        except Exception as e:
+            log.error(f"Order failed for {symbol} {side} {amount}: {e}")
+
+    def record(strategy_name, side, price, amount, reason=None):
+        # DB and Telegram run off the loop so a slow one never stalls the other symbols
+        asyncio.get_running_loop().run_in_executor(
+            None, record_trade, symbol, strategy_name, side, price, amount, reason
+        )
+
+    def emergency_exit(strat, price):
+        stops.remove(strat)
+        peaks.pop(strat, None)
+        asset = symbol.split("/")[0]
+        bal = exchange.fetch_balance()["free"].get(asset, 0)
+        limits = exchange.markets.get(symbol, {}).get("limits", {})
+        min_amt = limits.get("amount", {}).get("min") or 0
+        if 0 < bal < min_amt:
+            # dust can't be sold (amount_to_precision would raise); the position is gone
+            log.info(f"[EMERGENCY][{symbol}] {bal:.8f} {asset} is below min {min_amt}; nothing to sell")
+            strat.on_stopped()
+        elif bal > 0:
+            amt = exchange.amount_to_precision(symbol, bal)
+            name = strat.__class__.__name__
+            if not PAPER_TRADING:
+                order = exchange.submit_order(symbol, "sell", amt)
+                order.add_done_callback(partial(report_order, name, "sell", amt))
+            log.info(f"[EMERGENCY][{'PAPER' if PAPER_TRADING else ''}][{symbol}] SELL {amt} @ {price:.2f}")
+            strat.on_stopped()
+            record(name, "sell", price, amt, "stop-loss-emergency")
+
+    # tick-level stops: every open stop checked against each bid/trade price
+    stops = StopBook()
+    peaks = {}   # highest 1m close since entry, per strategy with a trailing stop
+
+    def arm_stop(strat, price):
+        # stop_levels() as a single level in the book; the trail follows the
+        # 1m closes from entry, as backtests.engine does with fine_bars
+        stop, trail = strat.stop_levels()
+        if trail is None:
+            peaks.pop(strat, None)
+        else:
+            peaks[strat] = max(peaks.get(strat, price), price)
+        level = stop_level(stop, trail, peaks.get(strat))
+        stops.set(strat, level)
+        return level
+
+    # emergency stop monitor on 1m closes (always on, the fallback for ticks)
     async def monitor_emergency():
         async for bar in ws_fast.ohlcv_stream():
             price = bar[4]
             for strat in strategy_objs:
-                if getattr(strat, "stop_loss_price", None) and price <= strat.stop_loss_price:
-                    asset = symbol.split("/")[0]
-                    bal = exchange.fetch_balance()["free"].get(asset, 0)
-                    if bal > 0:
-                        amt = exchange.amount_to_precision(symbol, bal)
-                        cost = price * float(amt)
-                        log_trade_db(symbol, strat.__class__.__name__, "sell", price, float(amt), cost, "stop-loss-emergency")
-                        send_telegram(format_message(symbol, strat.__class__.__name__, "sell", amt, price, "stop-loss-emergency"))
-                        log.info(f"[EMERGENCY][{'PAPER' if PAPER_TRADING else ''}][{symbol}] SELL {amt} @ {price:.2f}")
+                level = arm_stop(strat, price)
+                if level is not None and price <= level:
+                    emergency_exit(strat, price)
     asyncio.create_task(monitor_emergency())
 
+    if STOP_TICK_STREAM and not SYNTHETIC_FEED:
+        def on_tick(price):
+            if price <= stops.trigger:
+                for strat in stops.hit(price):
+                    emergency_exit(strat, price)
+        get_feed_manager().add_tick_listener(symbol, STOP_TICK_STREAM, on_tick)
+
     # main loop (slow feed)
     max_period = max(getattr(s, "slow", getattr(s, "period", 0)) for s in strategy_objs)
     ohlcv_limit = max_period + 1
-    bars = []
+    bars = BarBuffer(ohlcv_limit)
+    atr_stream = Atr(ATR_PERIOD)
+    # one streaming indicator set per symbol, shared by every strategy below
+    ctx = StreamingContext(bars)
 
     log.info(f"▶️ Starting engine for {symbol}")
     async for candle in ws_slow.ohlcv_stream():
         bars.append(candle)
-        if len(bars) > ohlcv_limit:
-            bars = bars[-ohlcv_limit:]
+        ctx.push(candle)
 
-        last_price = bars[-1][4]
-        current_atr = atr(bars, ATR_PERIOD)
+        last_price = candle[4]
+        current_atr = atr_stream.update(candle)
         volatility = current_atr / last_price if last_price else 0
         is_trending = volatility > ATR_THRESHOLD
         log.info(f"[{symbol}] Volatility: {volatility:.3%} → {'Trending' if is_trending else 'Ranging'}")
@@ -138,17 +214,16 @@ async def run_symbol(symbol: str):
             if isinstance(strat, RsiStrategy) and is_trending: continue
             if isinstance(strat, BollingerStrategy) and is_trending: continue
 
-            sig = strat.on_bar(bars)
+            sig = strat.on_bar(bars, ctx)
+            arm_stop(strat, last_price)
             if not sig: continue
 
             side, raw_amt = sig["side"], sig["amount"]
             reason = sig.get("reason")
             price = last_price
-            cost = price * float(raw_amt)
 
             # log + notify
-            log_trade_db(symbol, strat.__class__.__name__, side, price, float(raw_amt), cost, reason)
-            send_telegram(format_message(symbol, strat.__class__.__name__, side, raw_amt, price, reason))
+            record(strat.__class__.__name__, side, price, raw_amt, reason)
 
             if PAPER_TRADING:
                 log.info(f"[PAPER][{symbol}] {strat.__class__.__name__}: {side.upper()} {raw_amt} @ {price:.2f}")
@@ -160,11 +235,9 @@ async def run_symbol(symbol: str):
                     log.info(f"Skipped {symbol} {side} {amt:.8f} — below min {min_amt}")
                     continue
                 precise_amt = exchange.amount_to_precision(symbol, amt)
-                try:
-                    order = exchange.create_market_order(symbol, side, precise_amt)
-                    log.info(f"[{symbol}] {strat.__class__.__name__}: {side.upper()} {precise_amt} @ {order['price']:.2f}")
-                except Exception as e:
-                    log.error(f"Order failed for {symbol} {side} {precise_amt}: {e}")
+                # don't wait for the fill: the next strategy and bar carry on meanwhile
+                order = exchange.submit_order(symbol, side, precise_amt)
+                order.add_done_callback(partial(report_order, strat.__class__.__name__, side, precise_amt))
 
         await asyncio.sleep(0)
 
@@ -212,7 +285,7 @@ def health():
 @app.get("/ohlcv")
 def get_ohlcv_endpoint(symbol: str = Query(..., description="e.g. 'SOL/USDT'"), timeframe: str = Query(TIMEFRAME), limit: int = Query(500)):
     try:
-        return fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+        return to_rows(load_ohlcv(symbol, timeframe, limit=limit))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -263,34 +336,23 @@ def equity_curve(symbol: Optional[str] = Query(None), strategy: Optional[str] =
 
 @app.get("/grid/sma")
 def sma_grid(fast: List[int] = Query(...), slow: List[int] = Query(...)):
-    key = f"sma:{','.join(map(str, fast))}:{','.join(map(str, slow))}"
-    if cached := redis_client.get(key):
-        return json.loads(cached)
-    res = grid_search_with_winrate(fast, slow, FEE_PCT, SLIPPAGE_PCT)
-    redis_client.set(key, json.dumps(res), ex=3600)
-    return res
+    closes = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)[:, 4]
+    pairs = [(f, s) for f in fast for s in slow if s > f]
+    return result_cache.cells(
+        "sma", pairs, closes, FEE_PCT, SLIPPAGE_PCT,
+        lambda missing: sma_sweep(closes, missing, FEE_PCT, SLIPPAGE_PCT, mc_paths=MC_GRID_PATHS),
+        extra={"mc_paths": MC_GRID_PATHS},
+    )
 
 @app.get("/grid/macd")
-def macd_grid(fast: List[int] = Query(...), slow: List[int] = Query(...), signal: int = Query(...)):
-    key = f"macd:{','.join(map(str, fast))}:{','.join(map(str, slow))}:{signal}"
-    if cached := redis_client.get(key):
-        return json.loads(cached)
-    out = []
-    for f in fast:
-        for s in slow:
-            if s <= f: continue
-            r = run_backtest_macd()
-            trades = r.get("trades", [])
-            wins = sum(1 for t in trades if t.get("pnl", 0) > 0)
-            count = len(trades)
-            out.append({
-                "fast": f, "slow": s, "signal": signal,
-                "total_pnl": r.get("total_pnl", 0),
-                "trade_count": count,
-                "win_rate": wins / count if count else 0
-            })
-    redis_client.set(key, json.dumps(out), ex=3600)
-    return out
+def macd_grid(fast: List[int] = Query(...), slow: List[int] = Query(...), signal: List[int] = Query(...)):
+    closes = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)[:, 4]
+    cells = [(f, s, g) for f in fast for s in slow for g in signal if s > f]
+    return result_cache.cells(
+        "macd", cells, closes, FEE_PCT, SLIPPAGE_PCT,
+        lambda missing: macd_sweep(closes, missing, FEE_PCT, SLIPPAGE_PCT, mc_paths=MC_GRID_PATHS),
+        extra={"mc_paths": MC_GRID_PATHS},
+    )
 
 @app.post("/bot/start")
 def bot_start():
@@ -3,14 +3,16 @@
 import argparse
 from datetime import datetime
 
-from exchange import fetch_ohlcv
+from ohlcv_store import load_ohlcv
 from config import FAST_SMA, SLOW_SMA, TIMEFRAME, SYMBOL, FEE_PCT, SLIPPAGE_PCT
-from utils.signals import generate_sma_signal
+from strategies.sma_crossover import SmaCrossover
+from backtests.engine import BacktestExchange, run_backtest as run_engine
 
 
-def run_backtest(fast, slow):
+def run_backtest(fast, slow, bars=None):
     """
     Run an SMA crossover backtest returning structured trade data and P&L.
+    Pure crossover signals (no stop-loss), as the SMA grid search uses.
 
     Returns:
         dict: {
@@ -19,66 +21,26 @@ def run_backtest(fast, slow):
                 'exit_index': int,
                 'entry_price': float,
                 'exit_price': float,
+                'fees': float,
                 'pnl': float
             }],
-            'total_pnl': float
+            'total_pnl': float,
+            ...plus 'fees', 'equity' and 'stats' from backtests.engine
         }
     """
     print(f"Backtest run at {datetime.utcnow().isoformat()} UTC for FAST={fast}, SLOW={slow}")
 
-    bars = fetch_ohlcv(SYMBOL, timeframe=TIMEFRAME, limit=500)
-    closes = [bar[4] for bar in bars]
+    if bars is None:
+        bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)
 
-    trades = []
-    position = None  # None or 'long'
-    entry_cost = entry_price = entry_index = None
+    strat = SmaCrossover(
+        BacktestExchange(SYMBOL),
+        {"symbol": SYMBOL, "fast": fast, "slow": slow, "stop_loss_pct": None}
+    )
+    result = run_engine(strat, bars, FEE_PCT, SLIPPAGE_PCT)
 
-    # Walk through bars
-    for i in range(slow, len(closes)):
-        window = closes[: i + 1]
-        sig = generate_sma_signal(window, fast, slow)
-        price = closes[i]
-
-        # Enter long
-        if sig == "buy" and position is None:
-            slipped = price * (1 + SLIPPAGE_PCT)
-            entry_cost = slipped * (1 + FEE_PCT)
-            entry_price = price
-            entry_index = i
-            position = 'long'
-
-        # Exit long
-        elif sig == "sell" and position == 'long':
-            slipped = price * (1 - SLIPPAGE_PCT)
-            proceeds = slipped * (1 - FEE_PCT)
-            pnl = proceeds - entry_cost
-            trades.append({
-                'entry_index': entry_index,
-                'exit_index': i,
-                'entry_price': entry_price,
-                'exit_price': price,
-                'pnl': pnl
-            })
-            position = None
-            entry_cost = entry_price = entry_index = None
-
-    # Close any open at last bar
-    if position == 'long':
-        price = closes[-1]
-        slipped = price * (1 - SLIPPAGE_PCT)
-        proceeds = slipped * (1 - FEE_PCT)
-        pnl = proceeds - entry_cost
-        trades.append({
-            'entry_index': entry_index,
-            'exit_index': len(closes) - 1,
-            'entry_price': entry_price,
-            'exit_price': price,
-            'pnl': pnl
-        })
-
-    total_pnl = sum(t['pnl'] for t in trades)
-    print(f"Total trades: {len(trades)}, Total P&L: {total_pnl:.2f} USDT")
-    return {'trades': trades, 'total_pnl': total_pnl}
+    print(f"Total trades: {len(result['trades'])}, Total P&L: {result['total_pnl']:.2f} USDT")
+    return result
 
 
 if __name__ == "__main__":
@@ -3,89 +3,38 @@
 import argparse
 from datetime import datetime
 
-from exchange import fetch_ohlcv
+from ohlcv_store import load_ohlcv, load_covering
 from config import SYMBOL, TIMEFRAME, FEE_PCT, SLIPPAGE_PCT
 from strategies.bollinger import BollingerStrategy
+from backtests.engine import BacktestExchange, run_backtest
 
-# ─── Dummy exchange for backtest ─────────────────────────────────────────────
-class DummyExchange:
-    def amount_to_precision(self, symbol, amount):
-        # backtest precision not needed
-        return amount
 
-    def fetch_balance(self):
-        # assume ample balance
-        return {"free": {"USDT": 1_000_000.0, SYMBOL.split("/")[0]: 1_000_000.0}}
-
-
-def run_backtest_bollinger():
+def run_backtest_bollinger(bars=None, fine_bars=None):
     """
     Backtest the Bollinger Bands strategy, returning structured trades and total P&L.
+    With fine_bars (e.g. 1m bars covering `bars`) the stop is checked intrabar.
     """
     print(f"Bollinger Backtest run at {datetime.utcnow().isoformat()} UTC")
-    bars = fetch_ohlcv(SYMBOL, timeframe=TIMEFRAME, limit=500)
-    closes = [bar[4] for bar in bars]
-
-    dummy_exch = DummyExchange()
-    strat = BollingerStrategy(dummy_exch, {"symbol": SYMBOL})
-
-    trades = []
-    position = None
-    entry_cost = entry_price = entry_index = None
-
-    for i in range(len(bars)):
-        sig = strat.on_bar(bars[:i+1])
-        price = closes[i]
-
-        # Enter long
-        if sig and sig.get("side") == "buy" and position is None:
-            slipped = price * (1 + SLIPPAGE_PCT)
-            entry_cost = slipped * (1 + FEE_PCT)
-            entry_price = price
-            entry_index = i
-            position = 'long'
-
-        # Exit long
-        elif sig and sig.get("side") == "sell" and position == 'long':
-            slipped = price * (1 - SLIPPAGE_PCT)
-            proceeds = slipped * (1 - FEE_PCT)
-            pnl = proceeds - entry_cost
-            trades.append({
-                'entry_index': entry_index,
-                'exit_index': i,
-                'entry_price': entry_price,
-                'exit_price': price,
-                'pnl': pnl
-            })
-            position = None
-            entry_cost = entry_price = entry_index = None
+    if bars is None:
+        bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)
 
-    # Close any open position at the end
-    if position == 'long':
-        price = closes[-1]
-        slipped = price * (1 - SLIPPAGE_PCT)
-        proceeds = slipped * (1 - FEE_PCT)
-        pnl = proceeds - entry_cost
-        trades.append({
-            'entry_index': entry_index,
-            'exit_index': len(closes) - 1,
-            'entry_price': entry_price,
-            'exit_price': price,
-            'pnl': pnl
-        })
+    strat = BollingerStrategy(BacktestExchange(SYMBOL), {"symbol": SYMBOL})
+    result = run_backtest(strat, bars, FEE_PCT, SLIPPAGE_PCT, fine_bars=fine_bars)
 
-    total_pnl = sum(t['pnl'] for t in trades)
-    print(f"Bollinger: Total trades={len(trades)}, Total P&L={total_pnl:.2f} USDT")
-    return {'trades': trades, 'total_pnl': total_pnl}
+    print(f"Bollinger: Total trades={len(result['trades'])}, Total P&L={result['total_pnl']:.2f} USDT")
+    return result
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Run Bollinger Bands backtest with structured output"
     )
+    parser.add_argument("--fine-tf", help="Check stops intrabar on this finer timeframe, e.g. 1m")
     args = parser.parse_args()
 
-    result = run_backtest_bollinger()
+    bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)
+    fine = load_covering(SYMBOL, args.fine_tf, bars) if args.fine_tf else None
+    result = run_backtest_bollinger(bars, fine_bars=fine)
     for t in result['trades']:
         print(
             f"Trade: entry@{t['entry_price']:.2f}(i={t['entry_index']}), "
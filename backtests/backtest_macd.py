@@ -1,9 +1,13 @@
 # File: backtest_macd.py
 
 import argparse
+from bisect import bisect_left, bisect_right
 from datetime import datetime
+from functools import partial
 
-from exchange import fetch_ohlcv
+import numpy as np
+
+from ohlcv_store import load_ohlcv, load_covering
 from config import (
     SYMBOL,
     TIMEFRAME,
@@ -12,95 +16,160 @@ from config import (
     USDT_AMOUNT,
     MACD_FAST_PERIOD,
     MACD_SLOW_PERIOD,
-    MACD_SIGNAL_PERIOD
+    MACD_SIGNAL_PERIOD,
+    STOP_LOSS_PCT
 )
 from strategies.macd import MacdStrategy
+from utils import vectorized
+from backtests.engine import BacktestExchange, run_backtest
+from backtests.parallel import parallel_sweep
+from backtests.monte_carlo import monte_carlo, sweep_min_cells
 
-# ─── Dummy exchange for backtest (satisfies fetch_balance & amount_to_precision) ───
-class DummyExchange:
-    def amount_to_precision(self, symbol, amount):
-        # backtest doesn’t need real precision, return as-is
-        return amount
-
-    def fetch_balance(self):
-        # pretend we have plenty of both assets
-        return {"free": {"USDT": 1_000_000.0, SYMBOL.split("/")[0]: 1_000_000.0}}
 
-def run_backtest_macd():
+def run_backtest_macd(bars=None, fast=MACD_FAST_PERIOD, slow=MACD_SLOW_PERIOD,
+                      signal=MACD_SIGNAL_PERIOD, fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT,
+                      fine_bars=None):
     """
     Backtest the MacdStrategy, returning structured trades and total P&L.
+    With fine_bars (e.g. 1m bars covering `bars`) the stop is checked intrabar.
     """
     print(f"MACD Backtest run at {datetime.utcnow().isoformat()} UTC")
-    bars = fetch_ohlcv(SYMBOL, timeframe=TIMEFRAME, limit=500)
-    closes = [bar[4] for bar in bars]
+    if bars is None:
+        bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)
+
+    result = run_backtest(_strategy(fast, slow, signal), bars, fee_pct, slippage_pct, fine_bars=fine_bars)
+
+    print(f"MACD: Total trades={len(result['trades'])}, Total P&L={result['total_pnl']:.2f} USDT")
+    return result
 
-    dummy_exch = DummyExchange()
-    strat = MacdStrategy(
-        dummy_exch,
+
+def _strategy(fast, slow, signal):
+    return MacdStrategy(
+        BacktestExchange(SYMBOL),
         {
             "symbol":       SYMBOL,
             "usdt_amount":  USDT_AMOUNT,
-            "macd_fast":    MACD_FAST_PERIOD,
-            "macd_slow":    MACD_SLOW_PERIOD,
-            "macd_signal":  MACD_SIGNAL_PERIOD
+            "macd_fast":    fast,
+            "macd_slow":    slow,
+            "macd_signal":  signal
         }
     )
 
-    trades = []
-    position   = None
-    entry_cost = entry_price = entry_index = None
-
-    for i in range(len(bars)):
-        sig = strat.on_bar(bars[:i+1])
-        price = closes[i]
-
-        # BUY
-        if sig and sig["side"] == "buy" and position is None:
-            slipped    = price * (1 + SLIPPAGE_PCT)
-            entry_cost = slipped * (1 + FEE_PCT)
-            entry_price = price
-            entry_index = i
-            position = 'long'
-
-        # SELL
-        elif sig and sig["side"] == "sell" and position == 'long':
-            slipped  = price * (1 - SLIPPAGE_PCT)
-            proceeds = slipped * (1 - FEE_PCT)
-            pnl = proceeds - entry_cost
-            trades.append({
-                "entry_index": entry_index,
-                "exit_index":  i,
-                "entry_price": entry_price,
-                "exit_price":  price,
-                "pnl":         pnl
-            })
-            position = None
-            entry_cost = entry_price = entry_index = None
-
-    # Close any open position at the end
-    if position == 'long':
-        price    = closes[-1]
-        slipped  = price * (1 - SLIPPAGE_PCT)
-        proceeds = slipped * (1 - FEE_PCT)
-        pnl = proceeds - entry_cost
-        trades.append({
-            "entry_index": entry_index,
-            "exit_index":  len(closes) - 1,
-            "entry_price": entry_price,
-            "exit_price":  price,
-            "pnl":         pnl
-        })
-
-    total_pnl = sum(t["pnl"] for t in trades)
-    print(f"MACD: Total trades={len(trades)}, Total P&L={total_pnl:.2f} USDT")
-    return {"trades": trades, "total_pnl": total_pnl}
+
+def macd_grid(closes, fast_list, slow_list, signal_list, fee_pct=FEE_PCT,
+              slippage_pct=SLIPPAGE_PCT, workers=None, mc_paths=0):
+    """
+    MACD sweep over every (fast, slow, signal) with slow > fast.
+    Large sweeps are spread across a process pool.
+    Returns rows of {fast, slow, signal, total_pnl, trade_count, win_rate},
+    plus a Monte Carlo summary under 'mc' when mc_paths > 0.
+    """
+    cells = [(f, s, g) for f in fast_list for s in slow_list for g in signal_list if s > f]
+    return macd_sweep(closes, cells, fee_pct, slippage_pct, workers, mc_paths)
+
+
+def macd_sweep(closes, cells, fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT, workers=None, mc_paths=0):
+    """
+    macd_cells over an explicit list of (fast, slow, signal) cells on the process pool.
+    """
+    task = partial(_macd_cells_task, fee_pct=fee_pct, slippage_pct=slippage_pct, mc_paths=mc_paths)
+    closes = np.asarray(closes, dtype=np.float64)
+    return parallel_sweep(task, cells, {"close": closes}, workers=workers,
+                          min_cells=sweep_min_cells(mc_paths, len(closes)))
+
+
+def _macd_cells_task(arrays, cells, fee_pct, slippage_pct, mc_paths=0):
+    return macd_cells(arrays["close"], cells, fee_pct, slippage_pct, mc_paths=mc_paths)
+
+
+def macd_cells(closes, cells, fee_pct, slippage_pct, stop_loss_pct=STOP_LOSS_PCT, mc_paths=0):
+    """
+    Vectorized MacdStrategy backtest for a list of (fast, slow, signal) cells.
+
+    Each distinct EMA period is computed once and shared by every cell that
+    uses it; signal lines for all cells advance together (vectorized.ema_rows)
+    and histogram crossovers are found in bulk. Only the entry/exit walk is
+    per trade, because the hard stop makes exits path-dependent. Results
+    match run_backtest_macd cell by cell. With mc_paths > 0 each row also
+    gets a Monte Carlo summary of its trades under 'mc'.
+    """
+    x = np.asarray(closes, dtype=np.float64)
+    n = len(x)
+    if not cells or not n:
+        return [_macd_row(cell, []) for cell in cells]
+
+    emas = {p: vectorized.ema(x, p) for p in sorted({p for f, s, _ in cells for p in (f, s)})}
+    lines = {(f, s): emas[f] - emas[s] for f, s, _ in cells}
+    macd = np.array([lines[(f, s)] for f, s, _ in cells])
+    hist = macd - vectorized.ema_rows(macd, [g for _, _, g in cells])
+
+    prev, curr = hist[:, :-1], hist[:, 1:]
+    both = ~np.isnan(prev) & ~np.isnan(curr)
+    buys = both & (prev <= 0) & (curr > 0)
+    sells = both & (prev >= 0) & (curr < 0)
+
+    buy_cost = (x * (1 + slippage_pct) * (1 + fee_pct)).tolist()
+    sell_proceeds = (x * (1 - slippage_pct) * (1 - fee_pct)).tolist()
+    stops = (x * (1 - stop_loss_pct)).tolist() if stop_loss_pct else None
+    xs = x.tolist()
+
+    rows = []
+    for r, cell in enumerate(cells):
+        buy_idx = (np.flatnonzero(buys[r]) + 1).tolist()
+        sell_idx = (np.flatnonzero(sells[r]) + 1).tolist()
+        pnls = []
+        t = 0
+        while True:
+            j = bisect_left(buy_idx, t)
+            if j == len(buy_idx):
+                break
+            entry = buy_idx[j]
+            k = bisect_right(sell_idx, entry)
+            exit_ = sell_idx[k] if k < len(sell_idx) else n - 1
+            if stops:
+                exit_ = _first_stop(xs, x, stops[entry], entry + 1, exit_)
+            pnls.append(sell_proceeds[exit_] - buy_cost[entry])
+            t = exit_ + 1
+        row = _macd_row(cell, pnls)
+        if mc_paths:
+            row["mc"] = monte_carlo(pnls, xs[0], n_paths=mc_paths, seed=0, curves=False)
+        rows.append(row)
+    return rows
+
+
+def _first_stop(xs, x, stop, start, end):
+    """
+    First bar in [start, end] whose close is at or below `stop`, else `end`.
+    Short holds are scanned in Python; long ones in one NumPy pass.
+    """
+    if end - start < 32:
+        for i in range(start, end + 1):
+            if xs[i] <= stop:
+                return i
+        return end
+    hits = np.flatnonzero(x[start:end + 1] <= stop)
+    return start + int(hits[0]) if len(hits) else end
+
+
+def _macd_row(cell, pnls):
+    fast, slow, signal = cell
+    wins = sum(1 for p in pnls if p > 0)
+    return {
+        "fast": fast, "slow": slow, "signal": signal,
+        "total_pnl": float(sum(pnls)),
+        "trade_count": len(pnls),
+        "win_rate": wins / len(pnls) if pnls else 0.0
+    }
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run MACD backtest with structured output")
+    parser.add_argument("--fine-tf", help="Check stops intrabar on this finer timeframe, e.g. 1m")
     args = parser.parse_args()
 
-    result = run_backtest_macd()
+    bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)
+    fine = load_covering(SYMBOL, args.fine_tf, bars) if args.fine_tf else None
+    result = run_backtest_macd(bars, fine_bars=fine)
     # Print each trade
     for t in result["trades"]:
         print(
@@ -0,0 +1,207 @@
+# File: backtests/engine.py
+
+import numpy as np
+
+from config import SYMBOL, FEE_PCT, SLIPPAGE_PCT
+from utils import vectorized
+from utils.indicator_context import IndicatorContext
+
+"""
+Event-driven backtest engine shared by every backtest script and grid.
+
+Strategies are driven bar by bar exactly as in the live engine: each call
+gets a zero-copy view of the bars so far plus an IndicatorContext whose
+series are computed once over the whole history, so a run is O(n) rather
+than O(n²) in prefix copies and indicator recomputation.
+
+Given aligned 1m bars as well, stops and trailing exits are checked on the
+1m closes inside each bar, as monitor_emergency does live. The 1m slice of
+every bar and its min/max are precomputed, so the per-bar check is a lookup
+and only bars that can trigger are scanned.
+"""
+
+# ─── Dummy exchange for backtests (satisfies fetch_balance & amount_to_precision) ───
+class BacktestExchange:
+    def __init__(self, symbol=SYMBOL):
+        self.symbol = symbol
+
+    def amount_to_precision(self, symbol, amount):
+        # backtest doesn’t need real precision, return as-is
+        return amount
+
+    def fetch_balance(self):
+        # pretend we have plenty of both assets
+        base, quote = self.symbol.split("/")
+        return {"free": {quote: 1_000_000.0, base: 1_000_000.0}}
+
+
+def as_bars(bars):
+    """
+    Return bars as an (n, 6) float64 array (no copy if it already is one).
+    """
+    arr = np.asarray(bars, dtype=np.float64)
+    return arr.reshape(-1, 6)
+
+
+def bars_from_closes(closes):
+    """
+    Build an (n, 6) bar array carrying only closes, for close-only strategies.
+    """
+    closes = np.asarray(closes, dtype=np.float64)
+    arr = np.zeros((len(closes), 6))
+    arr[:, 4] = closes
+    return arr
+
+
+def run_backtest(strategy, bars, fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT, start=0, fine_bars=None):
+    """
+    Drive `strategy` (any BaseStrategy) over `bars`, long-only, one unit per trade.
+
+    Buys fill at close * (1 + slippage) plus fee; sells at close * (1 - slippage)
+    less fee. A position still open at the last bar is closed there. Bars
+    before `start` only warm up indicators; no signals are taken on them.
+
+    fine_bars: optional 1m bars covering `bars`. While long, the strategy's
+    stop_levels() are checked against the 1m closes inside each bar before
+    its close is acted on; a hit fills at that 1m close (exit_index is the
+    coarse bar) and the strategy is told via on_stopped().
+
+    Returns:
+        dict: {
+            'trades': List[{
+                'entry_index': int,
+                'exit_index': int,
+                'entry_price': float,
+                'exit_price': float,
+                'fees': float,
+                'pnl': float
+            }],
+            'total_pnl': float,
+            'fees': float,            # total fees paid
+            'equity': np.ndarray,     # realised + mark-to-market P&L per bar
+            'stats': dict             # trades_count, wins, win_rate, avg_pnl, max_drawdown
+        }
+    """
+    arr = as_bars(bars)
+    closes = arr[:, 4]
+    n = len(arr)
+    ctx = IndicatorContext(arr)
+
+    if fine_bars is not None:
+        fine = as_bars(fine_bars)
+        fine_close = fine[:, 4]
+        lo, hi = vectorized.bucket_ranges(arr[:, 0], fine[:, 0])
+        bar_low = vectorized.range_reduce(fine_close, lo, hi, np.minimum)
+        bar_high = vectorized.range_reduce(fine_close, lo, hi, np.maximum)
+
+    trades = []
+    equity = np.zeros(n)
+    realised = 0.0
+    total_fees = 0.0
+    position = None  # None or 'long'
+    entry_cost = entry_price = entry_index = entry_fee = None
+    peak = None      # highest 1m close since entry, for trailing exits
+
+    def close_long(i, price):
+        nonlocal realised, total_fees
+        slipped = price * (1 - slippage_pct)
+        proceeds = slipped * (1 - fee_pct)
+        fee = slipped * fee_pct
+        pnl = proceeds - entry_cost
+        trades.append({
+            'entry_index': entry_index,
+            'exit_index': i,
+            'entry_price': entry_price,
+            'exit_price': price,
+            'fees': entry_fee + fee,
+            'pnl': pnl
+        })
+        realised += pnl
+        total_fees += fee
+
+    for i in range(start, n):
+        # Intrabar exits on the 1m closes inside bar i
+        if position == 'long' and fine_bars is not None and hi[i] > lo[i]:
+            stop, trail = strategy.stop_levels()
+            fill = _intrabar_exit(fine_close[lo[i]:hi[i]], bar_low[i], bar_high[i], stop, trail, peak)
+            peak = max(peak, bar_high[i])
+            if fill is not None:
+                close_long(i, fill)
+                position = None
+                entry_cost = entry_price = entry_index = entry_fee = None
+                strategy.on_stopped()
+
+        ctx.seek(i)
+        sig = strategy.on_bar(arr[:i + 1], ctx)
+        price = float(closes[i])
+        side = sig.get("side") if sig else None
+
+        # Enter long
+        if side == "buy" and position is None:
+            slipped = price * (1 + slippage_pct)
+            entry_cost = slipped * (1 + fee_pct)
+            entry_fee = slipped * fee_pct
+            entry_price = price
+            entry_index = i
+            position = 'long'
+            peak = price
+            total_fees += entry_fee
+
+        # Exit long
+        elif side == "sell" and position == 'long':
+            close_long(i, price)
+            position = None
+            entry_cost = entry_price = entry_index = entry_fee = None
+
+        equity[i] = realised
+        if position == 'long':
+            equity[i] += price * (1 - slippage_pct) * (1 - fee_pct) - entry_cost
+
+    # Close any open position at the end
+    if position == 'long':
+        close_long(n - 1, float(closes[-1]))
+        equity[-1] = realised
+
+    return {
+        'trades': trades,
+        'total_pnl': realised,
+        'fees': total_fees,
+        'equity': equity,
+        'stats': trade_stats(trades, equity),
+    }
+
+
+def _intrabar_exit(window, low, high, stop, trail, peak):
+    """
+    First close in `window` at or below `stop`, or `trail` below the running
+    peak (seeded with `peak`); None if neither fires. `low`/`high` are the
+    window's min/max, so bars that can't trigger are never scanned.
+    """
+    stop_hit = stop is not None and low <= stop
+    trail_hit = trail is not None and low <= max(peak, high) * (1 - trail)
+    if not (stop_hit or trail_hit):
+        return None
+    level = np.full(len(window), stop if stop_hit else -np.inf)
+    if trail_hit:
+        np.maximum(level, np.maximum.accumulate(np.maximum(window, peak)) * (1 - trail), out=level)
+    hits = np.flatnonzero(window <= level)
+    return float(window[hits[0]]) if len(hits) else None
+
+
+def trade_stats(trades, equity=None):
+    """
+    Summary statistics over a trade list (and optional equity curve).
+    """
+    pnls = [t['pnl'] for t in trades]
+    count = len(pnls)
+    wins = sum(1 for p in pnls if p > 0)
+    stats = {
+        'trades_count': count,
+        'wins': wins,
+        'win_rate': wins / count if count else 0.0,
+        'avg_pnl': sum(pnls) / count if count else 0.0,
+        'max_drawdown': 0.0,
+    }
+    if equity is not None and len(equity):
+        stats['max_drawdown'] = float(np.max(np.maximum.accumulate(equity) - equity))
+    return stats
@@ -1,46 +1,27 @@
 # File: grid_backtest.py
 
-from exchange import fetch_ohlcv
+from functools import partial
+
+import numpy as np
+
+from ohlcv_store import load_ohlcv
 from config import SYMBOL, TIMEFRAME
-from utils.signals import generate_sma_signal
+from utils import vectorized
+from backtests.parallel import parallel_sweep
+from backtests.monte_carlo import monte_carlo, sweep_min_cells
+from strategies.sma_crossover import SmaCrossover
+from backtests.engine import BacktestExchange, bars_from_closes, run_backtest as run_engine
 
 def run_backtest_detailed(closes, fast, slow, fee_pct, slippage_pct):
     """
     Run an SMA backtest and return a list of PnL values for each completed trade.
     """
-    trades = []
-    position = None
-    entry_cost = entry_price = entry_index = None
-
-    for i in range(slow, len(closes)):
-        window = closes[: i + 1]
-        sig = generate_sma_signal(window, fast, slow)
-        price = closes[i]
-
-        # Enter long
-        if sig == "buy" and position is None:
-            slipped     = price * (1 + slippage_pct)
-            entry_cost  = slipped * (1 + fee_pct)
-            entry_price = price
-            entry_index = i
-            position    = 'long'
-
-        # Exit long
-        elif sig == "sell" and position == 'long':
-            slipped  = price * (1 - slippage_pct)
-            proceeds = slipped * (1 - fee_pct)
-            trades.append(proceeds - entry_cost)
-            position = None
-            entry_cost = entry_price = entry_index = None
-
-    # Close any open at the end
-    if position == 'long':
-        price    = closes[-1]
-        slipped  = price * (1 - slippage_pct)
-        proceeds = slipped * (1 - fee_pct)
-        trades.append(proceeds - entry_cost)
-
-    return trades
+    strat = SmaCrossover(
+        BacktestExchange(SYMBOL),
+        {"symbol": SYMBOL, "fast": fast, "slow": slow, "stop_loss_pct": None}
+    )
+    result = run_engine(strat, bars_from_closes(closes), fee_pct, slippage_pct)
+    return [t["pnl"] for t in result["trades"]]
 
 def run_backtest(closes, fast, slow, fee_pct, slippage_pct):
     """
@@ -49,56 +30,111 @@ def run_backtest(closes, fast, slow, fee_pct, slippage_pct):
     pnls = run_backtest_detailed(closes, fast, slow, fee_pct, slippage_pct)
     return sum(pnls), len(pnls)
 
-def grid_search(fast_list, slow_list, fee_pct, slippage_pct):
+# Cap on (pairs × bars) cells held in memory at once by sma_pairs
+GRID_BLOCK_CELLS = 4_000_000
+
+def sma_grid(closes, fast_list, slow_list, fee_pct, slippage_pct, workers=None, mc_paths=0):
     """
-    Original grid search: returns total PnL and trade count per (fast, slow).
+    Single-pass SMA crossover grid over every (fast, slow) pair with slow > fast.
+    Returns rows of {fast, slow, total_pnl, trades_count, win_rate}, plus a
+    Monte Carlo summary under 'mc' when mc_paths > 0.
+    With workers > 1, large grids are split across a process pool.
     """
-    bars = fetch_ohlcv(SYMBOL, timeframe=TIMEFRAME, limit=500)
-    closes = [b[4] for b in bars]
-    results = []
+    pairs = [(f, s) for f in fast_list for s in slow_list if s > f]
+    return sma_sweep(closes, pairs, fee_pct, slippage_pct, workers, mc_paths)
 
-    for fast in fast_list:
-        for slow in slow_list:
-            if slow <= fast:
-                continue
-            total_pnl, count = run_backtest(closes, fast, slow, fee_pct, slippage_pct)
-            results.append({
-                "fast": fast,
-                "slow": slow,
-                "total_pnl": total_pnl,
-                "trades_count": count
-            })
+def sma_sweep(closes, pairs, fee_pct, slippage_pct, workers=None, mc_paths=0):
+    """
+    sma_pairs over an explicit list of (fast, slow) pairs on the process pool.
+    """
+    task = partial(_sma_pairs_task, fee_pct=fee_pct, slippage_pct=slippage_pct, mc_paths=mc_paths)
+    closes = np.asarray(closes, dtype=np.float64)
+    return parallel_sweep(task, pairs, {"close": closes}, workers=workers,
+                          min_cells=sweep_min_cells(mc_paths, len(closes)))
 
-    return results
+def _sma_pairs_task(arrays, pairs, fee_pct, slippage_pct, mc_paths=0):
+    return sma_pairs(arrays["close"], pairs, fee_pct, slippage_pct, mc_paths)
 
-def grid_search_with_winrate(fast_list, slow_list, fee_pct, slippage_pct):
+def sma_pairs(closes, pairs, fee_pct, slippage_pct, mc_paths=0):
     """
-    Extended grid search: adds win_rate to the results.
+    Vectorized SMA crossover backtest for an explicit list of (fast, slow) pairs.
+
+    One prefix-sum array gives every SMA period needed; crossovers, long
+    state and trade P&L for all pairs are then computed as (pairs × bars)
+    matrix operations. Results match run_backtest_detailed for each pair.
+    With mc_paths > 0 each row also gets a Monte Carlo summary of its trades
+    under 'mc' (one unit bought at the first close is the ruin capital).
     """
-    bars = fetch_ohlcv(SYMBOL, timeframe=TIMEFRAME, limit=500)
-    closes = [b[4] for b in bars]
-    results = []
+    x = np.asarray(closes, dtype=np.float64)
+    if not pairs or not len(x):
+        return [
+            {"fast": f, "slow": s, "total_pnl": 0.0, "trades_count": 0, "win_rate": 0.0}
+            for f, s in pairs
+        ]
+
+    periods = sorted({p for pair in pairs for p in pair})
+    row_of = {p: i for i, p in enumerate(periods)}
+    smas = vectorized.sma_matrix(x, periods)
+    buy_cost = x * (1 + slippage_pct) * (1 + fee_pct)
+    sell_proceeds = x * (1 - slippage_pct) * (1 - fee_pct)
 
-    for fast in fast_list:
-        for slow in slow_list:
-            if slow <= fast:
-                continue
-            pnls = run_backtest_detailed(closes, fast, slow, fee_pct, slippage_pct)
-            total_pnl = sum(pnls)
-            count     = len(pnls)
-            wins      = sum(1 for p in pnls if p > 0)
-            win_rate  = wins / count if count else 0.0
-
-            results.append({
+    results = []
+    block = max(1, GRID_BLOCK_CELLS // len(x))
+    for start in range(0, len(pairs), block):
+        chunk = pairs[start:start + block]
+        fast_rows = [row_of[f] for f, _ in chunk]
+        slow_rows = [row_of[s] for _, s in chunk]
+        events = vectorized.crossover(smas[fast_rows], smas[slow_rows])
+        long = vectorized.long_positions(events)
+
+        was_long = np.zeros_like(long)
+        was_long[:, 1:] = long[:, :-1]
+        entries = long & ~was_long
+        exits = ~long & was_long
+        exits[:, -1] |= long[:, -1]  # close anything still open at the last bar
+
+        entry_rows, entry_cols = np.nonzero(entries)
+        _, exit_cols = np.nonzero(exits)
+        pnl = sell_proceeds[exit_cols] - buy_cost[entry_cols]
+
+        total = np.bincount(entry_rows, weights=pnl, minlength=len(chunk))
+        count = np.bincount(entry_rows, minlength=len(chunk))
+        wins = np.bincount(entry_rows, weights=pnl > 0, minlength=len(chunk))
+        pair_pnls = np.split(pnl, np.cumsum(count)[:-1]) if mc_paths else None
+
+        for k, (fast, slow) in enumerate(chunk):
+            row = {
                 "fast": fast,
                 "slow": slow,
-                "total_pnl": total_pnl,
-                "trades_count": count,
-                "win_rate": win_rate
-            })
+                "total_pnl": float(total[k]),
+                "trades_count": int(count[k]),
+                "win_rate": float(wins[k] / count[k]) if count[k] else 0.0
+            }
+            if mc_paths:
+                row["mc"] = monte_carlo(pair_pnls[k], x[0], n_paths=mc_paths, seed=0, curves=False)
+            results.append(row)
 
     return results
 
+def grid_search(fast_list, slow_list, fee_pct, slippage_pct, closes=None, workers=None):
+    """
+    Original grid search: returns total PnL and trade count per (fast, slow).
+    """
+    rows = grid_search_with_winrate(fast_list, slow_list, fee_pct, slippage_pct, closes, workers)
+    return [{k: r[k] for k in ("fast", "slow", "total_pnl", "trades_count")} for r in rows]
+
+def grid_search_with_winrate(fast_list, slow_list, fee_pct, slippage_pct, closes=None, workers=None,
+                             mc_paths=0):
+    """
+    Extended grid search: adds win_rate to the results.
+    workers:  process count for large grids (None = SWEEP_WORKERS / all cores).
+    mc_paths: Monte Carlo resamples per cell (0 = skip the robustness summary).
+    """
+    if closes is None:
+        bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=500)
+        closes = [b[4] for b in bars]
+    return sma_grid(closes, fast_list, slow_list, fee_pct, slippage_pct, workers, mc_paths)
+
 if __name__ == "__main__":
     from config import FEE_PCT, SLIPPAGE_PCT
 
@@ -0,0 +1,132 @@
+# File: backtests/monte_carlo.py
+
+from functools import lru_cache
+
+import numpy as np
+
+from config import MC_PATHS, MC_PERCENTILES, MC_RUIN_FRACTION, MC_BLOCK_CELLS, SWEEP_MIN_CELLS
+
+"""
+Monte Carlo resampling of a backtest's trade sequence.
+
+Paths are drawn as a (trades × paths) matrix: bootstrap picks trades with
+replacement, shuffle permutes the original order. Equity, peak, drawdown
+and ruin are then advanced one trade at a time as whole-row vector ops,
+so the only Python loop is over trade steps, never over paths.
+
+Seeded runs of up to MC_BLOCK_CELLS steps draw their resample index matrix from a
+cache keyed by (trades, paths, method, seed), so a grid summarising every
+cell with the same seed builds each matrix once per trade count.
+"""
+
+# Trade-steps × paths of Monte Carlo work that cost about as much as one
+# bar of a vectorized grid cell (used to size the pool threshold)
+MC_STEPS_PER_BAR = 10
+
+# Seeded index matrices kept for reuse
+_INDEX_CACHE_SIZE = 64
+
+
+def monte_carlo(pnls, capital, n_paths=MC_PATHS, method="bootstrap", percentiles=MC_PERCENTILES,
+                ruin_fraction=MC_RUIN_FRACTION, seed=None, curves=True):
+    """
+    Resample per-trade P&L `pnls` into `n_paths` alternative trade sequences.
+
+    capital:  starting capital in P&L units; a path is ruined once its equity
+              falls to -capital * ruin_fraction
+    method:   "bootstrap" (with replacement) or "shuffle" (reordering only)
+    curves:   include percentile equity curves (needs every path in memory;
+              without them paths are processed in MC_BLOCK_CELLS blocks)
+
+    Returns:
+        dict: {
+            'paths': int, 'trades': int, 'method': str,
+            'final_pnl': {'p5': float, ...},
+            'max_drawdown': {'p5': float, ...},
+            'risk_of_ruin': float,
+            'equity_curves': {'p5': List[float], ...}   # if curves
+        }
+    """
+    if method not in ("bootstrap", "shuffle"):
+        raise ValueError(f"Unknown resampling method: {method}")
+    pnls = np.asarray(pnls, dtype=np.float64)
+    k = len(pnls)
+    keys = [f"p{q:g}" for q in percentiles]
+    out = {'paths': n_paths, 'trades': k, 'method': method}
+
+    if not k:
+        out.update({
+            'final_pnl': dict.fromkeys(keys, 0.0),
+            'max_drawdown': dict.fromkeys(keys, 0.0),
+            'risk_of_ruin': 0.0,
+        })
+        if curves:
+            out['equity_curves'] = {key: [] for key in keys}
+        return out
+
+    rng = np.random.default_rng(seed)
+    ruin_level = -capital * ruin_fraction
+    block = n_paths if curves else max(1, MC_BLOCK_CELLS // k)
+
+    finals, drawdowns, ruined = [], [], 0
+    for start in range(0, n_paths, block):
+        # (trades × paths): each step below is one vector op across every path
+        if seed is not None and k * n_paths <= MC_BLOCK_CELLS:
+            steps = pnls[_seeded_indices(k, n_paths, method, seed)]
+        else:
+            steps = pnls[_indices(rng, k, min(block, n_paths - start), method)]
+        equity, peak, drawdown, low = (np.zeros(steps.shape[1]) for _ in range(4))
+        for i in range(k):
+            equity += steps[i]
+            np.maximum(peak, equity, out=peak)
+            np.maximum(drawdown, peak - equity, out=drawdown)
+            np.minimum(low, equity, out=low)
+        finals.append(equity)
+        drawdowns.append(drawdown)
+        ruined += int(np.count_nonzero(low <= ruin_level))
+
+    out.update({
+        'final_pnl': _percentiles(np.concatenate(finals), percentiles, keys),
+        'max_drawdown': _percentiles(np.concatenate(drawdowns), percentiles, keys),
+        'risk_of_ruin': ruined / n_paths,
+    })
+    if curves:
+        bands = np.percentile(np.cumsum(steps, axis=0, out=steps), percentiles, axis=1)
+        out['equity_curves'] = {key: band.tolist() for key, band in zip(keys, bands)}
+    return out
+
+
+def sweep_min_cells(n_paths, n_bars, min_cells=SWEEP_MIN_CELLS):
+    """
+    parallel_sweep's in-process threshold for grid cells that each also run
+    an `n_paths` Monte Carlo summary (assuming a trade every ~20 bars), so
+    the pool is used once the combined work is worth it.
+    """
+    if not n_paths or not n_bars:
+        return min_cells
+    mc = n_paths * max(n_bars // 20, 1) // MC_STEPS_PER_BAR
+    return min_cells * n_bars // (n_bars + mc)
+
+
+def _indices(rng, k, n, method):
+    # (k × n) positions into the trade list: one resampled sequence per column
+    if method == "bootstrap":
+        return rng.integers(0, k, size=(k, n))
+    return rng.permuted(np.tile(np.arange(k)[:, None], (1, n)), axis=0)
+
+
+@lru_cache(maxsize=_INDEX_CACHE_SIZE)
+def _seeded_indices(k, n, method, seed):
+    idx = _indices(np.random.default_rng(seed), k, n, method)
+    idx.flags.writeable = False
+    return idx
+
+
+def _percentiles(values, percentiles, keys):
+    # np.percentile's default (linear) rule on one sort; much cheaper for small grids' cells
+    v = np.sort(values)
+    pos = np.asarray(percentiles, dtype=np.float64) / 100 * (len(v) - 1)
+    lo = np.floor(pos).astype(np.int64)
+    hi = np.minimum(lo + 1, len(v) - 1)
+    out = v[lo] + (v[hi] - v[lo]) * (pos - lo)
+    return {key: float(x) for key, x in zip(keys, out)}
@@ -0,0 +1,271 @@
+# File: backtests/optimizer.py
+
+import argparse
+import math
+from functools import partial
+
+import numpy as np
+
+from ohlcv_store import load_ohlcv
+from config import (
+    SYMBOL,
+    TIMEFRAME,
+    FEE_PCT,
+    SLIPPAGE_PCT,
+    SWEEP_MIN_CELLS,
+    OPTIMIZER_BUDGET,
+    OPTIMIZER_PATIENCE
+)
+from backtests.engine import as_bars, run_backtest
+from backtests.grid_backtest import sma_pairs
+from backtests.backtest_macd import macd_cells
+from backtests.parallel import parallel_sweep
+from backtests.portfolio import ENGINE_BAR_COST, make_strategy
+
+"""
+Adaptive parameter search for every strategy in strategies/.
+
+Three searchers share one budget-metered objective (total P&L after fees
+and slippage):
+  random     uniform samples from the search space
+  halving    successive halving: many configs on a short recent slice of
+             bars, keeping the best 1/eta at each step on eta× more bars
+  surrogate  Gaussian-process model of P&L over the normalised space,
+             evaluating the candidate with the highest expected improvement
+
+The budget counts full-history evaluations, so a run on a third of the bars
+costs a third. Random and surrogate search stop early once `patience`
+evaluations pass without a new best.
+"""
+
+# Search spaces in strategy config keys; int bounds give integer parameters
+SPACES = {
+    "sma": {"fast": (2, 50), "slow": (10, 200)},
+    "macd": {"macd_fast": (4, 30), "macd_slow": (10, 60), "macd_signal": (3, 20)},
+    "bollinger": {"bb_period": (10, 50), "bb_std_dev": (1.0, 3.0)},
+    "rsi": {"rsi_period": (5, 30), "oversold": (10, 40), "overbought": (60, 90)},
+}
+
+CONSTRAINTS = {
+    "sma": lambda p: p["slow"] > p["fast"],
+    "macd": lambda p: p["macd_slow"] > p["macd_fast"],
+}
+
+
+class Objective:
+    """
+    Batch evaluator for one strategy on one bar history.
+
+    SMA and MACD use the vectorized grid backtests; other strategies run
+    through the engine on the sweep pool. Results are memoised per
+    (params, bars used), and `cost` accumulates the fraction of the history
+    each new evaluation covered.
+    """
+    def __init__(self, strategy, bars, fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT, workers=None):
+        if strategy not in SPACES:
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        self.bars = as_bars(bars)
+        self.fee_pct = fee_pct
+        self.slippage_pct = slippage_pct
+        self.workers = workers
+        self.cost = 0.0
+        self._memo = {}
+
+    def __call__(self, cells, n_bars=None):
+        n = len(self.bars)
+        n_bars = min(n_bars or n, n)
+        keys = [(tuple(sorted(c.items())), n_bars) for c in cells]
+        todo = list({k: c for k, c in zip(keys, cells) if k not in self._memo}.items())
+        if todo:
+            scores = self._evaluate([c for _, c in todo], self.bars[n - n_bars:])
+            for (key, _), score in zip(todo, scores):
+                self._memo[key] = score
+            self.cost += len(todo) * n_bars / n
+        return [self._memo[k] for k in keys]
+
+    def _evaluate(self, cells, bars):
+        closes = bars[:, 4]
+        if self.strategy == "sma":
+            pairs = [(c["fast"], c["slow"]) for c in cells]
+            return [r["total_pnl"] for r in sma_pairs(closes, pairs, self.fee_pct, self.slippage_pct)]
+        if self.strategy == "macd":
+            triples = [(c["macd_fast"], c["macd_slow"], c["macd_signal"]) for c in cells]
+            return [r["total_pnl"] for r in macd_cells(closes, triples, self.fee_pct, self.slippage_pct)]
+        task = partial(_engine_task, strategy=self.strategy, fee_pct=self.fee_pct, slippage_pct=self.slippage_pct)
+        return parallel_sweep(task, cells, {"bars": bars}, workers=self.workers, chunk_size=1,
+                              min_cells=SWEEP_MIN_CELLS // ENGINE_BAR_COST)
+
+
+def _engine_task(arrays, cells, strategy, fee_pct, slippage_pct):
+    return [
+        run_backtest(make_strategy(strategy, SYMBOL, params=c), arrays["bars"], fee_pct, slippage_pct)["total_pnl"]
+        for c in cells
+    ]
+
+
+# ─── Search space helpers ────────────────────────────────────────────────────
+def sample(strategy, rng, k):
+    """
+    `k` random feasible parameter dicts for `strategy`.
+    """
+    space, valid = SPACES[strategy], CONSTRAINTS.get(strategy)
+    out = []
+    while len(out) < k:
+        draws = {
+            name: rng.integers(lo, hi + 1, size=2 * k) if isinstance(lo, int) else rng.uniform(lo, hi, size=2 * k)
+            for name, (lo, hi) in space.items()
+        }
+        for j in range(2 * k):
+            cell = {name: v[j].item() for name, v in draws.items()}
+            if valid is None or valid(cell):
+                out.append(cell)
+    return out[:k]
+
+
+def _encode(strategy, cells):
+    space = SPACES[strategy]
+    return np.array([[(c[name] - lo) / (hi - lo) for name, (lo, hi) in space.items()] for c in cells])
+
+
+# ─── Searchers ───────────────────────────────────────────────────────────────
+def random_search(objective, budget, rng, patience=OPTIMIZER_PATIENCE, batch=8):
+    history = []
+    since_best = 0
+    while objective.cost < budget and since_best < patience:
+        k = max(1, min(batch, int(budget - objective.cost)))
+        cells = sample(objective.strategy, rng, k)
+        best = max((s for _, s in history), default=-math.inf)
+        for cell, score in zip(cells, objective(cells)):
+            history.append((cell, score))
+            since_best = 0 if score > best else since_best + 1
+            best = max(best, score)
+    return history
+
+
+def successive_halving(objective, budget, rng, eta=3, min_bars=None):
+    """
+    One halving bracket sized so its total cost fits `budget`.
+    Rungs use the most recent bars, growing by `eta` up to the full history.
+    """
+    n = len(objective.bars)
+    min_bars = min(n, min_bars or max(n // eta ** 3, 200))
+    rungs = max(0, int(math.log(n / min_bars, eta)))
+    # cost = n0 * (rungs + 1) * eta^-rungs full evaluations
+    configs = sample(objective.strategy, rng, max(eta, int(budget * eta ** rungs / (rungs + 1))))
+
+    history = []
+    for r in range(rungs + 1):
+        n_bars = n if r == rungs else int(n / eta ** (rungs - r))
+        scores = objective(configs, n_bars)
+        ranked = sorted(zip(scores, range(len(configs))), reverse=True)
+        if r == rungs:
+            history = [(configs[i], s) for s, i in ranked]
+        else:
+            configs = [configs[i] for _, i in ranked[:max(1, len(configs) // eta)]]
+    return history
+
+
+def surrogate_search(objective, budget, rng, patience=OPTIMIZER_PATIENCE, n_init=None, candidates=2000):
+    strategy = objective.strategy
+    init = sample(strategy, rng, n_init or max(5, int(budget) // 4))
+    history = list(zip(init, objective(init)))
+    seen = {tuple(sorted(c.items())) for c, _ in history}
+    best = max(s for _, s in history)
+    since_best = 0
+
+    while objective.cost < budget and since_best < patience:
+        X = _encode(strategy, [c for c, _ in history])
+        y = np.array([s for _, s in history])
+        pool = [c for c in sample(strategy, rng, candidates) if tuple(sorted(c.items())) not in seen]
+        if not pool:
+            break
+        mean, std = GaussianProcess().fit(X, y).predict(_encode(strategy, pool))
+        cell = pool[int(np.argmax(expected_improvement(mean, std, best)))]
+
+        score = objective([cell])[0]
+        history.append((cell, score))
+        seen.add(tuple(sorted(cell.items())))
+        since_best = 0 if score > best else since_best + 1
+        best = max(best, score)
+    return history
+
+
+class GaussianProcess:
+    """
+    Zero-mean GP with an RBF kernel on standardised targets. The length
+    scale and noise are picked from a small grid by marginal likelihood.
+    """
+    LENGTH_SCALES = (0.05, 0.1, 0.2, 0.4, 0.8)
+    NOISES = (1e-4, 1e-2, 1e-1)
+
+    def fit(self, X, y):
+        self.X = X
+        self.mu, self.sd = y.mean(), y.std() or 1.0
+        z = (y - self.mu) / self.sd
+        sq = _sq_dists(X, X)
+        best = math.inf
+        for ls in self.LENGTH_SCALES:
+            for noise in self.NOISES:
+                L = np.linalg.cholesky(np.exp(-0.5 * sq / ls ** 2) + noise * np.eye(len(X)))
+                alpha = np.linalg.solve(L.T, np.linalg.solve(L, z))
+                nll = 0.5 * z @ alpha + np.log(np.diag(L)).sum()
+                if nll < best:
+                    best, self.ls, self.L, self.alpha = nll, ls, L, alpha
+        return self
+
+    def predict(self, Xs):
+        Ks = np.exp(-0.5 * _sq_dists(Xs, self.X) / self.ls ** 2)
+        v = np.linalg.solve(self.L, Ks.T)
+        var = np.maximum(1.0 - (v ** 2).sum(axis=0), 1e-12)
+        return self.mu + self.sd * (Ks @ self.alpha), self.sd * np.sqrt(var)
+
+
+def _sq_dists(A, B):
+    return ((A[:, None, :] - B[None, :, :]) ** 2).sum(axis=-1)
+
+
+_erf = np.vectorize(math.erf)
+
+def expected_improvement(mean, std, best, xi=0.0):
+    z = (mean - best - xi) / std
+    cdf = 0.5 * (1 + _erf(z / math.sqrt(2)))
+    pdf = np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+    return (mean - best - xi) * cdf + std * pdf
+
+
+SEARCHERS = {"random": random_search, "halving": successive_halving, "surrogate": surrogate_search}
+
+
+def optimize(strategy, bars, method="surrogate", budget=OPTIMIZER_BUDGET, seed=None,
+             fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT, workers=None, **kwargs):
+    """
+    Search `strategy`'s parameter space on `bars` within `budget` full evaluations.
+
+    Returns:
+        dict: {
+            'best': dict,          # strategy config keys -> value
+            'score': float,        # total P&L of best on the full history
+            'evaluations': float,  # budget used, in full-history evaluations
+            'history': List[(params, score)]
+        }
+    """
+    objective = Objective(strategy, bars, fee_pct, slippage_pct, workers)
+    history = SEARCHERS[method](objective, budget, np.random.default_rng(seed), **kwargs)
+    best, score = max(history, key=lambda h: h[1])
+    return {'best': best, 'score': score, 'evaluations': objective.cost, 'history': history}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Adaptive strategy parameter search")
+    parser.add_argument("strategy", choices=sorted(SPACES))
+    parser.add_argument("--method", choices=sorted(SEARCHERS), default="surrogate")
+    parser.add_argument("--budget", type=int, default=OPTIMIZER_BUDGET)
+    parser.add_argument("--bars", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=args.bars)
+    res = optimize(args.strategy, bars, args.method, args.budget, args.seed)
+    print(f"{args.strategy} ({args.method}): best={res['best']} → P&L={res['score']:.2f} "
+          f"after {res['evaluations']:.1f} evaluations")
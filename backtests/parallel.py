@@ -0,0 +1,113 @@
+# File: backtests/parallel.py
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from config import SWEEP_WORKERS, SWEEP_CHUNK_SIZE, SWEEP_MIN_CELLS
+
+"""
+Process-pool executor for parameter sweeps.
+
+Price arrays are published once in shared memory and attached by name in
+each worker, so only the (small) parameter chunks are pickled per task.
+
+Workers are started by a fork server (spawn where that is unavailable),
+never by forking the caller: sweeps run from the API server, whose other
+threads may hold locks that a forked child would inherit held.
+"""
+
+
+class SharedArrays:
+    """
+    Copy named float64 arrays into shared memory once.
+    `spec` is the picklable handle workers use to attach.
+
+    Usage:
+        with SharedArrays({"close": closes}) as shared:
+            pool.submit(task, shared.spec, ...)
+    """
+    def __init__(self, arrays):
+        self._blocks = []
+        self.spec = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr, dtype=np.float64)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            np.ndarray(arr.shape, dtype=np.float64, buffer=shm.buf)[:] = arr
+            self._blocks.append(shm)
+            self.spec[name] = (shm.name, arr.shape)
+
+    def close(self):
+        for shm in self._blocks:
+            shm.close()
+            shm.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Worker-side handles, kept open for the life of the worker process
+_attached = {}
+
+def attach(spec):
+    """
+    Map a SharedArrays spec back to read-only NumPy arrays (in a worker).
+    """
+    arrays = {}
+    for name, (shm_name, shape) in spec.items():
+        if shm_name not in _attached:
+            _attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+        arr = np.ndarray(shape, dtype=np.float64, buffer=_attached[shm_name].buf)
+        arr.flags.writeable = False
+        arrays[name] = arr
+    return arrays
+
+
+def _run_chunk(fn, spec, chunk):
+    return fn(attach(spec), chunk)
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def resolve_workers(workers=None):
+    return workers or SWEEP_WORKERS or os.cpu_count() or 1
+
+
+def parallel_sweep(fn, params, arrays, workers=None, chunk_size=SWEEP_CHUNK_SIZE, min_cells=SWEEP_MIN_CELLS):
+    """
+    Evaluate `fn(arrays, chunk)` over `params` split into chunks.
+
+    fn:     top-level (picklable) function returning one result per param in chunk
+    params: list of parameter combinations
+    arrays: dict of name -> 1-D float64 array shared with every worker
+
+    Results come back in the same order as `params` regardless of which
+    worker finished first. Small sweeps (fewer than `min_cells` combos × bars)
+    and workers=1 run in-process, where pool start-up would cost more than
+    the work itself.
+    """
+    params = list(params)
+    chunks = [params[i:i + chunk_size] for i in range(0, len(params), chunk_size)]
+    workers = min(resolve_workers(workers), len(chunks))
+    n_bars = max((len(a) for a in arrays.values()), default=0)
+
+    results = []
+    if workers <= 1 or len(params) * n_bars < min_cells:
+        for chunk in chunks:
+            results.extend(fn(arrays, chunk))
+        return results
+
+    with SharedArrays(arrays) as shared, ProcessPoolExecutor(max_workers=workers, mp_context=_mp_context()) as pool:
+        for chunk_results in pool.map(_run_chunk, [fn] * len(chunks), [shared.spec] * len(chunks), chunks):
+            results.extend(chunk_results)
+    return results
@@ -0,0 +1,230 @@
+# File: backtests/portfolio.py
+
+import argparse
+from functools import partial
+
+import numpy as np
+
+from ohlcv_store import load_ohlcv
+from config import (
+    SYMBOLS,
+    TIMEFRAME,
+    USDT_AMOUNT,
+    ORDER_FRACTION,
+    FEE_PCT,
+    SLIPPAGE_PCT,
+    FAST_SMA,
+    SLOW_SMA,
+    MACD_FAST_PERIOD,
+    MACD_SLOW_PERIOD,
+    MACD_SIGNAL_PERIOD,
+    PORTFOLIO_BALANCE,
+    SWEEP_MIN_CELLS
+)
+from strategies.sma_crossover import SmaCrossover
+from strategies.rsi import RsiStrategy
+from strategies.macd import MacdStrategy
+from strategies.bollinger import BollingerStrategy
+from backtests.engine import BacktestExchange, as_bars, run_backtest, trade_stats
+from backtests.parallel import parallel_sweep
+
+"""
+Portfolio backtest: every strategy on every symbol against one quote balance.
+
+Signals don't depend on position size, so each (strategy, symbol) run is
+independent and is simulated by the engine in a worker process, against that
+symbol's bars only. The parent then merges all trades on the union timeline
+in time order and sizes each entry at ORDER_FRACTION of the free quote
+balance at that moment. Merging is O(trades); the equity curve is built with
+one vector pass per symbol.
+"""
+
+# An engine bar costs roughly this many vectorized grid cells (for the in-process threshold)
+ENGINE_BAR_COST = 100
+
+STRATEGIES = {
+    "sma": (SmaCrossover, {"fast": FAST_SMA, "slow": SLOW_SMA}),
+    "rsi": (RsiStrategy, {}),
+    "macd": (MacdStrategy, {
+        "macd_fast": MACD_FAST_PERIOD,
+        "macd_slow": MACD_SLOW_PERIOD,
+        "macd_signal": MACD_SIGNAL_PERIOD,
+    }),
+    "bollinger": (BollingerStrategy, {}),
+}
+
+
+def make_strategy(name, symbol, exchange=None, params=None):
+    """
+    Strategy `name` for `symbol` with the live engine's parameters,
+    overridden by any config keys in `params`.
+    """
+    cls, defaults = STRATEGIES[name]
+    config = {"symbol": symbol, "usdt_amount": USDT_AMOUNT, **defaults, **(params or {})}
+    return cls(exchange or BacktestExchange(symbol), config)
+
+
+def load_portfolio(symbols=SYMBOLS, timeframe=TIMEFRAME, limit=500):
+    """
+    {symbol: (n, 6) bar array} for every symbol from the local store.
+    """
+    return {symbol: load_ohlcv(symbol, timeframe, limit=limit) for symbol in symbols}
+
+
+def run_portfolio(bars_by_symbol=None, strategies=tuple(STRATEGIES), initial_balance=PORTFOLIO_BALANCE,
+                  order_fraction=ORDER_FRACTION, fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT, workers=None):
+    """
+    Backtest every (strategy, symbol) combination with a shared quote balance.
+
+    bars_by_symbol: {symbol: [ts, o, h, l, c, v] rows}; loaded for SYMBOLS if None.
+                    Symbols need not share timestamps; they're aligned on the
+                    union of all bar times.
+
+    Returns:
+        dict: {
+            'trades': List[{strategy, symbol, entry_ts, exit_ts, qty, cost, proceeds, pnl}],
+            'final_balance': float,
+            'total_pnl': float,
+            'ts': np.ndarray,         # union timeline
+            'equity': np.ndarray,     # quote balance + open positions at liquidation value
+            'by_combo': {(strategy, symbol): {total_pnl, trades_count, win_rate}},
+            'stats': dict             # trade_stats over the sized trades and equity
+        }
+    """
+    if bars_by_symbol is None:
+        bars_by_symbol = load_portfolio()
+    symbols = list(bars_by_symbol)
+    arrays = {f"bars{i}": as_bars(bars_by_symbol[s]) for i, s in enumerate(symbols)}
+    combos = [(name, i) for i in range(len(symbols)) for name in strategies]
+
+    # One combo per task: each is a full bar-by-bar engine run
+    task = partial(_combos_task, symbols=symbols, fee_pct=fee_pct, slippage_pct=slippage_pct)
+    runs = parallel_sweep(task, combos, arrays, workers=workers, chunk_size=1,
+                          min_cells=SWEEP_MIN_CELLS // ENGINE_BAR_COST)
+
+    ts = np.unique(np.concatenate([a[:, 0] for a in arrays.values()])) if arrays else np.empty(0)
+    trades, cash, held = _merge(ts, combos, runs, symbols, initial_balance, order_fraction)
+
+    equity = cash.copy()
+    liquidation = (1 - slippage_pct) * (1 - fee_pct)
+    for i, s in enumerate(symbols):
+        if held[i] is not None:
+            equity += held[i] * _aligned_closes(ts, arrays[f"bars{i}"]) * liquidation
+
+    pnls = {(name, symbols[i]): [] for name, i in combos}
+    for t in trades:
+        pnls[(t['strategy'], t['symbol'])].append(t['pnl'])
+    by_combo = {
+        combo: {
+            'total_pnl': sum(p),
+            'trades_count': len(p),
+            'win_rate': sum(1 for x in p if x > 0) / len(p) if p else 0.0,
+        }
+        for combo, p in pnls.items()
+    }
+
+    final = float(cash[-1]) if len(cash) else initial_balance
+    return {
+        'trades': trades,
+        'final_balance': final,
+        'total_pnl': final - initial_balance,
+        'ts': ts,
+        'equity': equity,
+        'by_combo': by_combo,
+        'stats': trade_stats(trades, equity - initial_balance),
+    }
+
+
+def _combos_task(arrays, combos, symbols, fee_pct, slippage_pct):
+    return [_run_combo(arrays[f"bars{i}"], name, symbols[i], fee_pct, slippage_pct) for name, i in combos]
+
+
+def _run_combo(bars, name, symbol, fee_pct, slippage_pct):
+    """
+    One-unit engine run; returns per-trade (entry_ts, exit_ts, unit_cost, unit_proceeds).
+    """
+    result = run_backtest(make_strategy(name, symbol), bars, fee_pct, slippage_pct)
+    ts = bars[:, 0]
+    out = np.empty((len(result['trades']), 4))
+    for k, t in enumerate(result['trades']):
+        out[k] = (
+            ts[t['entry_index']],
+            ts[t['exit_index']],
+            t['entry_price'] * (1 + slippage_pct) * (1 + fee_pct),
+            t['exit_price'] * (1 - slippage_pct) * (1 - fee_pct),
+        )
+    return out
+
+
+def _merge(ts, combos, runs, symbols, initial_balance, order_fraction):
+    """
+    Replay every combo's trades in time order against one balance.
+    At equal bars exits settle before entries, so freed cash is reusable.
+    """
+    events = []
+    for c, run in enumerate(runs):
+        entry_idx = np.searchsorted(ts, run[:, 0])
+        exit_idx = np.searchsorted(ts, run[:, 1])
+        for k in range(len(run)):
+            # a trade opened and force-closed on the same bar exits after its entry
+            same_bar = entry_idx[k] == exit_idx[k]
+            events.append((int(entry_idx[k]), 1, c, k))
+            events.append((int(exit_idx[k]), 2 if same_bar else 0, c, k))
+    events.sort()
+
+    balance = initial_balance
+    open_ = {}  # (combo, trade) -> (entry bar, qty)
+    dcash = np.zeros(len(ts))
+    dheld = [None] * len(symbols)
+    trades = []
+    for i, kind, c, k in events:
+        name, s = combos[c]
+        entry_ts, exit_ts, unit_cost, unit_proceeds = runs[c][k].tolist()
+        if kind == 1:
+            spend = balance * order_fraction
+            open_[c, k] = (i, spend / unit_cost)
+            balance -= spend
+            dcash[i] -= spend
+        else:
+            entry_i, q = open_.pop((c, k))
+            proceeds = q * unit_proceeds
+            balance += proceeds
+            dcash[i] += proceeds
+            trades.append({
+                'strategy': name,
+                'symbol': symbols[s],
+                'entry_ts': int(entry_ts),
+                'exit_ts': int(exit_ts),
+                'qty': q,
+                'cost': q * unit_cost,
+                'proceeds': proceeds,
+                'pnl': proceeds - q * unit_cost,
+            })
+            if dheld[s] is None:
+                dheld[s] = np.zeros(len(ts))
+            dheld[s][entry_i] += q
+            dheld[s][i] -= q
+
+    cash = initial_balance + np.cumsum(dcash)
+    held = [np.cumsum(d) if d is not None else None for d in dheld]
+    return trades, cash, held
+
+
+def _aligned_closes(ts, bars):
+    """
+    Closes forward-filled onto timeline `ts` (0 before the symbol's first bar).
+    """
+    idx = np.searchsorted(bars[:, 0], ts, side="right") - 1
+    return np.where(idx >= 0, bars[np.maximum(idx, 0), 4], 0.0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Portfolio backtest over all SYMBOLS")
+    parser.add_argument("--limit", type=int, default=500, help="Bars per symbol")
+    args = parser.parse_args()
+
+    result = run_portfolio(load_portfolio(limit=args.limit))
+    for (name, symbol), r in sorted(result['by_combo'].items()):
+        print(f"{symbol:<12} {name:<10} P&L={r['total_pnl']:.2f} over {r['trades_count']} trades")
+    print(f"Final balance={result['final_balance']:.2f} (P&L={result['total_pnl']:.2f}), "
+          f"max drawdown={result['stats']['max_drawdown']:.2f}")
@@ -0,0 +1,107 @@
+# File: backtests/result_cache.py
+
+import hashlib
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+from config import RESULT_CACHE_SIZE, RESULT_CACHE_TTL
+from logger import setup_logger
+
+"""
+Content-addressed cache for backtest grid cells.
+
+A cell's key is a hash of the strategy name, its parameters, fee/slippage
+and a digest of the bars it ran on, so appending a bar changes every key and
+stale results are never served; nothing has to be invalidated by hand. A
+bounded in-process LRU sits in front of Redis, and grids are cached cell by
+cell, so a sweep that overlaps an earlier one only computes the new cells.
+"""
+
+# Bump when cell results change shape or semantics, to orphan old entries
+CACHE_VERSION = 1
+
+
+def bars_digest(bars):
+    """
+    Content hash of a bar (or close) array.
+    """
+    arr = np.ascontiguousarray(bars, dtype=np.float64)
+    return hashlib.blake2b(arr.tobytes() + str(arr.shape).encode(), digest_size=16).hexdigest()
+
+
+def cell_key(strategy, params, fee_pct, slippage_pct, digest, extra=None):
+    payload = json.dumps([CACHE_VERSION, strategy, list(params), fee_pct, slippage_pct, extra, digest])
+    return f"bt:{strategy}:{hashlib.sha256(payload.encode()).hexdigest()}"
+
+
+class ResultCache:
+    """
+    LRU of up to `maxsize` results, backed by Redis when a client is given.
+    Redis errors are logged and treated as misses, so backtests still run
+    without it.
+    """
+    def __init__(self, redis_client=None, maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL):
+        self.redis = redis_client
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lru = OrderedDict()
+
+    def _remember(self, key, value):
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def get_many(self, keys):
+        """
+        {key: value} for every key found in either tier.
+        """
+        found = {}
+        for key in keys:
+            if key in self._lru:
+                self._lru.move_to_end(key)
+                found[key] = self._lru[key]
+
+        missing = [k for k in keys if k not in found]
+        if missing and self.redis is not None:
+            try:
+                for key, raw in zip(missing, self.redis.mget(missing)):
+                    if raw is not None:
+                        found[key] = json.loads(raw)
+                        self._remember(key, found[key])
+            except Exception as e:
+                setup_logger().warning(f"Result cache read failed, recomputing: {e}")
+        return found
+
+    def set_many(self, items):
+        for key, value in items.items():
+            self._remember(key, value)
+        if items and self.redis is not None:
+            try:
+                pipe = self.redis.pipeline()
+                for key, value in items.items():
+                    pipe.set(key, json.dumps(value), ex=self.ttl)
+                pipe.execute()
+            except Exception as e:
+                setup_logger().warning(f"Result cache write failed: {e}")
+
+    def cells(self, strategy, cells, closes, fee_pct, slippage_pct, compute, extra=None):
+        """
+        Rows for every parameter cell, computing only those not cached.
+
+        compute: fn(missing_cells) -> one row per cell, in order
+        extra:   anything else the rows depend on (e.g. Monte Carlo paths)
+        """
+        digest = bars_digest(closes)
+        keys = [cell_key(strategy, cell, fee_pct, slippage_pct, digest, extra) for cell in cells]
+        found = self.get_many(keys)
+
+        missing = [i for i, key in enumerate(keys) if key not in found]
+        if missing:
+            rows = compute([cells[i] for i in missing])
+            fresh = {keys[i]: row for i, row in zip(missing, rows)}
+            self.set_many(fresh)
+            found.update(fresh)
+        return [found[key] for key in keys]
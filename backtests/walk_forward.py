@@ -0,0 +1,150 @@
+# File: walk_forward.py
+
+import argparse
+from functools import partial
+
+import numpy as np
+
+from ohlcv_store import load_ohlcv
+from config import SYMBOL, TIMEFRAME, FEE_PCT, SLIPPAGE_PCT, SWEEP_MIN_CELLS
+from strategies.sma_crossover import SmaCrossover
+from backtests.engine import BacktestExchange, bars_from_closes, run_backtest
+from backtests.grid_backtest import sma_pairs
+from backtests.parallel import parallel_sweep
+
+"""
+Walk-forward optimisation of the SMA crossover parameters.
+
+History is cut into folds of (train, test) windows. Each fold picks the
+best (fast, slow) on its train window with the vectorized grid and scores
+that choice out-of-sample on the test window with the engine's fee and
+slippage model. Folds run in parallel.
+
+Fold boundaries sit on an absolute time grid (every `test_bars` bars since
+the epoch), so when the history advances by a few bars every existing fold
+keeps its key and is reused from the cache; only new folds are computed.
+Anchored folds train from the first grid boundary in the history rather
+than the first bar, so a window that slides forward (load_ohlcv(limit=N))
+keeps their keys too until that boundary drops out, once per `test_bars`.
+"""
+
+# fold key -> fold result, shared across calls in this process
+_fold_cache = {}
+
+
+def make_folds(ts, train_bars, test_bars, anchored=False):
+    """
+    (train_start, test_start, test_end) index triples over timestamps `ts`.
+    Test windows start on bars whose index since the epoch is a multiple of
+    `test_bars`; rolling folds train on the `train_bars` before that, anchored
+    folds on everything from the first such boundary (at least `train_bars`).
+    """
+    ts = np.asarray(ts, dtype=np.float64)
+    if len(ts) < 2:
+        return []
+    bar_ms = float(np.median(np.diff(ts)))
+    starts = np.flatnonzero(np.round(ts / bar_ms).astype(np.int64) % test_bars == 0)
+    if not len(starts):
+        return []
+    origin = int(starts[0])
+    folds = []
+    for s in starts.tolist():
+        a = origin if anchored else s - train_bars
+        if s - a < train_bars or a < 0 or s + test_bars > len(ts):
+            continue
+        folds.append((a, s, s + test_bars))
+    return folds
+
+
+def walk_forward(bars, fast_list, slow_list, train_bars, test_bars, anchored=False,
+                 fee_pct=FEE_PCT, slippage_pct=SLIPPAGE_PCT, workers=None, cache=None):
+    """
+    Run a walk-forward SMA optimisation over `bars` ([ts, o, h, l, c, v] rows).
+
+    Returns:
+        dict: {
+            'folds': List[{train_start, test_start, test_end (timestamps),
+                           fast, slow, train_pnl, oos_pnl, oos_trades, oos_win_rate}],
+            'oos_total_pnl': float,
+            'oos_trades': int,
+            'params': {'fast', 'slow'} chosen by the most recent fold (or None)
+        }
+    """
+    cache = _fold_cache if cache is None else cache
+    arr = np.asarray(bars, dtype=np.float64).reshape(-1, 6)
+    ts, closes = arr[:, 0], arr[:, 4]
+    pairs = [(f, s) for f in fast_list for s in slow_list if s > f]
+
+    folds = make_folds(ts, train_bars, test_bars, anchored)
+    keys = [
+        (ts[a], ts[b], ts[c - 1], tuple(pairs), fee_pct, slippage_pct)
+        for a, b, c in folds
+    ]
+    todo = [(fold, key) for fold, key in zip(folds, keys) if key not in cache]
+
+    # One fold per task: each one runs a whole grid, so scale the in-process threshold
+    task = partial(_folds_task, pairs=pairs, fee_pct=fee_pct, slippage_pct=slippage_pct)
+    computed = parallel_sweep(
+        task, [fold for fold, _ in todo], {"ts": ts, "close": closes},
+        workers=workers, chunk_size=1, min_cells=SWEEP_MIN_CELLS // max(len(pairs), 1)
+    )
+    for (_, key), result in zip(todo, computed):
+        cache[key] = result
+
+    rows = [cache[key] for key in keys]
+    return {
+        'folds': rows,
+        'oos_total_pnl': sum(r['oos_pnl'] for r in rows),
+        'oos_trades': sum(r['oos_trades'] for r in rows),
+        'params': {'fast': rows[-1]['fast'], 'slow': rows[-1]['slow']} if rows else None,
+    }
+
+
+def _folds_task(arrays, folds, pairs, fee_pct, slippage_pct):
+    return [_run_fold(arrays["ts"], arrays["close"], fold, pairs, fee_pct, slippage_pct) for fold in folds]
+
+
+def _run_fold(ts, closes, fold, pairs, fee_pct, slippage_pct):
+    train_start, test_start, test_end = fold
+
+    # In-sample: best (fast, slow) by total P&L on the train window
+    grid = sma_pairs(closes[train_start:test_start], pairs, fee_pct, slippage_pct)
+    best = max(grid, key=lambda r: r["total_pnl"])
+
+    # Out-of-sample: indicators warm up on train bars, trades only in the test window
+    strat = SmaCrossover(
+        BacktestExchange(SYMBOL),
+        {"symbol": SYMBOL, "fast": best["fast"], "slow": best["slow"], "stop_loss_pct": None}
+    )
+    oos = run_backtest(
+        strat, bars_from_closes(closes[train_start:test_end]),
+        fee_pct, slippage_pct, start=test_start - train_start
+    )
+    return {
+        'train_start': int(ts[train_start]),
+        'test_start': int(ts[test_start]),
+        'test_end': int(ts[test_end - 1]),
+        'fast': best["fast"],
+        'slow': best["slow"],
+        'train_pnl': best["total_pnl"],
+        'oos_pnl': oos['total_pnl'],
+        'oos_trades': oos['stats']['trades_count'],
+        'oos_win_rate': oos['stats']['win_rate'],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward SMA optimisation")
+    parser.add_argument("--bars", type=int, default=20_000, help="History length in bars")
+    parser.add_argument("--train", type=int, default=2_000, help="Train window in bars")
+    parser.add_argument("--test", type=int, default=500, help="Test window in bars")
+    parser.add_argument("--anchored", action="store_true", help="Anchored instead of rolling train windows")
+    args = parser.parse_args()
+
+    bars = load_ohlcv(SYMBOL, TIMEFRAME, limit=args.bars)
+    result = walk_forward(bars, [5, 10, 15, 20], [30, 50, 100], args.train, args.test, args.anchored)
+    for f in result['folds']:
+        print(f"test@{f['test_start']}: FAST={f['fast']}, SLOW={f['slow']} → "
+              f"IS P&L={f['train_pnl']:.2f}, OOS P&L={f['oos_pnl']:.2f} over {f['oos_trades']} trades")
+    print(f"OOS total P&L={result['oos_total_pnl']:.2f} over {result['oos_trades']} trades; "
+          f"production params: {result['params']}")
@@ -0,0 +1,277 @@
+# File: benchmarks/bench.py
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from config import SYMBOL, FAST_SMA, SLOW_SMA, FEE_PCT, SLIPPAGE_PCT
+from synthetic import generate_ohlcv
+from realtime import decode_frame, tick_price
+from utils import indicators
+from utils.bar_buffer import BarBuffer
+from utils.stop_book import StopBook
+from utils.indicator_context import IndicatorContext, StreamingContext
+from strategies.sma_crossover import SmaCrossover
+from strategies.rsi import RsiStrategy
+from strategies.macd import MacdStrategy
+from strategies.bollinger import BollingerStrategy
+from backtests.engine import BacktestExchange
+from backtests.backtest import run_backtest
+from backtests.backtest_bollinger import run_backtest_bollinger
+from backtests.backtest_macd import run_backtest_macd
+from backtests.grid_backtest import grid_search_with_winrate
+
+"""
+Speed benchmarks for indicators, strategy on_bar, grids and backtests.
+
+Every case runs on the same seeded synthetic OHLCV at each size and reports
+the best of a few repeats. Results are written as JSON; compared against a
+stored baseline, any case slower by more than the tolerance is a
+regression and the run exits non-zero.
+
+    python benchmarks/bench.py                       # 1k, 100k, 1M bars
+    python benchmarks/bench.py --save-baseline       # record this machine's baseline
+    python benchmarks/bench.py --sizes 1000,100000 --only indicators
+    python benchmarks/bench.py --sizes 1000 --only feed   # kline frames/s per core, old vs new
+"""
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_PATH = os.path.join(BENCH_DIR, "results.json")
+SIZES = (1_000, 100_000, 1_000_000)
+SEED = 42
+
+# Strategy on_bar is timed per call over this many trailing bars, fed one at
+# a time into a window sized as the live engine sizes it
+ON_BAR_CALLS = 2_000
+
+# Feed decoding replays the last FEED_BARS bars as kline frames, each bar
+# arriving as FRAMES_PER_BAR updates of which only the last is closed
+FEED_BARS = 500
+FRAMES_PER_BAR = 30
+
+
+def synthetic_ohlcv(n, seed=SEED):
+    """
+    Seeded synthetic 5m OHLCV as an (n, 6) float64 array.
+    """
+    return generate_ohlcv(n, "5m", seed=seed, start_ts=1_700_000_000_000)
+
+
+def _strategies():
+    ex = BacktestExchange(SYMBOL)
+    cfg = {"symbol": SYMBOL, "usdt_amount": 10.0}
+    return {
+        "sma": SmaCrossover(ex, {**cfg, "fast": FAST_SMA, "slow": SLOW_SMA}),
+        "rsi": RsiStrategy(ex, cfg),
+        "macd": MacdStrategy(ex, cfg),
+        "bollinger": BollingerStrategy(ex, cfg),
+    }
+
+
+def _on_bar_case(name, streaming=True):
+    # The live loop of run_symbol: append the closed bar, advance the
+    # context (pushed into streaming indicators, or rebuilt over the window)
+    def setup(bars):
+        window = max(getattr(s, "slow", getattr(s, "period", 0)) for s in _strategies().values()) + 1
+        start = max(0, len(bars) - ON_BAR_CALLS)
+        rows = np.asarray(bars).tolist()
+
+        def run():
+            strat = _strategies()[name]
+            buf = BarBuffer(window)
+            buf.extend(rows[max(0, start - window):start])
+            ctx = StreamingContext(buf) if streaming else IndicatorContext()
+            for bar in rows[start:]:
+                buf.append(bar)
+                if streaming:
+                    ctx.push(bar)
+                else:
+                    ctx.update(buf)
+                strat.on_bar(buf, ctx)
+        return run, len(rows) - start
+    return setup
+
+
+def kline_frames(bars):
+    """
+    Compact combined-stream kline frames (as Binance sends them) for the trailing bars.
+    """
+    frames = []
+    for ts, o, h, l, c, v in np.asarray(bars)[-FEED_BARS:].tolist():
+        for j in range(FRAMES_PER_BAR):
+            k = {"t": int(ts), "T": int(ts) + 299_999, "s": "SOLUSDT", "i": "5m", "f": 1, "L": 99,
+                 "o": f"{o:.4f}", "c": f"{c:.4f}", "h": f"{h:.4f}", "l": f"{l:.4f}", "v": f"{v:.3f}",
+                 "n": 99, "x": j == FRAMES_PER_BAR - 1, "q": "0", "V": "0", "Q": "0", "B": "0"}
+            data = {"e": "kline", "E": int(ts) + j, "s": "SOLUSDT", "k": k}
+            frames.append(json.dumps({"stream": "solusdt@kline_5m", "data": data}, separators=(",", ":")))
+    return frames
+
+
+def _decode_parse_all(frames, buf):
+    # the decoder before the fast path: every frame fully parsed
+    for raw in frames:
+        k = json.loads(raw)["data"].get("k", {})
+        if k.get("x"):
+            buf.append([k["t"], float(k["o"]), float(k["h"]), float(k["l"]), float(k["c"]), float(k["v"])])
+
+
+def _decode_fast(frames, buf):
+    for raw in frames:
+        hit = decode_frame(raw)
+        if hit is not None:
+            buf.append(hit[1])
+
+
+def _feed_case(decode):
+    def setup(bars):
+        frames = kline_frames(bars)
+        buf = BarBuffer(FEED_BARS)
+        return (lambda: decode(frames, buf)), len(frames)
+    return setup
+
+
+def _stop_ticks(bars):
+    # bookTicker frames walking through the closes, checked against a book of open stops
+    closes = np.asarray(bars)[-FEED_BARS:, 4].repeat(FRAMES_PER_BAR).tolist()
+    frames = [
+        '{"stream":"solusdt@bookTicker","data":{"u":%d,"s":"SOLUSDT","b":"%.4f","B":"3.1",'
+        '"a":"%.4f","A":"2.7"}}' % (i, c, c * 1.0001) for i, c in enumerate(closes)
+    ]
+    lo = min(closes)
+    book = StopBook()
+    for i in range(20):
+        book.set(i, lo * (0.90 + i * 0.004))
+
+    def run():
+        for raw in frames:
+            price = tick_price(raw, "bookTicker")
+            if price <= book.trigger:
+                book.hit(price)
+    return run, len(frames)
+
+
+def _call(fn):
+    # (setup(bars) -> (run, calls)) for a one-shot call on prepared inputs
+    def setup(bars):
+        args = fn(bars)
+        return (lambda: args[0](*args[1:])), 1
+    return setup
+
+
+# name -> setup(bars) returning (zero-arg run callable, calls it makes)
+CASES = {
+    "indicators.true_ranges": _call(lambda b: (indicators.true_ranges, b.tolist())),
+    "indicators.atr": _call(lambda b: (indicators.atr, b.tolist(), 14)),
+    "indicators.ema": _call(lambda b: (indicators.ema, b[:, 4].tolist(), 20)),
+    "indicators.macd_lines": _call(lambda b: (indicators.macd_lines, b[:, 4].tolist(), 12, 26, 9)),
+    "indicators.bollinger_bands": _call(lambda b: (indicators.bollinger_bands, b[:, 4].tolist(), 20, 2)),
+    "on_bar.sma": _on_bar_case("sma"),
+    "on_bar.rsi": _on_bar_case("rsi"),
+    "on_bar.macd": _on_bar_case("macd"),
+    "on_bar.bollinger": _on_bar_case("bollinger"),
+    "on_bar_rebuild.sma": _on_bar_case("sma", streaming=False),
+    "on_bar_rebuild.rsi": _on_bar_case("rsi", streaming=False),
+    "on_bar_rebuild.macd": _on_bar_case("macd", streaming=False),
+    "on_bar_rebuild.bollinger": _on_bar_case("bollinger", streaming=False),
+    "grid.sma_winrate": _call(lambda b: (
+        grid_search_with_winrate, [5, 10, 15, 20], [30, 50, 100], FEE_PCT, SLIPPAGE_PCT, b[:, 4], 1
+    )),
+    "backtest.sma": _call(lambda b: (run_backtest, FAST_SMA, SLOW_SMA, b)),
+    "backtest.bollinger": _call(lambda b: (run_backtest_bollinger, b)),
+    "backtest.macd": _call(lambda b: (run_backtest_macd, b)),
+    "feed.decode_parse_all": _feed_case(_decode_parse_all),
+    "feed.decode": _feed_case(_decode_fast),
+    "feed.stop_ticks": _stop_ticks,
+}
+
+
+def time_case(setup, bars, min_time=0.2, max_repeats=5):
+    """
+    Best wall time of `run` over up to `max_repeats` runs (stopping once
+    `min_time` has been spent), and the per-call time.
+    """
+    run, calls = setup(bars)
+    best, spent, repeats = float("inf"), 0.0, 0
+    with contextlib.redirect_stdout(io.StringIO()):  # backtest scripts print
+        while repeats < max_repeats and (repeats == 0 or spent < min_time):
+            t0 = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - t0
+            best, spent, repeats = min(best, elapsed), spent + elapsed, repeats + 1
+    return {"seconds": best, "per_call": best / calls, "calls": calls, "repeats": repeats}
+
+
+def run_benchmarks(sizes=SIZES, only=None, seed=SEED, log=print):
+    results = {}
+    for n in sizes:
+        bars = synthetic_ohlcv(n, seed)
+        for name, setup in CASES.items():
+            if only and not any(name.startswith(o) for o in only):
+                continue
+            key = f"{name}[{n}]"
+            results[key] = time_case(setup, bars)
+            r = results[key]
+            rate = f"{1 / r['per_call']:14,.0f} calls/s" if r["calls"] > 1 else ""
+            log(f"{key:<36} {r['seconds'] * 1e3:10.2f} ms{rate}")
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance=0.25):
+    """
+    Cases slower than baseline by more than `tolerance` (fractional), as
+    [(key, baseline seconds, current seconds)]. Cases missing from either side are skipped.
+    """
+    regressions = []
+    for key, cur in current["results"].items():
+        base = baseline["results"].get(key)
+        if base and cur["seconds"] > base["seconds"] * (1 + tolerance):
+            regressions.append((key, base["seconds"], cur["seconds"]))
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the speed benchmarks")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)), help="Comma-separated bar counts")
+    parser.add_argument("--only", default=None, help="Comma-separated case prefixes, e.g. indicators,grid")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown before flagging")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    only = args.only.split(",") if args.only else None
+    current = run_benchmarks(sizes, only)
+
+    with open(args.baseline if args.save_baseline else args.output, "w") as f:
+        json.dump(current, f, indent=2)
+
+    if not args.save_baseline and os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            regressions = compare(current, json.load(f), args.tolerance)
+        for key, base, cur in regressions:
+            print(f"REGRESSION {key}: {base * 1e3:.2f} ms → {cur * 1e3:.2f} ms ({cur / base - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against baseline")
@@ -47,4 +47,50 @@ DEBUG = False                             # Toggle debug prints in realtime feed
 # ─── MACD Settings ───────────────────────────────────────────────────────────
 MACD_FAST_PERIOD   = 12                   # EMA period for the fast line
 MACD_SLOW_PERIOD   = 26                   # EMA period for the slow line
-MACD_SIGNAL_PERIOD = 9                    # EMA period for the signal line
\ No newline at end of file
+MACD_SIGNAL_PERIOD = 9                    # EMA period for the signal line
+
+# ─── Parameter Sweep Settings ────────────────────────────────────────────────
+SWEEP_WORKERS    = None                   # Worker processes (None = all cores)
+SWEEP_CHUNK_SIZE = 64                     # Parameter combos per worker task
+SWEEP_MIN_CELLS  = 2_000_000              # Below combos × bars, sweep in-process
+
+# ─── Historical Bar Store ────────────────────────────────────────────────────
+OHLCV_PAGE_LIMIT = 1000                   # Bars per REST page when syncing
+
+# ─── Monte Carlo Robustness ──────────────────────────────────────────────────
+MC_PATHS         = 100_000                # Resampled trade sequences per run
+MC_GRID_PATHS    = 2_000                  # Resamples per cell in grid responses (kept small: one run per cell)
+MC_PERCENTILES   = (5, 25, 50, 75, 95)    # Reported equity / drawdown percentiles
+MC_RUIN_FRACTION = 0.5                    # Losing this share of capital = ruin
+MC_BLOCK_CELLS   = 4_000_000              # Cap on (paths × trades) held at once
+
+# ─── Portfolio Backtest ──────────────────────────────────────────────────────
+PORTFOLIO_BALANCE = 10_000.0              # Starting quote balance shared by all symbols
+
+# ─── Backtest Result Cache ───────────────────────────────────────────────────
+RESULT_CACHE_SIZE = 4096                  # Cells kept in the in-process LRU tier
+RESULT_CACHE_TTL  = 7 * 86_400            # Redis expiry (s); keys change with the bars anyway
+
+# ─── Parameter Optimizer ─────────────────────────────────────────────────────
+OPTIMIZER_BUDGET   = 60                   # Full-history evaluations per search
+OPTIMIZER_PATIENCE = 20                   # Stop after this many evaluations without improvement
+
+# ─── Synthetic Market Data ───────────────────────────────────────────────────
+SYNTHETIC_FEED  = False                   # True = live engine streams generated bars, no network
+SYNTHETIC_SPEED = 60.0                    # Simulated seconds per real second (None = unpaced)
+
+# ─── Exchange Client ─────────────────────────────────────────────────────────
+MARKETS_TTL = 6 * 3600                    # Seconds before cached market metadata is refreshed
+
+# ─── Async Execution ─────────────────────────────────────────────────────────
+EXECUTOR_WORKERS     = 8                  # Threads for blocking exchange calls
+EXCHANGE_TIMEOUT     = 10.0               # Seconds before an awaited exchange call gives up
+BALANCE_REFRESH_SECS = 30.0               # Ledger reconciliation period against the exchange
+
+# ─── Live Feed ───────────────────────────────────────────────────────────────
+FEED_URL                = "wss://stream.binance.com:9443/stream"   # Combined-stream endpoint
+FEED_STREAMS_PER_SOCKET = 200             # Streams per connection (Binance allows 1024)
+FEED_CONTROL_INTERVAL   = 0.25            # Seconds between (UN)SUBSCRIBE messages (limit 5/s)
+FEED_RECONNECT_MIN      = 1.0             # First reconnect delay after a dropped socket (s)
+FEED_RECONNECT_MAX      = 60.0            # Backoff ceiling between reconnect attempts (s)
+STOP_TICK_STREAM        = None            # "bookTicker" or "trade": check stops on every tick, not just 1m closes
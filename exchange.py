@@ -1,18 +1,43 @@
 # File: exchange.py
 
 from dotenv import load_dotenv
+import json
 import os
+import threading
+import time
 import ccxt
 
+from config import MARKETS_TTL
+from logger import setup_logger
 
-def init_exchange():
-    """
-    Load API keys from .env and return a CCXT client for the selected exchange.
-    Supports 'kraken' and 'binance' (live or testnet via SANDBOX env var).
-    """
-    load_dotenv()
+"""
+Process-wide CCXT clients, one per exchange account.
+
+Clients are built once and reused, so their HTTP sessions and loaded
+markets are shared by every caller. Market metadata is cached on disk:
+a fresh cache is used as-is, a stale one is used immediately and refreshed
+on a background thread, and only an empty cache costs a blocking
+load_markets() round trip.
+"""
+
+MARKETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "markets")
+
+load_dotenv()
+
+_clients = {}        # (exchange, sandbox, api key) -> client
+_fetched_at = {}     # same key -> time the client's markets were fetched
+_refreshing = set()
+_lock = threading.Lock()
+
+
+def _account():
     ex_name = os.getenv("EXCHANGE", "binance").lower()
+    sandbox = os.getenv("SANDBOX", "").lower() in ("true", "1")
+    api_key = os.getenv(f"{ex_name.upper()}_API_KEY")
+    return ex_name, sandbox, api_key
 
+
+def _create_client(ex_name, sandbox):
     if ex_name == "kraken":
         api_key    = os.getenv("KRAKEN_API_KEY")
         api_secret = os.getenv("KRAKEN_API_SECRET")
@@ -39,23 +64,99 @@ def init_exchange():
             },
         })
         # Optional: use testnet if SANDBOX env var is set
-        if os.getenv("SANDBOX", "").lower() in ("true", "1"):
+        if sandbox:
             exchange.set_sandbox_mode(True)
 
     else:
         raise ValueError(f"Unsupported EXCHANGE: {ex_name}")
 
-    exchange.load_markets()
     return exchange
 
 
-def fetch_ohlcv(symbol, timeframe="1m", limit=100):
+def init_exchange():
+    """
+    Return the shared CCXT client for the selected exchange and account
+    (EXCHANGE, API keys and SANDBOX from .env), with markets loaded.
+    Supports 'kraken' and 'binance' (live or testnet via SANDBOX env var).
+    """
+    key = _account()
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _create_client(key[0], key[1])
+            _load_markets(client, key)
+            _clients[key] = client
+    if time.time() - _fetched_at[key] > MARKETS_TTL:
+        _refresh_in_background(client, key)
+    return client
+
+
+def _markets_path(key):
+    ex_name, sandbox, _ = key
+    return os.path.join(MARKETS_DIR, f"{ex_name}{'-sandbox' if sandbox else ''}.json")
+
+
+def _load_markets(client, key):
+    """
+    Markets from the disk cache if there is one (time sync runs in the
+    background), otherwise fetched now.
+    """
+    try:
+        with open(_markets_path(key)) as f:
+            cached = json.load(f)
+        client.set_markets(cached["markets"], cached.get("currencies"))
+        _fetched_at[key] = cached["fetched_at"]
+        if client.options.get("adjustForTimeDifference"):
+            threading.Thread(target=_sync_time, args=(client,), daemon=True).start()
+    except (OSError, ValueError, KeyError):
+        _fetch_markets(client, key)
+
+
+def _fetch_markets(client, key):
+    client.load_markets(reload=True)
+    _fetched_at[key] = time.time()
+    os.makedirs(MARKETS_DIR, exist_ok=True)
+    path = _markets_path(key)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"fetched_at": _fetched_at[key], "markets": client.markets,
+                   "currencies": client.currencies}, f, default=str)
+    os.replace(tmp, path)
+
+
+def _refresh_in_background(client, key):
+    with _lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            _fetch_markets(client, key)
+        except Exception as e:
+            setup_logger().warning(f"Market refresh failed for {key[0]}, keeping cached markets: {e}")
+        finally:
+            with _lock:
+                _refreshing.discard(key)
+
+    threading.Thread(target=refresh, daemon=True).start()
+
+
+def _sync_time(client):
+    try:
+        client.load_time_difference()
+    except Exception as e:
+        setup_logger().warning(f"Clock sync with {client.id} failed: {e}")
+
+
+def fetch_ohlcv(symbol, timeframe="1m", limit=100, since=None):
     """
-    Fetch OHLCV bars from the selected exchange.
+    Fetch OHLCV bars from the selected exchange, optionally starting at
+    `since` (ms since epoch).
     Returns a list of [timestamp, open, high, low, close, volume].
     """
     ex = init_exchange()
-    return ex.fetch_ohlcv(symbol, timeframe=timeframe, limit=limit)
+    return ex.fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
 
 
 def place_order(symbol, side, amount):
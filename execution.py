@@ -0,0 +1,149 @@
+# File: execution.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from config import EXECUTOR_WORKERS, EXCHANGE_TIMEOUT, BALANCE_REFRESH_SECS
+from exchange import init_exchange
+from ledger import BalanceLedger
+from logger import setup_logger
+
+"""
+Non-blocking exchange access for the asyncio engine.
+
+Every REST call on the shared CCXT client runs on a dedicated thread pool
+and is awaited with a timeout, so a slow call holds up only the coroutine
+that made it, never the event loop serving the other symbols. Lookups that
+are local to the client (markets, precision) stay synchronous.
+
+Balances come from a local BalanceLedger: our fills update it directly and
+a background task reconciles it with the exchange, so reading a balance
+never costs a REST call.
+"""
+
+
+class AsyncExchange:
+    """
+    Awaitable facade over a sync CCXT client, usable as a strategy's exchange.
+
+    Strategies call fetch_balance() synchronously inside on_bar; here that
+    reads the ledger instead of making a REST round trip. Orders lock what
+    they sell while in flight and book their fill when it returns.
+    """
+    def __init__(self, client, max_workers=EXECUTOR_WORKERS, timeout=EXCHANGE_TIMEOUT):
+        self.client = client
+        self.timeout = timeout
+        self.ledger = BalanceLedger()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="exchange")
+        self._refresher = None
+        self._inflight = 0
+        self._order_seq = 0         # bumped as each order starts and ends
+
+    async def call(self, method, *args, **kwargs):
+        """
+        Run client.<method>(*args, **kwargs) on the pool; raises
+        asyncio.TimeoutError after `timeout` seconds.
+        """
+        fn = partial(getattr(self.client, method), *args, **kwargs)
+        fut = asyncio.get_running_loop().run_in_executor(self._pool, fn)
+        return await asyncio.wait_for(fut, self.timeout)
+
+    # ─── Awaitable API ───────────────────────────────────────────────────────
+    async def refresh_balance(self):
+        """
+        Reconcile the ledger with the exchange; returns the balance.
+        """
+        seq = self._order_seq
+        balance = await self.call("fetch_balance")
+        if self._inflight or self._order_seq != seq:
+            # an order overlapped the fetch: its fill may or may not be in
+            # this snapshot, so leave the ledger be; the next run settles it
+            return balance
+        drift = self.ledger.reconcile(balance)
+        if drift:
+            setup_logger().info(f"Ledger reconciled with exchange, drift: {drift}")
+        return balance
+
+    async def initial_balance(self, delay=1.0, max_delay=BALANCE_REFRESH_SECS):
+        """
+        First ledger snapshot, retried with exponential backoff: an exchange
+        error at start-up delays a symbol's engine instead of ending it.
+        """
+        while True:
+            try:
+                return await self.refresh_balance()
+            except Exception as e:
+                setup_logger().warning(f"Initial balance fetch failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, max_delay)
+
+    async def create_market_order(self, symbol, side, amount):
+        """
+        Place a market order and book its fill in the ledger. An order that
+        fails or times out books nothing; reconciliation catches a late fill.
+        """
+        base = symbol.split("/")[0]
+        locked = self.ledger.lock(base, amount) if side == "sell" else 0.0
+        self._inflight += 1
+        self._order_seq += 1
+        try:
+            order = await self.call("create_market_order", symbol, side, amount)
+        finally:
+            self._inflight -= 1
+            self._order_seq += 1
+            self.ledger.unlock(base, locked)
+        filled = float(order.get("filled") or amount)
+        cost = order.get("cost") or filled * (order.get("average") or order.get("price") or 0.0)
+        self.ledger.apply_fill(symbol, side, filled, cost, order.get("fee"))
+        return order
+
+    async def fetch_ohlcv(self, symbol, timeframe="1m", limit=100, since=None):
+        return await self.call("fetch_ohlcv", symbol, timeframe=timeframe, since=since, limit=limit)
+
+    def submit_order(self, symbol, side, amount):
+        """
+        Fire-and-forget market order: returns the asyncio.Task at once.
+        """
+        return asyncio.create_task(self.create_market_order(symbol, side, amount))
+
+    def start(self, interval=BALANCE_REFRESH_SECS):
+        """
+        Start the periodic ledger reconciliation (once per facade).
+        """
+        if self._refresher is None:
+            self._refresher = asyncio.create_task(self._refresh_forever(interval))
+
+    async def _refresh_forever(self, interval):
+        while True:
+            await self._refresh_quietly()
+            await asyncio.sleep(interval)
+
+    async def _refresh_quietly(self):
+        try:
+            await self.refresh_balance()
+        except Exception as e:
+            setup_logger().warning(f"Balance reconcile failed, keeping ledger as is: {e}")
+
+    # ─── Synchronous, local ──────────────────────────────────────────────────
+    def fetch_balance(self):
+        return self.ledger.fetch_balance()
+
+    def amount_to_precision(self, symbol, amount):
+        return self.client.amount_to_precision(symbol, amount)
+
+    @property
+    def markets(self):
+        return self.client.markets
+
+
+_facades = {}
+
+def get_async_exchange():
+    """
+    The AsyncExchange wrapping the shared client from init_exchange().
+    """
+    client = init_exchange()
+    if id(client) not in _facades:
+        _facades[id(client)] = AsyncExchange(client)
+    return _facades[id(client)]
@@ -0,0 +1,85 @@
+# File: ledger.py
+
+from collections import defaultdict
+
+"""
+In-memory balance ledger shaped like ccxt's fetch_balance().
+
+Our own fills update it as they happen, so strategies can check balances on
+every bar without a REST call; a periodic reconcile() against the exchange
+corrects anything we didn't see (deposits, fees in other assets, orders
+that timed out but filled).
+"""
+
+
+class BalanceLedger:
+    """
+    Free and locked (used) amounts per asset.
+
+    Usage:
+        ledger = BalanceLedger(exchange.fetch_balance())
+        ledger.lock("SOL", 1.0)                     # order in flight
+        ledger.unlock("SOL", 1.0)
+        ledger.apply_fill("SOL/USDT", "sell", 1.0, 150.0, {"cost": 0.15, "currency": "USDT"})
+        ledger.fetch_balance()["free"]["USDT"]
+    """
+    def __init__(self, balance=None):
+        self.free = defaultdict(float)
+        self.used = defaultdict(float)
+        if balance:
+            self.reconcile(balance)
+
+    def fetch_balance(self):
+        """
+        {'free': {...}, 'used': {...}, 'total': {...}, asset: {free, used, total}, ...}
+        """
+        assets = set(self.free) | set(self.used)
+        free = {a: self.free[a] for a in assets}
+        used = {a: self.used[a] for a in assets}
+        total = {a: free[a] + used[a] for a in assets}
+        balance = {"free": free, "used": used, "total": total}
+        for a in assets:
+            balance[a] = {"free": free[a], "used": used[a], "total": total[a]}
+        return balance
+
+    def lock(self, asset, amount):
+        """
+        Move up to `amount` of `asset` from free to used; returns the amount locked.
+        """
+        amount = min(float(amount), max(self.free[asset], 0.0))
+        self.free[asset] -= amount
+        self.used[asset] += amount
+        return amount
+
+    def unlock(self, asset, amount):
+        amount = min(float(amount), self.used[asset])
+        self.used[asset] -= amount
+        self.free[asset] += amount
+
+    def apply_fill(self, symbol, side, filled, cost, fee=None):
+        """
+        Book a fill of `filled` base for `cost` quote; `fee` is ccxt's
+        {'cost', 'currency'} dict (or None).
+        """
+        base, quote = symbol.split("/")
+        sign = 1.0 if side == "buy" else -1.0
+        self.free[base] += sign * float(filled)
+        self.free[quote] -= sign * float(cost)
+        if fee and fee.get("cost"):
+            self.free[fee.get("currency") or quote] -= float(fee["cost"])
+
+    def reconcile(self, balance):
+        """
+        Adopt the exchange's balance; returns {asset: exchange total - ledger total}
+        for every asset that had drifted.
+        """
+        before = self.fetch_balance()["total"]
+        self.free = defaultdict(float, {a: float(v or 0.0) for a, v in balance.get("free", {}).items()})
+        self.used = defaultdict(float, {a: float(v or 0.0) for a, v in balance.get("used", {}).items()})
+        after = self.fetch_balance()["total"]
+        drift = {}
+        for asset in set(before) | set(after):
+            delta = after.get(asset, 0.0) - before.get(asset, 0.0)
+            if abs(delta) > 1e-12:
+                drift[asset] = delta
+        return drift
@@ -15,7 +15,7 @@ def send_telegram(message: str):
         return
     payload = {"chat_id": CHAT_ID, "text": message}
     try:
-        response = requests.post(API_URL, data=payload)
+        response = requests.post(API_URL, data=payload, timeout=10)
         response.raise_for_status()
     except Exception as e:
         print(f"Failed to send Telegram message: {e}")
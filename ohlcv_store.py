@@ -0,0 +1,242 @@
+# File: ohlcv_store.py
+
+import argparse
+import os
+import shutil
+import time
+
+import numpy as np
+
+from config import OHLCV_PAGE_LIMIT
+from logger import setup_logger
+
+"""
+On-disk OHLCV bar store keyed by (symbol, timeframe).
+
+Each series lives in its own directory with one raw binary file per column
+(ts as int64, the rest float64). New bars are appended, so syncing writes
+only bars newer than the last stored one, and reads memory-map the columns
+and slice by timestamp without loading the whole history. Asking for
+history older than the first stored bar fetches just that head and
+rewrites the series once with it prepended.
+"""
+
+STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ohlcv")
+COLUMNS = (("ts", np.int64), ("open", np.float64), ("high", np.float64),
+           ("low", np.float64), ("close", np.float64), ("volume", np.float64))
+
+_UNIT_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def timeframe_ms(timeframe):
+    """
+    Length of a timeframe like "1m", "5m" or "4h" in milliseconds.
+    """
+    return int(timeframe[:-1]) * _UNIT_MS[timeframe[-1]]
+
+
+class OhlcvStore:
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+        # (symbol, timeframe) -> oldest ts the exchange had nothing before
+        self._no_older = {}
+
+    def path(self, symbol, timeframe):
+        return os.path.join(self.root, symbol.replace("/", "-"), timeframe)
+
+    def _column_file(self, symbol, timeframe, name):
+        return os.path.join(self.path(symbol, timeframe), f"{name}.bin")
+
+    def count(self, symbol, timeframe):
+        """
+        Number of complete bars stored (columns are trimmed to the shortest,
+        so an append interrupted part-way never exposes a torn bar).
+        """
+        sizes = []
+        for name, dtype in COLUMNS:
+            f = self._column_file(symbol, timeframe, name)
+            sizes.append(os.path.getsize(f) // np.dtype(dtype).itemsize if os.path.exists(f) else 0)
+        return min(sizes)
+
+    def _columns(self, symbol, timeframe):
+        n = self.count(symbol, timeframe)
+        if not n:
+            return None
+        return [
+            np.memmap(self._column_file(symbol, timeframe, name), dtype=dtype, mode="r", shape=(n,))
+            for name, dtype in COLUMNS
+        ]
+
+    def first_ts(self, symbol, timeframe):
+        cols = self._columns(symbol, timeframe)
+        return int(cols[0][0]) if cols else None
+
+    def last_ts(self, symbol, timeframe):
+        cols = self._columns(symbol, timeframe)
+        return int(cols[0][-1]) if cols else None
+
+    def append(self, symbol, timeframe, bars):
+        """
+        Append bars newer than the last stored one; returns how many were written.
+        """
+        last = self.last_ts(symbol, timeframe)
+        new = [b for b in bars if last is None or b[0] > last]
+        new.sort(key=lambda b: b[0])
+        if not new:
+            return 0
+
+        os.makedirs(self.path(symbol, timeframe), exist_ok=True)
+        n = self.count(symbol, timeframe)
+        arr = np.asarray(new, dtype=np.float64)
+        for i, (name, dtype) in enumerate(COLUMNS):
+            f = self._column_file(symbol, timeframe, name)
+            with open(f, "ab") as fh:
+                fh.truncate(n * np.dtype(dtype).itemsize)
+                fh.write(arr[:, i].astype(dtype).tobytes())
+        return len(new)
+
+    def prepend(self, symbol, timeframe, bars):
+        """
+        Insert bars older than the first stored one; returns how many were
+        written. The series is rewritten in a sibling directory and swapped
+        in, so readers never see columns of different lengths.
+        """
+        first = self.first_ts(symbol, timeframe)
+        if first is None:
+            return self.append(symbol, timeframe, bars)
+        new = sorted((b for b in bars if b[0] < first), key=lambda b: b[0])
+        if not new:
+            return 0
+
+        path = self.path(symbol, timeframe)
+        tmp, old = path + ".tmp", path + ".old"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        head = np.asarray(new, dtype=np.float64)
+        for i, (col, (name, dtype)) in enumerate(zip(self._columns(symbol, timeframe), COLUMNS)):
+            with open(os.path.join(tmp, f"{name}.bin"), "wb") as fh:
+                fh.write(head[:, i].astype(dtype).tobytes())
+                fh.write(np.asarray(col).tobytes())
+        os.replace(path, old)
+        os.replace(tmp, path)
+        shutil.rmtree(old, ignore_errors=True)
+        return len(new)
+
+    def read(self, symbol, timeframe, start=None, end=None, limit=None):
+        """
+        Bars with start <= ts < end (ms since epoch), the last `limit` of them
+        if given, as an (n, 6) float64 array of [ts, o, h, l, c, v] rows.
+        """
+        cols = self._columns(symbol, timeframe)
+        if cols is None:
+            return np.empty((0, 6))
+        ts = cols[0]
+        lo = int(np.searchsorted(ts, start)) if start is not None else 0
+        hi = int(np.searchsorted(ts, end)) if end is not None else len(ts)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return np.column_stack([c[lo:hi].astype(np.float64) for c in cols])
+
+    def sync(self, symbol, timeframe, since=None, exchange=None):
+        """
+        Fetch only the bars missing from the series, paging through the REST
+        API: everything after the last stored bar, plus the head from `since`
+        up to the first stored bar when the series starts later than that.
+        The still-forming bar is never stored. Returns the number added.
+        """
+        tf = timeframe_ms(timeframe)
+        first, last = self.first_ts(symbol, timeframe), self.last_ts(symbol, timeframe)
+        cursor = last + tf if last is not None else since
+        if cursor is None:
+            raise ValueError(f"No stored bars for {symbol} {timeframe}; pass `since`")
+
+        if exchange is None:
+            from exchange import init_exchange
+            exchange = init_exchange()
+
+        added = 0
+        key = (symbol, timeframe)
+        if first is not None and since is not None and since < first and self._no_older.get(key) != first:
+            head = [b for page in self._pages(exchange, symbol, timeframe, since, first) for b in page]
+            if head:
+                added += self.prepend(symbol, timeframe, head)
+            else:
+                self._no_older[key] = first
+
+        # closed bars only: the one still forming opens after now - tf
+        now = int(time.time() * 1000)
+        for page in self._pages(exchange, symbol, timeframe, cursor, now - tf + 1):
+            added += self.append(symbol, timeframe, page)
+        return added
+
+    def _pages(self, exchange, symbol, timeframe, start, end):
+        # REST pages of bars with start <= ts < end, oldest first
+        tf = timeframe_ms(timeframe)
+        cursor = start
+        while cursor < end:
+            page = exchange.fetch_ohlcv(symbol, timeframe=timeframe, since=cursor, limit=OHLCV_PAGE_LIMIT)
+            got = [b for b in page if cursor <= b[0] < end]
+            if not got:
+                break
+            yield got
+            cursor = got[-1][0] + tf
+            if len(page) < OHLCV_PAGE_LIMIT:
+                break
+
+
+_default_store = OhlcvStore()
+
+
+def load_ohlcv(symbol, timeframe, limit=500, sync=True, store=None):
+    """
+    Last `limit` closed bars for (symbol, timeframe) from the local store,
+    syncing any missing bars first. If the exchange can't be reached the
+    stored bars are returned as they are, so backtests keep working offline.
+    """
+    store = store or _default_store
+    if sync:
+        _sync_quietly(store, symbol, timeframe, int(time.time() * 1000) - (limit + 1) * timeframe_ms(timeframe))
+    return store.read(symbol, timeframe, limit=limit)
+
+
+def load_covering(symbol, timeframe, bars, sync=True, store=None):
+    """
+    Closed `timeframe` bars spanning coarser `bars`, from the first bar's open
+    to the last one's close: the fine_bars of backtests.engine.run_backtest.
+    """
+    store = store or _default_store
+    bars = np.asarray(bars, dtype=np.float64).reshape(-1, 6)
+    if not len(bars):
+        return np.empty((0, 6))
+    start = int(bars[0, 0])
+    step = int(np.median(np.diff(bars[:, 0]))) if len(bars) > 1 else timeframe_ms(timeframe)
+    if sync:
+        _sync_quietly(store, symbol, timeframe, start)
+    return store.read(symbol, timeframe, start=start, end=int(bars[-1, 0]) + step)
+
+
+def _sync_quietly(store, symbol, timeframe, since):
+    try:
+        store.sync(symbol, timeframe, since=since)
+    except Exception as e:
+        setup_logger().warning(f"OHLCV sync failed for {symbol} {timeframe}, using stored bars: {e}")
+
+
+def to_rows(bars):
+    """
+    Bars as JSON-friendly [int ts, o, h, l, c, v] lists.
+    """
+    return [[int(b[0]), *b[1:]] for b in np.asarray(bars).tolist()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the local OHLCV store")
+    parser.add_argument("symbol", help="e.g. SOL/USDT")
+    parser.add_argument("timeframe", help="e.g. 5m")
+    parser.add_argument("--days", type=int, default=365, help="History to fetch for an empty series")
+    args = parser.parse_args()
+
+    since = int(time.time() * 1000) - args.days * 86_400_000
+    added = _default_store.sync(args.symbol, args.timeframe, since=since)
+    print(f"{args.symbol} {args.timeframe}: +{added} bars, "
+          f"{_default_store.count(args.symbol, args.timeframe)} stored")
@@ -1,7 +1,178 @@
 # realtime.py
 
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
 import aiohttp
 
+from config import (
+    FEED_URL, FEED_STREAMS_PER_SOCKET, FEED_CONTROL_INTERVAL,
+    FEED_RECONNECT_MIN, FEED_RECONNECT_MAX, OHLCV_PAGE_LIMIT,
+)
+from logger import setup_logger
+from ohlcv_store import timeframe_ms
+from utils.streaming import BarResampler
+
+"""
+Live kline feeds. Sockets reconnect with exponential backoff, and every
+consumer tracks the open time of its last bar: after a reconnect, or when
+a live bar skips ahead, only the missing closed bars are fetched over REST
+and replayed in order before live bars resume.
+"""
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:          # optional: the standard parser is the fallback
+    _loads = json.loads
+
+# Queued to a stream's consumers when its socket (re)connects
+RESYNC = None
+
+# Binance serialises frames compactly, so every forming kline contains this
+_FORMING = '"x":false'
+
+# Where the price sits in a tick frame: best bid for bookTicker, last price for trade
+_TICK_FIELDS = {"bookTicker": '"b":"', "trade": '"p":"'}
+
+# Combined-stream frames open with '{"stream":"<name>"'
+_STREAM_AT = len('{"stream":"')
+
+
+def stream_name(symbol: str, interval: str) -> str:
+    """
+    Binance stream name for (symbol, interval), e.g. "solusdt@kline_5m".
+    """
+    return f"{symbol.replace('/', '').lower()}@kline_{interval}"
+
+
+def decode_kline(data):
+    """
+    [openTime_ms, open, high, low, close, volume] for a *closed* kline
+    event, None for a kline still forming.
+    """
+    k = data.get("k", {})
+    # `x` means the kline is closed
+    if not k.get("x"):
+        return None
+    return [
+        k["t"],          # open time (ms since epoch)
+        float(k["o"]),   # open
+        float(k["h"]),   # high
+        float(k["l"]),   # low
+        float(k["c"]),   # close
+        float(k["v"]),   # volume
+    ]
+
+
+async def _rest_fetch(symbol, timeframe, since, limit):
+    from execution import get_async_exchange
+    return await get_async_exchange().fetch_ohlcv(symbol, timeframe=timeframe, since=since, limit=limit)
+
+
+async def fetch_missing(symbol, interval, after, until, fetch=_rest_fetch):
+    """
+    Closed bars with after < openTime < until over REST, paged and in order.
+    """
+    tf = timeframe_ms(interval)
+    cursor, out = after + tf, []
+    while cursor < until:
+        page = [b for b in await fetch(symbol, interval, cursor, OHLCV_PAGE_LIMIT) if cursor <= b[0] < until]
+        if not page:
+            break
+        out.extend(page)
+        cursor = page[-1][0] + tf
+    return [[int(b[0]), *map(float, b[1:6])] for b in out]
+
+
+def tick_price(raw, kind):
+    """
+    The price in a bookTicker (best bid) or trade frame, sliced out of the
+    text without parsing the JSON.
+    """
+    field = _TICK_FIELDS[kind]
+    i = raw.index(field) + len(field)
+    return float(raw[i:raw.index('"', i)])
+
+
+def decode_frame(raw):
+    """
+    (stream, bar) for a text frame carrying a closed kline, None otherwise
+    (`stream` is None on single-stream sockets). Forming klines, nearly all
+    of the traffic, are rejected by a substring test before any parsing.
+    """
+    if _FORMING in raw:
+        return None
+    frame = _loads(raw)
+    bar = decode_kline(frame.get("data", frame))
+    return None if bar is None else (frame.get("stream"), bar)
+
+
+class GapFiller:
+    """
+    Keeps one consumer's bars contiguous: drops replayed bars and splices in
+    whatever a dropped socket missed.
+
+    Usage:
+        filler = GapFiller("SOL/USDT", "5m")
+        for bar in await filler.on_bar(live_bar_or_RESYNC):
+            ...
+    """
+    def __init__(self, symbol, interval, fetch=_rest_fetch):
+        self.symbol = symbol
+        self.interval = interval
+        self.fetch = fetch
+        self.tf = timeframe_ms(interval)
+        self.last = None
+
+    async def on_bar(self, bar):
+        """
+        Bars to hand on, in order, for a live `bar` (or RESYNC after a reconnect).
+        """
+        if bar is RESYNC:
+            # everything up to the bar still forming has closed
+            now = int(time.time() * 1000)
+            return await self._fill(now - now % self.tf)
+        t = bar[0]
+        if self.last is not None and t <= self.last:
+            return []
+        missing = await self._fill(t) if self.last is not None and t > self.last + self.tf else []
+        self.last = t
+        return missing + [bar]
+
+    async def _fill(self, until):
+        if self.last is None:
+            return []
+        try:
+            missing = await fetch_missing(self.symbol, self.interval, self.last, until, self.fetch)
+        except Exception as e:
+            setup_logger().warning(f"Gap backfill failed for {self.symbol} {self.interval}: {e}")
+            return []
+        if missing:
+            self.last = missing[-1][0]
+            setup_logger().info(f"Backfilled {len(missing)} {self.interval} bars for {self.symbol}")
+        return missing
+
+
+class Backoff:
+    """
+    Exponential reconnect delays, reset once a connection is up.
+    """
+    def __init__(self, low=FEED_RECONNECT_MIN, high=FEED_RECONNECT_MAX):
+        self.low, self.high = low, high
+        self.delay = low
+
+    def reset(self):
+        self.delay = self.low
+
+    async def wait(self, what):
+        setup_logger().warning(f"{what} dropped, reconnecting in {self.delay:.1f}s")
+        await asyncio.sleep(self.delay)
+        self.delay = min(self.delay * 2, self.high)
+
+
 class Realtime:
     """
     Async generator for Binance kline (candlestick) data.
@@ -12,31 +183,366 @@ class Realtime:
             # bar == [openTime_ms, open, high, low, close, volume]
     """
 
-    def __init__(self, symbol: str, interval: str):
+    def __init__(self, symbol: str, interval: str, fetch=_rest_fetch):
         # symbol e.g. "BTC/USDT"; interval e.g. "5m", "1h", etc.
+        self.pair = symbol
         self.symbol = symbol.replace("/", "").lower()
         self.interval = interval
         self.url = f"wss://stream.binance.com:9443/ws/{self.symbol}@kline_{self.interval}"
+        self.fetch = fetch
 
     async def ohlcv_stream(self):
         """
         Connects to Binance WebSocket and yields each *closed* kline as:
         [openTime_ms, open, high, low, close, volume]
+        Reconnects on its own and backfills missed bars over REST.
         """
+        filler = GapFiller(self.pair, self.interval, self.fetch)
+        backoff = Backoff()
         async with aiohttp.ClientSession() as session:
-            async with session.ws_connect(self.url) as ws:
-                async for msg in ws:
-                    if msg.type != aiohttp.WSMsgType.TEXT:
-                        continue
-                    data = msg.json()
-                    k = data.get("k", {})
-                    # `x` means the kline is closed
-                    if k.get("x"):
-                        yield [
-                            k["t"],          # open time (ms since epoch)
-                            float(k["o"]),   # open
-                            float(k["h"]),   # high
-                            float(k["l"]),   # low
-                            float(k["c"]),   # close
-                            float(k["v"]),   # volume
-                        ]
+            while True:
+                try:
+                    async with session.ws_connect(self.url, heartbeat=30) as ws:
+                        backoff.reset()
+                        for bar in await filler.on_bar(RESYNC):
+                            yield bar
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            hit = decode_frame(msg.data)
+                            if hit is not None:
+                                for bar in await filler.on_bar(hit[1]):
+                                    yield bar
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # a dropped socket or an unreadable frame: reconnect rather than end the stream
+                    setup_logger().error(f"Kline socket error for {self.pair} {self.interval}: {e}")
+                await backoff.wait(f"Kline socket for {self.pair} {self.interval}")
+
+
+class _Socket:
+    """
+    One combined-stream connection. Streams are (un)subscribed at runtime
+    with control messages, batched so Binance's per-socket message rate
+    limit holds however fast subscriptions change.
+    """
+    def __init__(self, manager):
+        self.manager = manager
+        self.streams = set()
+        self._pending = {}          # stream -> "SUBSCRIBE" | "UNSUBSCRIBE"
+        self._dirty = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    def add(self, stream):
+        self.streams.add(stream)
+        self._pending[stream] = "SUBSCRIBE"
+        self._dirty.set()
+
+    def remove(self, stream):
+        self.streams.discard(stream)
+        self._pending[stream] = "UNSUBSCRIBE"
+        self._dirty.set()
+
+    def close(self):
+        self._task.cancel()
+
+    async def _run(self):
+        backoff = Backoff(self.manager.reconnect_min, self.manager.reconnect_max)
+        while True:
+            try:
+                async with self.manager.connect(self.manager.url) as ws:
+                    backoff.reset()
+                    control = asyncio.create_task(self._control(ws))
+                    self.manager._resync(self.streams)
+                    try:
+                        ticks = self.manager._ticks
+                        async for msg in ws:
+                            if msg.type != aiohttp.WSMsgType.TEXT:
+                                continue
+                            raw = msg.data
+                            if ticks:
+                                stream = raw[_STREAM_AT:raw.find('"', _STREAM_AT)]
+                                listeners = ticks.get(stream)
+                                if listeners:
+                                    self._deliver(stream, raw, *listeners)
+                                    continue
+                            hit = decode_frame(raw)
+                            if hit is not None and hit[0] is not None:
+                                self.manager._dispatch(*hit)
+                    finally:
+                        control.cancel()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                setup_logger().error(f"Feed socket failed ({len(self.streams)} streams): {e}")
+            await backoff.wait(f"Feed socket ({len(self.streams)} streams)")
+
+    def _deliver(self, stream, raw, kind, callbacks):
+        # a failing listener must not take the shared socket (and every other stream) down
+        try:
+            price = tick_price(raw, kind)
+        except ValueError as e:
+            setup_logger().warning(f"Unreadable {stream} frame: {e}")
+            return
+        for callback in callbacks:
+            try:
+                callback(price)
+            except Exception as e:
+                setup_logger().error(f"Tick listener on {stream} failed: {e}")
+
+    async def _control(self, ws):
+        # a fresh connection carries nothing: subscribe everything we hold
+        self._pending = {s: "SUBSCRIBE" for s in self.streams}
+        self._dirty.set()
+        msg_id = 0
+        while True:
+            await self._dirty.wait()
+            self._dirty.clear()
+            batches = {}
+            for stream, method in self._pending.items():
+                batches.setdefault(method, []).append(stream)
+            self._pending = {}
+            for method, params in batches.items():
+                msg_id += 1
+                await ws.send_json({"method": method, "params": sorted(params), "id": msg_id})
+                await asyncio.sleep(self.manager.control_interval)
+
+
+class FeedManager:
+    """
+    Shares a few combined-stream sockets among every (symbol, interval)
+    kline subscription and demultiplexes closed bars into per-subscriber
+    asyncio queues.
+
+    Usage:
+        feeds = FeedManager()
+        q = feeds.subscribe("SOL/USDT", "5m")
+        bar = await q.get()
+        feeds.unsubscribe("SOL/USDT", "5m", q)
+
+    or, as a drop-in for Realtime:
+        async for bar in feeds.feed("SOL/USDT", "5m").ohlcv_stream(): ...
+    """
+    def __init__(self, url=FEED_URL, streams_per_socket=FEED_STREAMS_PER_SOCKET,
+                 control_interval=FEED_CONTROL_INTERVAL, connect=None, fetch=_rest_fetch,
+                 reconnect_min=FEED_RECONNECT_MIN, reconnect_max=FEED_RECONNECT_MAX):
+        self.url = url
+        self.streams_per_socket = streams_per_socket
+        self.control_interval = control_interval
+        self.connect = connect or self._ws_connect
+        self.fetch = fetch
+        self.reconnect_min = reconnect_min
+        self.reconnect_max = reconnect_max
+        self._session = None
+        self._sockets = []
+        self._queues = {}           # stream -> [asyncio.Queue]
+        self._ticks = {}            # stream -> (kind, [callback])
+        self._owner = {}            # stream -> _Socket
+
+    @asynccontextmanager
+    async def _ws_connect(self, url):
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        async with self._session.ws_connect(url, heartbeat=30) as ws:
+            yield ws
+
+    def subscribe(self, symbol, interval):
+        """
+        A new queue receiving every closed bar of (symbol, interval).
+        """
+        stream = stream_name(symbol, interval)
+        if stream not in self._queues:
+            self._queues[stream] = []
+            self._attach(stream)
+        queue = asyncio.Queue()
+        self._queues[stream].append(queue)
+        return queue
+
+    def unsubscribe(self, symbol, interval, queue):
+        """
+        Detach `queue`; the stream is dropped with its last subscriber and
+        a socket is closed with its last stream.
+        """
+        stream = stream_name(symbol, interval)
+        queues = self._queues.get(stream, [])
+        if queue in queues:
+            queues.remove(queue)
+        if queues or stream not in self._queues:
+            return
+        del self._queues[stream]
+        self._detach(stream)
+
+    def add_tick_listener(self, symbol, kind, callback):
+        """
+        Call `callback(price)` on every tick of `symbol` straight from the
+        socket reader, with no queue in between; `kind` is "bookTicker"
+        (price = best bid) or "trade" (price = last trade). Callbacks must
+        not block.
+        """
+        stream = f"{symbol.replace('/', '').lower()}@{kind}"
+        if stream not in self._ticks:
+            self._ticks[stream] = (kind, [])
+            self._attach(stream)
+        self._ticks[stream][1].append(callback)
+
+    def remove_tick_listener(self, symbol, kind, callback):
+        stream = f"{symbol.replace('/', '').lower()}@{kind}"
+        callbacks = self._ticks.get(stream, (kind, []))[1]
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks and stream in self._ticks:
+            del self._ticks[stream]
+            self._detach(stream)
+
+    def _attach(self, stream):
+        sock = next((s for s in self._sockets if len(s.streams) < self.streams_per_socket), None)
+        if sock is None:
+            sock = _Socket(self)
+            self._sockets.append(sock)
+        sock.add(stream)
+        self._owner[stream] = sock
+
+    def _detach(self, stream):
+        sock = self._owner.pop(stream)
+        sock.remove(stream)
+        if not sock.streams:
+            sock.close()
+            self._sockets.remove(sock)
+
+    def _resync(self, streams):
+        for stream in streams:
+            for queue in self._queues.get(stream, []):
+                queue.put_nowait(RESYNC)
+
+    def _dispatch(self, stream, bar):
+        for queue in self._queues.get(stream, ()):
+            queue.put_nowait(bar)
+
+    def feed(self, symbol, interval):
+        return ManagedFeed(self, symbol, interval)
+
+    @property
+    def socket_count(self):
+        return len(self._sockets)
+
+    async def close(self):
+        for sock in self._sockets:
+            sock.close()
+        self._sockets, self._queues, self._owner = [], {}, {}
+        self._ticks.clear()
+        if self._session is not None:
+            await self._session.close()
+
+
+class ManagedFeed:
+    """
+    Drop-in for Realtime backed by a shared FeedManager: ohlcv_stream()
+    subscribes on first iteration and unsubscribes when the consumer stops.
+    Bars a reconnect missed are backfilled before live bars resume.
+    """
+    def __init__(self, manager, symbol, interval):
+        self.manager = manager
+        self.symbol = symbol
+        self.interval = interval
+
+    async def ohlcv_stream(self):
+        queue = self.manager.subscribe(self.symbol, self.interval)
+        filler = GapFiller(self.symbol, self.interval, self.manager.fetch)
+        try:
+            while True:
+                for bar in await filler.on_bar(await queue.get()):
+                    yield bar
+        finally:
+            self.manager.unsubscribe(self.symbol, self.interval, queue)
+
+
+class MultiTimeframe:
+    """
+    Every timeframe of one symbol from a single 1m stream: 1m bars pass
+    straight through and coarser bars are resampled locally, so adding a
+    timeframe costs no socket.
+
+    Usage:
+        mtf = MultiTimeframe("SOL/USDT")
+        async for bar in mtf.feed("15m").ohlcv_stream(): ...
+    """
+    BASE = "1m"
+
+    def __init__(self, symbol, source=None):
+        self.symbol = symbol
+        self.source = source or make_feed(symbol, self.BASE)
+        self._subs = {}             # interval -> (BarResampler or None, [asyncio.Queue])
+        self._task = None
+
+    def feed(self, interval):
+        return _TimeframeFeed(self, interval)
+
+    def subscribe(self, interval):
+        if interval not in self._subs:
+            resampler = None if interval == self.BASE else BarResampler(timeframe_ms(interval))
+            self._subs[interval] = (resampler, [])
+        queue = asyncio.Queue()
+        self._subs[interval][1].append(queue)
+        if self._task is None:
+            self._task = asyncio.create_task(self._pump())
+        return queue
+
+    def unsubscribe(self, interval, queue):
+        queues = self._subs.get(interval, (None, []))[1]
+        if queue in queues:
+            queues.remove(queue)
+        if not queues:
+            self._subs.pop(interval, None)
+        if not self._subs and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _pump(self):
+        async for bar in self.source.ohlcv_stream():
+            for resampler, queues in list(self._subs.values()):
+                out = bar if resampler is None else resampler.update(bar)
+                if out is not None:
+                    for queue in queues:
+                        queue.put_nowait(out)
+
+
+class _TimeframeFeed:
+    # Drop-in for Realtime over a MultiTimeframe
+    def __init__(self, mtf, interval):
+        self.mtf = mtf
+        self.interval = interval
+
+    async def ohlcv_stream(self):
+        queue = self.mtf.subscribe(self.interval)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.mtf.unsubscribe(self.interval, queue)
+
+
+_feed_manager = None
+
+
+def get_feed_manager():
+    """
+    The process-wide FeedManager every live feed shares.
+    """
+    global _feed_manager
+    if _feed_manager is None:
+        _feed_manager = FeedManager()
+    return _feed_manager
+
+
+def make_feed(symbol: str, interval: str):
+    """
+    The live bar source for (symbol, interval): a stream on the shared
+    Binance feed manager, or the local generator when config.SYNTHETIC_FEED
+    is set.
+    """
+    from config import SYNTHETIC_FEED
+    if SYNTHETIC_FEED:
+        from synthetic import SyntheticFeed
+        return SyntheticFeed(symbol, interval)
+    return get_feed_manager().feed(symbol, interval)
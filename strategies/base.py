@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from utils.indicator_context import IndicatorContext
+
 class BaseStrategy(ABC):
     def __init__(self, exchange, config):
         """
@@ -10,10 +12,34 @@ class BaseStrategy(ABC):
         self.config   = config
 
     @abstractmethod
-    def on_bar(self, ohlcv):
+    def on_bar(self, ohlcv, ctx=None):
         """
         Called once per new bar.
         ohlcv: list of [ts,o,h,l,c,v] bars
+        ctx:   optional IndicatorContext shared by all strategies on the symbol
         Return: a dict like {"side":"buy","amount":0.1} or None
         """
         pass
+
+    def context(self, ohlcv, ctx=None):
+        """
+        Return the shared IndicatorContext, or a private one built from `ohlcv`.
+        """
+        return ctx if ctx is not None else IndicatorContext(ohlcv)
+
+    def stop_levels(self):
+        """
+        (stop price, trailing fraction) enforced between bars while a
+        position is open; None for either one the strategy doesn't use.
+        The trail follows the highest 1m close since entry, live and in
+        the backtest engine alike.
+        """
+        return getattr(self, "stop_loss_price", None), None
+
+    def on_stopped(self):
+        """
+        Called after a stop filled outside on_bar: forget the open position.
+        """
+        for attr in ("entry_price", "stop_loss_price"):
+            if hasattr(self, attr):
+                setattr(self, attr, None)
@@ -1,6 +1,5 @@
 # File: strategies/bollinger.py
 from .base import BaseStrategy
-from utils.indicators import bollinger_bands
 from config import ORDER_FRACTION, STOP_LOSS_PCT
 
 class BollingerStrategy(BaseStrategy):
@@ -20,18 +19,16 @@ class BollingerStrategy(BaseStrategy):
         self.entry_price = None
         self.stop_loss_price = None
 
-    def on_bar(self, ohlcv):
+    def on_bar(self, ohlcv, ctx=None):
         """
         Called on each new bar. Returns a signal dict or None.
         """
-        closes = [bar[4] for bar in ohlcv]
-        if len(closes) < self.period:
+        ctx = self.context(ohlcv, ctx)
+        if len(ctx) < self.period:
             return None
 
-        price = closes[-1]
-        lower, middle, upper = bollinger_bands(closes, self.period, self.num_std_dev)
-        lb = lower[-1]
-        ub = upper[-1]
+        price = ctx.close
+        lb, _, ub = ctx.bollinger(self.period, self.num_std_dev)
 
         # 1) Hard stop-loss check
         if self.stop_loss_price and price <= self.stop_loss_price:
@@ -1,6 +1,5 @@
 # File: strategies/macd.py
 from .base import BaseStrategy
-from utils.indicators import macd_lines
 from config import (
     MACD_FAST_PERIOD, MACD_SLOW_PERIOD, MACD_SIGNAL_PERIOD,
     ORDER_FRACTION, STOP_LOSS_PCT
@@ -22,12 +21,12 @@ class MacdStrategy(BaseStrategy):
         self.entry_price     = None
         self.stop_loss_price = None
 
-    def on_bar(self, ohlcv):
-        closes = [bar[4] for bar in ohlcv]
-        if len(closes) < self.slow + self.signal:
+    def on_bar(self, ohlcv, ctx=None):
+        ctx = self.context(ohlcv, ctx)
+        if len(ctx) < self.slow + self.signal:
             return None
 
-        price = closes[-1]
+        price = ctx.close
 
         # Emergency stop-loss
         if self.stop_loss_price and price <= self.stop_loss_price:
@@ -38,11 +37,8 @@ class MacdStrategy(BaseStrategy):
                 self.entry_price = self.stop_loss_price = None
                 return {"side": "sell", "amount": amt}
 
-        macd_line, signal_line, hist = macd_lines(
-            closes, self.fast, self.slow, self.signal
-        )
-        prev_hist = hist[-2]
-        curr_hist = hist[-1]
+        prev_hist = ctx.macd(self.fast, self.slow, self.signal, back=1)[2]
+        curr_hist = ctx.macd(self.fast, self.slow, self.signal)[2]
 
         # Buy: histogram crosses ≤0 → >0
         if prev_hist is not None and curr_hist is not None:
@@ -29,35 +29,20 @@ class RsiStrategy(BaseStrategy):
         self.entry_time      = None
         self.highest_price   = None
 
-    def compute_rsi(self, closes):
-        """
-        Wilder's RSI calculation over the last `period` bars.
-        """
-        window = closes[-(self.period + 1):]
-        deltas = [window[i] - window[i - 1] for i in range(1, len(window))]
-        gains  = [d for d in deltas if d > 0]
-        losses = [abs(d) for d in deltas if d < 0]
-        avg_gain = sum(gains) / self.period if gains else 0
-        avg_loss = sum(losses) / self.period if losses else 0
-        if avg_loss == 0:
-            return 100
-        rs = avg_gain / avg_loss
-        return 100 - (100 / (1 + rs))
-
-    def on_bar(self, ohlcv):
+    def on_bar(self, ohlcv, ctx=None):
         """
         Called on each new bar. Returns a signal dict:
           {"side": "buy"/"sell", "amount": float, "reason": optional str}
         or None.
         """
-        closes = [bar[4] for bar in ohlcv]
+        ctx = self.context(ohlcv, ctx)
         # Not enough data yet
-        if len(closes) < self.period + 1:
+        if len(ctx) < self.period + 1:
             return None
 
-        price     = closes[-1]
+        price     = ctx.close
         now       = datetime.utcnow()
-        current_rsi = self.compute_rsi(closes)
+        current_rsi = ctx.rsi(self.period)
         signal    = None
 
         # --- 1) Exit logic (if in position) ---
@@ -113,3 +98,14 @@ class RsiStrategy(BaseStrategy):
         # Update last RSI for next bar
         self._last_rsi = current_rsi
         return None
+
+    def stop_levels(self):
+        # The trailing stop is the only exit that can fire between bars
+        return None, (TRAIL_PCT if self.in_position else None)
+
+    def on_stopped(self):
+        self.in_position     = False
+        self.position_amount = 0.0
+        self.entry_price     = None
+        self.entry_time      = None
+        self.highest_price   = None
@@ -1,7 +1,6 @@
 # File: strategies/sma_crossover.py
 
 from .base import BaseStrategy
-import statistics
 from config import ORDER_FRACTION, STOP_LOSS_PCT
 
 class SmaCrossover(BaseStrategy):
@@ -9,16 +8,18 @@ class SmaCrossover(BaseStrategy):
         super().__init__(exchange, config)
         self.fast  = config["fast"]
         self.slow  = config["slow"]
+        # None disables the hard stop (signal-only backtests)
+        self.stop_loss_pct = config.get("stop_loss_pct", STOP_LOSS_PCT)
         # Track open position for stop-loss
         self.entry_price     = None
         self.stop_loss_price = None
 
-    def on_bar(self, ohlcv):
-        closes = [bar[4] for bar in ohlcv]
-        if len(closes) < self.slow + 1:
+    def on_bar(self, ohlcv, ctx=None):
+        ctx = self.context(ohlcv, ctx)
+        if len(ctx) < self.slow + 1:
             return None
 
-        price = closes[-1]
+        price = ctx.close
 
         # ── 1) Stop-loss check ──────────────────────────────────────────────
         if self.stop_loss_price is not None and price <= self.stop_loss_price:
@@ -31,17 +32,11 @@ class SmaCrossover(BaseStrategy):
                 self.stop_loss_price = None
                 return {"side": "sell", "amount": amt}
 
-        # ── 2) Compute SMAs ────────────────────────────────────────────────
-        sma_fast_prev = statistics.mean(closes[-(self.fast+1):-1])
-        sma_slow_prev = statistics.mean(closes[-(self.slow+1):-1])
-        sma_fast_now  = statistics.mean(closes[-self.fast:])
-        sma_slow_now  = statistics.mean(closes[-self.slow:])
+        # ── 2) SMA crossover on this bar (+1 up, -1 down, 0 none) ──────────
+        cross = ctx.sma_cross(self.fast, self.slow)
 
         # ── 3) Buy signal (only when flat) ─────────────────────────────────
-        if (self.entry_price is None
-            and sma_fast_prev <= sma_slow_prev
-            and sma_fast_now > sma_slow_now):
-
+        if self.entry_price is None and cross > 0:
             # dynamically pick quote balance (USD vs USDT)
             quote = self.config["symbol"].split("/")[1]
             quote_bal = self.exchange.fetch_balance()["free"].get(quote, 0)
@@ -53,14 +48,12 @@ class SmaCrossover(BaseStrategy):
             ))
             # set entry & stop-loss
             self.entry_price     = price
-            self.stop_loss_price = price * (1 - STOP_LOSS_PCT)
+            if self.stop_loss_pct:
+                self.stop_loss_price = price * (1 - self.stop_loss_pct)
             return {"side": "buy", "amount": amt}
 
         # ── 4) Sell signal ───────────────────────────────────────────────────
-        if (self.entry_price is not None
-            and sma_fast_prev >= sma_slow_prev
-            and sma_fast_now < sma_slow_now):
-
+        if self.entry_price is not None and cross < 0:
             asset = self.config["symbol"].split("/")[0]
             bal   = self.exchange.fetch_balance()["free"].get(asset, 0)
             if bal > 0:
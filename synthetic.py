@@ -0,0 +1,205 @@
+# File: synthetic.py
+
+import asyncio
+import math
+import time
+import zlib
+
+import numpy as np
+
+from config import SYNTHETIC_SPEED
+from ohlcv_store import timeframe_ms
+
+"""
+Synthetic OHLCV for load and scale testing, with no network.
+
+Log-prices follow GBM whose drift and volatility switch between market
+regimes (a Markov chain), with GARCH(1,1) volatility clustering on top.
+All symbols advance together as (symbols × bars) arrays: regime paths come
+from a cumulative sum of switch events and the GARCH variance recurrence is
+solved in short blocks with cumulative products, so nothing loops per bar.
+
+MarketSimulator   stateful bulk producer, any number of symbols
+generate_ohlcv    one-shot arrays for backtests and benchmarks
+SyntheticFeed     drop-in for realtime.Realtime (same ohlcv_stream())
+SyntheticMarket   one stream of (symbol, bar) for thousands of symbols
+"""
+
+BASE_TF_MS = 300_000     # model parameters below are per 5m bar
+BASE_VOL = 0.002         # long-run volatility of one 5m log return
+
+# (log-price drift, volatility multiplier) per regime, per 5m bar; drifts
+# average out over the chain's uniform stationary mix so long runs don't trend
+REGIMES = (
+    (0.0002, 0.8),       # trending up, calm
+    (-0.0002, 1.5),      # selling off, volatile
+    (0.0, 0.6),          # ranging
+)
+REGIME_STAY = 0.998      # chance of keeping the current regime each 5m bar
+
+GARCH_ALPHA = 0.08       # weight of the last shock
+GARCH_BETA = 0.90        # persistence of variance
+
+# Columns solved per step of the variance recurrence (keeps cumprod well-conditioned)
+_VAR_BLOCK = 128
+
+
+class MarketSimulator:
+    """
+    Stateful generator of consecutive bars for `n_symbols` symbols at `timeframe`.
+    Each next(n) continues every path where the previous call left off.
+    """
+    def __init__(self, n_symbols=1, timeframe="5m", seed=None, start_ts=None, start_price=100.0):
+        self.rng = np.random.default_rng(seed)
+        self.n_symbols = n_symbols
+        self.tf = timeframe_ms(timeframe)
+        scale = self.tf / BASE_TF_MS
+
+        self.drift = np.array([d for d, _ in REGIMES]) * scale
+        self.vol_mult = np.array([v for _, v in REGIMES])
+        self.stay = REGIME_STAY ** scale
+        long_run = BASE_VOL ** 2 * scale
+        self.omega = long_run * (1 - GARCH_ALPHA - GARCH_BETA)
+
+        now = int(time.time() * 1000)
+        self.ts = start_ts if start_ts is not None else now - now % self.tf
+        self.price = np.full(n_symbols, float(start_price))
+        self.var = np.full(n_symbols, long_run)
+        self.shock = np.zeros(n_symbols)
+        self.regime = self.rng.integers(0, len(REGIMES), n_symbols)
+
+    def next(self, n):
+        """
+        The next `n` bars of every symbol as an (n_symbols, n, 6) array.
+        """
+        S, rng, k = self.n_symbols, self.rng, len(REGIMES)
+        z = rng.standard_normal((S, n))
+
+        # Regime path: each switch jumps to another regime, so r_t is a running sum mod k
+        jumps = np.where(rng.random((S, n)) > self.stay, rng.integers(1, k, (S, n)), 0)
+        regime = (self.regime[:, None] + np.cumsum(jumps, axis=1)) % k
+
+        # GARCH(1,1): var_t = omega + (alpha * z_{t-1}^2 + beta) * var_{t-1}
+        prev_z = np.concatenate((self.shock[:, None], z[:, :-1]), axis=1)
+        var = _linear_recurrence(self.omega, GARCH_ALPHA * prev_z ** 2 + GARCH_BETA, self.var)
+        sigma = np.sqrt(var) * self.vol_mult[regime]
+
+        log_ret = self.drift[regime] + sigma * z
+        close = self.price[:, None] * np.exp(np.cumsum(log_ret, axis=1))
+        open_ = np.concatenate((self.price[:, None], close[:, :-1]), axis=1)
+        wick = 0.5 * sigma * np.abs(rng.standard_normal((2, S, n)))
+
+        bars = np.empty((S, n, 6))
+        bars[..., 0] = self.ts + np.arange(n) * self.tf
+        bars[..., 1] = open_
+        bars[..., 2] = np.maximum(open_, close) * np.exp(wick[0])
+        bars[..., 3] = np.minimum(open_, close) * np.exp(-wick[1])
+        bars[..., 4] = close
+        # Volume rises with the size of the move
+        bars[..., 5] = 50.0 * np.exp(0.5 * rng.standard_normal((S, n))) * (1 + np.abs(z))
+
+        self.ts += n * self.tf
+        self.price = close[:, -1].copy()
+        self.var = var[:, -1].copy()
+        self.shock = z[:, -1].copy()
+        self.regime = regime[:, -1].copy()
+        return bars
+
+
+def _linear_recurrence(c, a, x0):
+    """
+    x_t = c + a_t * x_{t-1} along axis 1, from x0 per row.
+    Within a block x_t = P_t * (x_start + c * sum_{j<=t} 1 / P_j), with
+    P the running product of a; blocks stay short so P can't under/overflow.
+    """
+    out = np.empty_like(a)
+    x = x0
+    for start in range(0, a.shape[1], _VAR_BLOCK):
+        p = np.cumprod(a[:, start:start + _VAR_BLOCK], axis=1)
+        block = p * (x[:, None] + c * np.cumsum(1.0 / p, axis=1))
+        out[:, start:start + _VAR_BLOCK] = block
+        x = block[:, -1]
+    return out
+
+
+def generate_ohlcv(n, timeframe="5m", symbols=None, seed=None, start_ts=None):
+    """
+    `n` synthetic bars: an (n, 6) array, or {symbol: (n, 6) array} when
+    `symbols` is given (all generated together).
+    """
+    sim = MarketSimulator(len(symbols) if symbols else 1, timeframe, seed, start_ts)
+    bars = sim.next(n)
+    if symbols is None:
+        return bars[0]
+    return {symbol: bars[i] for i, symbol in enumerate(symbols)}
+
+
+def aggregate(bars, m):
+    """
+    Fold consecutive groups of `m` bars (a multiple of m rows) into one bar each.
+    """
+    g = bars.reshape(-1, m, 6)
+    return np.column_stack((g[:, 0, 0], g[:, 0, 1], g[:, :, 2].max(axis=1),
+                            g[:, :, 3].min(axis=1), g[:, -1, 4], g[:, :, 5].sum(axis=1)))
+
+
+def symbol_seed(symbol):
+    return zlib.crc32(symbol.encode())
+
+
+def _session_start():
+    # Feeds for one symbol share a start and a seed, so 1m and 5m streams tell the same story
+    now = int(time.time() * 1000)
+    return now - now % 3_600_000
+
+
+class SyntheticFeed:
+    """
+    Drop-in for realtime.Realtime: ohlcv_stream() yields closed bars as
+    [openTime_ms, open, high, low, close, volume]. Bars are built from a
+    per-symbol 1m path, so every interval of a symbol agrees with the others.
+
+    speed: simulated seconds per real second (None = as fast as possible).
+    """
+    # 1m bars per refill: a day, which every interval up to 1d divides, so
+    # those feeds of a symbol draw identical random blocks
+    BLOCK_MINUTES = 1440
+
+    def __init__(self, symbol, interval, speed=SYNTHETIC_SPEED, seed=None, start_ts=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.speed = speed
+        self.seed = symbol_seed(symbol) if seed is None else seed
+        self.start_ts = _session_start() if start_ts is None else start_ts
+        self.minutes = timeframe_ms(interval) // 60_000
+
+    async def ohlcv_stream(self):
+        sim = MarketSimulator(1, "1m", self.seed, self.start_ts)
+        delay = timeframe_ms(self.interval) / 1000 / self.speed if self.speed else 0
+        block = math.lcm(self.BLOCK_MINUTES, self.minutes)
+        while True:
+            for bar in aggregate(sim.next(block)[0], self.minutes).tolist():
+                await asyncio.sleep(delay)
+                yield bar
+
+
+class SyntheticMarket:
+    """
+    Every symbol on one vectorized simulator: stream() yields (symbol, bar)
+    for all symbols at each bar time, for load tests far beyond what one
+    feed per symbol would sustain.
+    """
+    def __init__(self, symbols, interval, speed=SYNTHETIC_SPEED, seed=None, start_ts=None):
+        self.symbols = list(symbols)
+        self.interval = interval
+        self.speed = speed
+        self.sim = MarketSimulator(len(self.symbols), interval, seed, start_ts)
+
+    async def stream(self, block=64):
+        delay = self.sim.tf / 1000 / self.speed if self.speed else 0
+        while True:
+            bars = self.sim.next(block)
+            for t in range(block):
+                await asyncio.sleep(delay)
+                for symbol, bar in zip(self.symbols, bars[:, t].tolist()):
+                    yield symbol, bar
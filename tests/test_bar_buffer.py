@@ -0,0 +1,51 @@
+# File: tests/test_bar_buffer.py
+
+import os
+import sys
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from utils.bar_buffer import BarBuffer
+from utils.indicator_context import IndicatorContext
+from strategies.bollinger import BollingerStrategy
+
+class DummyExch:
+    def amount_to_precision(self, symbol, amt): return amt
+    def fetch_balance(self): return {"free": {"USDT": 100.0, "SOL": 1.0}}
+
+def gen_bars(values):
+    return [[i, v, v, v, v, 1.0] for i, v in enumerate(values)]
+
+
+def test_keeps_last_capacity_bars_in_order():
+    buf = BarBuffer(4)
+    bars = gen_bars(range(10))
+    for n, bar in enumerate(bars, start=1):
+        buf.append(bar)
+        expected = bars[:n][-4:]
+        assert len(buf) == len(expected)
+        assert buf.tolist() == [[float(x) for x in b] for b in expected]
+    assert buf[-1][4] == 9.0
+    assert list(buf.last(2)) == [8.0, 9.0]
+
+
+def test_views_are_zero_copy_and_contiguous():
+    buf = BarBuffer(5)
+    buf.extend(gen_bars(range(13)))
+    closes = buf.close
+    assert closes.flags["C_CONTIGUOUS"]
+    assert np.shares_memory(closes, buf.columns())
+    assert np.shares_memory(IndicatorContext(buf).closes, closes)
+
+
+def test_strategy_consumes_buffer_like_bar_list():
+    closes = [10, 10, 10, 7, 7, 7, 10, 10, 10]
+    bars = gen_bars(closes)
+    buf = BarBuffer(3)
+    from_list = BollingerStrategy(DummyExch(), {"symbol": "SOL/USDT", "bb_period": 3, "bb_std_dev": 1})
+    from_buf = BollingerStrategy(DummyExch(), {"symbol": "SOL/USDT", "bb_period": 3, "bb_std_dev": 1})
+    for i, bar in enumerate(bars):
+        buf.append(bar)
+        assert from_buf.on_bar(buf) == from_list.on_bar(bars[max(0, i - 2):i + 1])
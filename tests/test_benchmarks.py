@@ -0,0 +1,28 @@
+# File: tests/test_benchmarks.py
+
+import os
+import sys
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+from benchmarks import bench
+
+
+def test_synthetic_ohlcv_is_seeded_and_consistent():
+    a, b = bench.synthetic_ohlcv(500, seed=1), bench.synthetic_ohlcv(500, seed=1)
+    assert np.array_equal(a, b)
+    assert (a[:, 2] >= np.maximum(a[:, 1], a[:, 4])).all()
+    assert (a[:, 3] <= np.minimum(a[:, 1], a[:, 4])).all()
+
+
+def test_every_case_runs_and_compare_flags_slowdowns():
+    current = bench.run_benchmarks(sizes=[300], log=lambda _: None)
+    assert set(current["results"]) == {f"{name}[300]" for name in bench.CASES}
+
+    baseline = {"results": {k: dict(v) for k, v in current["results"].items()}}
+    assert bench.compare(current, baseline) == []
+    key = "backtest.sma[300]"
+    baseline["results"][key]["seconds"] = current["results"][key]["seconds"] / 2
+    assert [r[0] for r in bench.compare(current, baseline, tolerance=0.25)] == [key]
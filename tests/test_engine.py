@@ -0,0 +1,147 @@
+# File: tests/test_engine.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backtests.engine import BacktestExchange, run_backtest, _intrabar_exit
+from backtests.grid_backtest import run_backtest_detailed
+from strategies.base import BaseStrategy
+from strategies.macd import MacdStrategy
+from strategies.rsi import RsiStrategy
+from utils import vectorized
+from utils.signals import generate_sma_signal
+
+FEE, SLIP = 0.001, 0.0005
+
+def gen_bars(n, seed=11):
+    rng = random.Random(seed)
+    bars, price = [], 100.0
+    for i in range(n):
+        price = max(1.0, price + rng.gauss(0, 1))
+        bars.append([i * 300_000, price, price + 0.5, price - 0.5, price, 1.0])
+    return bars
+
+BARS = gen_bars(400)
+
+def reference_loop(signals, closes):
+    """
+    The per-script loop the engine replaced: signals[i] is 'buy'/'sell'/None.
+    """
+    trades, position, entry_cost = [], None, None
+    for i, sig in enumerate(signals):
+        price = closes[i]
+        if sig == "buy" and position is None:
+            entry_cost = price * (1 + SLIP) * (1 + FEE)
+            position = 'long'
+        elif sig == "sell" and position == 'long':
+            trades.append(price * (1 - SLIP) * (1 - FEE) - entry_cost)
+            position = None
+    if position == 'long':
+        trades.append(closes[-1] * (1 - SLIP) * (1 - FEE) - entry_cost)
+    return trades
+
+
+def test_sma_grid_matches_signal_loop():
+    closes = [b[4] for b in BARS]
+    for fast, slow in [(5, 20), (10, 50)]:
+        signals = [None] * slow + [
+            generate_sma_signal(closes[:i + 1], fast, slow) for i in range(slow, len(closes))
+        ]
+        expected = reference_loop(signals, closes)
+        assert run_backtest_detailed(closes, fast, slow, FEE, SLIP) == pytest.approx(expected)
+
+
+def test_macd_matches_prefix_slicing():
+    strat = MacdStrategy(BacktestExchange("SOL/USDT"), {"symbol": "SOL/USDT"})
+    signals = []
+    for i in range(len(BARS)):
+        sig = strat.on_bar(BARS[:i + 1])
+        signals.append(sig["side"] if sig else None)
+    expected = reference_loop(signals, [b[4] for b in BARS])
+
+    fresh = MacdStrategy(BacktestExchange("SOL/USDT"), {"symbol": "SOL/USDT"})
+    result = run_backtest(fresh, BARS, FEE, SLIP)
+    assert [t["pnl"] for t in result["trades"]] == pytest.approx(expected)
+    assert result["total_pnl"] == pytest.approx(sum(expected))
+    assert result["stats"]["trades_count"] == len(expected)
+    assert result["equity"][-1] == pytest.approx(result["total_pnl"])
+    assert result["fees"] > 0
+
+
+def test_strategy_gets_views_not_copies():
+    arr = np.asarray(BARS, dtype=np.float64)
+    seen = []
+
+    class Probe(BaseStrategy):
+        def on_bar(self, ohlcv, ctx=None):
+            seen.append(np.shares_memory(ohlcv, arr) and len(ohlcv) == len(ctx))
+            return None
+
+    run_backtest(Probe(None, {}), arr, FEE, SLIP)
+    assert len(seen) == len(arr) and all(seen)
+
+
+class BuyOnceWithStop(BaseStrategy):
+    """Buys at bar 2 with a 1% stop, never sells on its own."""
+    def __init__(self):
+        super().__init__(None, {})
+        self.entry_price = self.stop_loss_price = None
+        self.stopped = 0
+
+    def on_bar(self, ohlcv, ctx=None):
+        if len(ohlcv) == 3:
+            self.entry_price = ohlcv[-1][4]
+            self.stop_loss_price = self.entry_price * 0.99
+            return {"side": "buy"}
+        return None
+
+    def on_stopped(self):
+        super().on_stopped()
+        self.stopped += 1
+
+
+def test_intrabar_stop_fills_on_1m_close():
+    # 1m closes: flat at 100, then a dip to 98.5 inside coarse bar 3 that recovers by its close
+    fine_closes = [100.0] * 15 + [99.5, 98.5, 99.8, 100.0, 100.2] + [100.0] * 10
+    fine = [[i * 60_000, c, c, c, c, 1.0] for i, c in enumerate(fine_closes)]
+    coarse = [[i * 300_000, *fine[5 * i + 4][1:]] for i in range(len(fine) // 5)]
+
+    coarse_only = run_backtest(BuyOnceWithStop(), coarse, FEE, SLIP)
+    assert coarse_only["trades"][0]["exit_index"] == len(coarse) - 1
+
+    strat = BuyOnceWithStop()
+    res = run_backtest(strat, coarse, FEE, SLIP, fine_bars=fine)
+    trade = res["trades"][0]
+    assert (trade["entry_index"], trade["exit_index"], trade["exit_price"]) == (2, 3, 98.5)
+    assert strat.stopped == 1 and strat.stop_loss_price is None
+    assert res["equity"][-1] == pytest.approx(res["total_pnl"])
+
+
+def test_intrabar_trailing_exit_tracks_running_peak():
+    window = np.array([100.0, 101.0, 102.0, 101.9, 101.5, 102.5])
+    lo, hi = window.min(), window.max()
+    # running peak 102 → trail level 101.898: 101.9 survives, 101.5 exits
+    assert _intrabar_exit(window, lo, hi, None, 0.001, 100.0) == 101.5
+    # a peak carried in from earlier bars tightens the level
+    assert _intrabar_exit(window, lo, hi, None, 0.001, 110.0) == 100.0
+    assert _intrabar_exit(window, lo, hi, 100.5, None, 100.0) == 100.0
+    assert _intrabar_exit(window, lo, hi, 99.0, 0.05, 100.0) is None
+    assert RsiStrategy(None, {"symbol": "SOL/USDT", "usdt_amount": 10}).stop_levels() == (None, None)
+
+
+def test_bucket_ranges_tile_fine_series():
+    coarse_ts = np.array([300, 600, 900, 1200]) * 1000.0
+    fine_ts = np.arange(250, 1500, 60) * 1000.0
+    values = np.random.default_rng(0).normal(size=len(fine_ts))
+    lo, hi = vectorized.bucket_ranges(coarse_ts, fine_ts)
+    assert (hi[:-1] == lo[1:]).all()
+    for i, t in enumerate(coarse_ts):
+        inside = np.flatnonzero((fine_ts >= t) & (fine_ts < t + 300_000))
+        assert (lo[i], hi[i]) == (inside[0], inside[-1] + 1)
+        assert vectorized.range_reduce(values, lo, hi, np.minimum)[i] == values[inside].min()
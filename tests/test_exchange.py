@@ -0,0 +1,74 @@
+# File: tests/test_exchange.py
+
+import os
+import sys
+import time
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import ccxt
+import pytest
+import exchange
+
+MARKET = {
+    "id": "SOLUSDT", "symbol": "SOL/USDT", "base": "SOL", "quote": "USDT", "baseId": "SOL",
+    "quoteId": "USDT", "type": "spot", "spot": True, "active": True,
+    "precision": {"amount": 0.001, "price": 0.01}, "limits": {}, "info": {},
+}
+
+
+@pytest.fixture
+def offline(monkeypatch, tmp_path):
+    """Binance client with its network calls replaced by counters."""
+    calls = {"markets": 0, "time": 0}
+
+    def fetch_markets(self, params={}):
+        calls["markets"] += 1
+        return [dict(MARKET)]
+
+    def load_time_difference(self, params={}):
+        calls["time"] += 1
+
+    monkeypatch.setattr(ccxt.binance, "fetch_markets", fetch_markets)
+    monkeypatch.setattr(ccxt.binance, "fetch_currencies", lambda self, params={}: {})
+    monkeypatch.setattr(ccxt.binance, "load_time_difference", load_time_difference)
+    monkeypatch.setattr(exchange, "MARKETS_DIR", str(tmp_path))
+    monkeypatch.setenv("EXCHANGE", "binance")
+    monkeypatch.setenv("BINANCE_API_KEY", "key")
+    monkeypatch.setenv("BINANCE_API_SECRET", "secret")
+    monkeypatch.setenv("SANDBOX", "")
+    monkeypatch.setattr(exchange, "_clients", {})
+    monkeypatch.setattr(exchange, "_fetched_at", {})
+    return calls
+
+
+def wait_for_refresh():
+    deadline = time.time() + 5
+    while exchange._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_one_client_per_account_and_markets_fetched_once(offline, monkeypatch):
+    first = exchange.init_exchange()
+    assert exchange.init_exchange() is first
+    assert offline["markets"] == 1
+    assert "SOL/USDT" in first.markets
+
+    monkeypatch.setenv("BINANCE_API_KEY", "other-account")
+    assert exchange.init_exchange() is not first
+
+
+def test_markets_come_from_disk_and_refresh_when_stale(offline, monkeypatch):
+    exchange.init_exchange()
+    exchange._clients.clear()
+
+    client = exchange.init_exchange()
+    assert offline["markets"] == 1 and client.markets["SOL/USDT"]["id"] == "SOLUSDT"
+
+    key = exchange._account()
+    exchange._fetched_at[key] = time.time() - exchange.MARKETS_TTL - 1
+    assert exchange.init_exchange() is client   # returns at once, refresh runs behind
+    wait_for_refresh()
+    assert offline["markets"] == 2
+    assert time.time() - exchange._fetched_at[key] < 60
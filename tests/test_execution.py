@@ -0,0 +1,115 @@
+# File: tests/test_execution.py
+
+import os
+import sys
+import time
+import asyncio
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from execution import AsyncExchange
+
+
+class SlowClient:
+    """Sync client whose REST calls block like ccxt's."""
+    markets = {"SOL/USDT": {"limits": {"amount": {"min": 0.01}}}}
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.sol = 0.0
+
+    def fetch_balance(self):
+        time.sleep(self.delay)
+        return {"free": {"SOL": self.sol, "USDT": 100.0}}
+
+    def create_market_order(self, symbol, side, amount):
+        time.sleep(self.delay)
+        self.sol += float(amount) if side == "buy" else -float(amount)
+        return {"price": 150.0, "amount": amount}
+
+    def amount_to_precision(self, symbol, amount):
+        return f"{amount:.2f}"
+
+
+def test_slow_calls_do_not_stall_the_loop():
+    async def scenario():
+        ex = AsyncExchange(SlowClient(0.3))
+        ticks = 0
+
+        async def feed():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(feed())
+        t0 = time.perf_counter()
+        orders = [ex.submit_order("SOL/USDT", "buy", "1.00") for _ in range(3)]
+        await asyncio.gather(*orders)
+        elapsed = time.perf_counter() - t0
+        ticker.cancel()
+        return ticks, elapsed
+
+    ticks, elapsed = asyncio.run(scenario())
+    assert elapsed < 0.6          # the three orders ran side by side
+    assert ticks >= 15            # and the other coroutine kept running
+
+
+def test_ledger_follows_orders_and_timeouts_raise():
+    async def scenario():
+        client = SlowClient(0.01)
+        ex = AsyncExchange(client)
+        assert ex.fetch_balance()["free"] == {}
+        await ex.refresh_balance()
+        calls = []
+        client.fetch_balance = lambda: calls.append(1)
+        await ex.create_market_order("SOL/USDT", "buy", ex.amount_to_precision("SOL/USDT", 2))
+        free = ex.fetch_balance()["free"]
+
+        slow = AsyncExchange(SlowClient(0.5), timeout=0.05)
+        with pytest.raises(asyncio.TimeoutError):
+            await slow.refresh_balance()
+        return free, calls
+
+    free, calls = asyncio.run(scenario())
+    assert free["SOL"] == 2.0 and free["USDT"] == -200.0   # booked from the fill itself
+    assert calls == []                                     # no REST round trip after the order
+
+
+def test_reconcile_discards_snapshot_that_overlapped_an_order():
+    class Client(SlowClient):
+        def fetch_balance(self):
+            snapshot = {"free": {"SOL": self.sol, "USDT": 100.0}}   # taken before the fill lands
+            time.sleep(0.2)
+            return snapshot
+
+    async def scenario():
+        ex = AsyncExchange(Client(0.0))
+        reconcile = asyncio.create_task(ex.refresh_balance())
+        await asyncio.sleep(0.05)
+        await ex.create_market_order("SOL/USDT", "buy", 1.0)       # fills while the fetch is out
+        after_fill = ex.fetch_balance()["free"]["SOL"]
+        await reconcile
+        return after_fill, ex.fetch_balance()["free"]["SOL"]
+
+    assert asyncio.run(scenario()) == (1.0, 1.0)
+
+
+def test_initial_balance_retries_until_the_exchange_answers():
+    class FlakyClient(SlowClient):
+        def __init__(self):
+            super().__init__(0.0)
+            self.failures = 2
+
+        def fetch_balance(self):
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("exchange unavailable")
+            return {"free": {"SOL": 2.0, "USDT": 100.0}}
+
+    ex = AsyncExchange(FlakyClient())
+    balance = asyncio.run(ex.initial_balance(delay=0.01))
+    assert balance["free"]["SOL"] == 2.0
+    assert ex.fetch_balance()["free"]["SOL"] == 2.0
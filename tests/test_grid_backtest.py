@@ -0,0 +1,44 @@
+# File: tests/test_grid_backtest.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from backtests.grid_backtest import run_backtest_detailed, sma_grid
+
+FEE, SLIP = 0.001, 0.0005
+
+def gen_closes(n, seed=5):
+    rng = random.Random(seed)
+    closes, price = [], 100.0
+    for i in range(n):
+        # include flat stretches, like thin real 5m data
+        if not (100 <= i < 160):
+            price = max(1.0, price + rng.gauss(0, 1))
+        closes.append(price)
+    return closes
+
+CLOSES = gen_closes(600)
+
+
+def test_sma_grid_matches_engine_per_pair():
+    fast_list, slow_list = [3, 5, 10, 20], [8, 20, 30, 50]
+    rows = sma_grid(CLOSES, fast_list, slow_list, FEE, SLIP)
+    pairs = [(f, s) for f in fast_list for s in slow_list if s > f]
+    assert [(r["fast"], r["slow"]) for r in rows] == pairs
+
+    for row in rows:
+        pnls = run_backtest_detailed(CLOSES, row["fast"], row["slow"], FEE, SLIP)
+        wins = sum(1 for p in pnls if p > 0)
+        assert row["trades_count"] == len(pnls)
+        assert row["total_pnl"] == pytest.approx(sum(pnls), abs=1e-9)
+        assert row["win_rate"] == pytest.approx(wins / len(pnls) if pnls else 0.0)
+
+
+def test_sma_grid_handles_short_history():
+    rows = sma_grid(CLOSES[:10], [5], [20], FEE, SLIP)
+    assert rows == [{"fast": 5, "slow": 20, "total_pnl": 0.0, "trades_count": 0, "win_rate": 0.0}]
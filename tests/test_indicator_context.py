@@ -0,0 +1,110 @@
+# File: tests/test_indicator_context.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from utils import indicator_context
+from utils.bar_buffer import BarBuffer
+from utils.indicator_context import IndicatorContext, StreamingContext
+from utils.signals import generate_sma_signal
+from strategies.bollinger import BollingerStrategy
+from strategies.macd import MacdStrategy
+from strategies.rsi import RsiStrategy
+from strategies.sma_crossover import SmaCrossover
+
+class DummyExch:
+    def amount_to_precision(self, symbol, amt): return amt
+    def fetch_balance(self): return {"free": {"USDT": 100.0, "SOL": 1.0}}
+
+def gen_bars(n, seed=3):
+    rng = random.Random(seed)
+    bars, price = [], 100.0
+    for i in range(n):
+        price = max(1.0, price + rng.gauss(0, 1))
+        bars.append([i, price, price + 1, price - 1, price, 1.0])
+    return bars
+
+BARS = gen_bars(250)
+
+
+def test_series_computed_once_per_bar(monkeypatch):
+    calls = []
+    real = indicator_context.INDICATORS["bollinger"]
+    monkeypatch.setitem(
+        indicator_context.INDICATORS, "bollinger",
+        lambda cols, *p: calls.append(p) or real(cols, *p),
+    )
+    ctx = IndicatorContext(BARS[:50])
+    strats = [BollingerStrategy(DummyExch(), {"symbol": "SOL/USDT"}) for _ in range(5)]
+    for s in strats:
+        s.on_bar(BARS[:50], ctx)
+    assert len(calls) == 1
+
+    # New bar evicts the cache
+    ctx.update(BARS[:51])
+    strats[0].on_bar(BARS[:51], ctx)
+    assert len(calls) == 2
+
+
+def test_seek_matches_fresh_window():
+    full = IndicatorContext(BARS)
+    for i in (40, 120, 249):
+        full.seek(i)
+        fresh = IndicatorContext(BARS[:i + 1])
+        assert full.macd(12, 26, 9) == pytest.approx(fresh.macd(12, 26, 9))
+        assert full.macd(12, 26, 9, back=1) == pytest.approx(fresh.macd(12, 26, 9, back=1))
+        assert full.rsi(14) == pytest.approx(fresh.rsi(14))
+        assert full.close == fresh.close
+        assert len(full.closes) == i + 1
+
+
+def test_sma_cross_matches_signal_helper():
+    closes = [b[4] for b in BARS]
+    ctx = IndicatorContext(BARS)
+    for i in range(20, len(BARS)):
+        ctx.seek(i)
+        expected = {"buy": 1, "sell": -1, None: 0}[generate_sma_signal(closes[:i + 1], 5, 20)]
+        assert ctx.sma_cross(5, 20) == expected
+
+
+def test_shared_context_gives_same_signals():
+    ctx = IndicatorContext(BARS)
+    shared = MacdStrategy(DummyExch(), {"symbol": "SOL/USDT"})
+    private = MacdStrategy(DummyExch(), {"symbol": "SOL/USDT"})
+    for i in range(len(BARS)):
+        ctx.seek(i)
+        assert shared.on_bar(BARS[:i + 1], ctx) == private.on_bar(BARS[:i + 1])
+
+
+def test_streaming_context_matches_batch():
+    bars = BarBuffer(len(BARS))
+    live = StreamingContext(bars)
+    batch = IndicatorContext(BARS)
+    for i, bar in enumerate(BARS):
+        bars.append(bar)
+        live.push(bar)
+        batch.seek(i)
+        assert len(live) == i + 1 and live.close == batch.close
+        assert live.sma_cross(5, 20) == batch.sma_cross(5, 20)
+        assert live.rsi(14) == pytest.approx(batch.rsi(14))
+        assert live.bollinger(20, 2) == pytest.approx(batch.bollinger(20, 2))
+        for back in (0, 1):
+            assert live.macd(12, 26, 9, back=back) == pytest.approx(batch.macd(12, 26, 9, back=back))
+
+
+def test_streaming_context_drives_strategies_from_a_short_window():
+    cfg = {"symbol": "SOL/USDT", "usdt_amount": 10.0, "fast": 5, "slow": 20}
+    make = lambda cls: [cls(DummyExch(), dict(cfg)) for _ in range(2)]
+    strats = make(SmaCrossover) + make(RsiStrategy) + make(BollingerStrategy)
+    bars = BarBuffer(max(s.slow if hasattr(s, "slow") else s.period for s in strats) + 1)
+    ctx = StreamingContext(bars)
+    for bar in BARS:
+        bars.append(bar)
+        ctx.push(bar)
+        for live, private in zip(strats[::2], strats[1::2]):
+            assert live.on_bar(bars, ctx) == private.on_bar(bars.tolist())
@@ -0,0 +1,108 @@
+# File: tests/test_indicators.py
+
+import os
+import sys
+import random
+import statistics
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from utils.indicators import true_ranges, atr, ema, macd_lines, bollinger_bands
+from utils import vectorized
+
+def gen_closes(n, seed=7):
+    rng = random.Random(seed)
+    closes, price = [], 150.0
+    for _ in range(n):
+        price = max(1.0, price + rng.gauss(0, 1))
+        closes.append(price)
+    return closes
+
+CLOSES = gen_closes(400)
+
+# ─── Reference loop implementations (the pre-NumPy versions) ─────────────────
+def ref_ema(values, period):
+    if len(values) < period:
+        return [None] * len(values)
+    emas = [None] * (period - 1) + [sum(values[:period]) / period]
+    alpha = 2 / (period + 1)
+    for price in values[period:]:
+        emas.append((price - emas[-1]) * alpha + emas[-1])
+    return emas
+
+def ref_bollinger(closes, period, k):
+    lower, middle, upper = [], [], []
+    for i in range(len(closes)):
+        if i < period - 1:
+            lower.append(None); middle.append(None); upper.append(None)
+            continue
+        window = closes[i - period + 1:i + 1]
+        m, sd = sum(window) / period, statistics.pstdev(window)
+        lower.append(m - k * sd); middle.append(m); upper.append(m + k * sd)
+    return lower, middle, upper
+
+def ref_rsi(closes, period):
+    window = closes[-(period + 1):]
+    deltas = [window[i] - window[i - 1] for i in range(1, len(window))]
+    avg_gain = sum(d for d in deltas if d > 0) / period
+    avg_loss = sum(-d for d in deltas if d < 0) / period
+    return 100 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def test_ema_matches_reference():
+    for period in (1, 5, 26):
+        assert ema(CLOSES, period) == pytest.approx(ref_ema(CLOSES, period), rel=1e-12)
+    assert ema(CLOSES[:3], 5) == [None] * 3
+
+
+def test_ema_stays_exact_across_blocks():
+    closes = gen_closes(3 * vectorized.EMA_BLOCK + 17, seed=11)
+    for period in (2, 26, 200):   # short periods use blocks of a few hundred bars
+        assert ema(closes, period) == pytest.approx(ref_ema(closes, period), rel=1e-12)
+
+
+def test_macd_matches_reference():
+    macd, signal, hist = macd_lines(CLOSES, 12, 26, 9)
+    fast, slow = ref_ema(CLOSES, 12), ref_ema(CLOSES, 26)
+    ref_macd = [f - s if f is not None and s is not None else None for f, s in zip(fast, slow)]
+    valid = [m for m in ref_macd if m is not None]
+    ref_signal = [None] * (len(ref_macd) - len(valid)) + ref_ema(valid, 9)
+    assert macd == pytest.approx(ref_macd, rel=1e-12)
+    assert signal == pytest.approx(ref_signal, rel=1e-9)
+    assert hist[:33] == [None] * 33
+    assert all(h is not None for h in hist[33:])
+
+
+def test_bollinger_matches_reference():
+    for band, ref in zip(bollinger_bands(CLOSES, 20, 2), ref_bollinger(CLOSES, 20, 2)):
+        assert band == pytest.approx(ref, rel=1e-12)
+    assert bollinger_bands(CLOSES[:5], 20, 2) == ([None] * 5,) * 3
+
+
+def test_sma_matches_mean():
+    out = vectorized.sma(CLOSES, 10)
+    assert np.isnan(out[:9]).all()
+    for i in range(9, len(CLOSES)):
+        assert out[i] == pytest.approx(statistics.mean(CLOSES[i - 9:i + 1]), rel=1e-12)
+
+
+def test_true_ranges_and_atr():
+    bars = [[0, c, c + 1, c - 1, c, 0] for c in CLOSES[:30]]
+    expected = [
+        max(bars[i][2] - bars[i][3], abs(bars[i][2] - bars[i - 1][4]), abs(bars[i][3] - bars[i - 1][4]))
+        for i in range(1, len(bars))
+    ]
+    assert true_ranges(bars) == pytest.approx(expected)
+    assert atr(bars, 14) == pytest.approx(sum(expected[-14:]) / 14)
+    assert atr(bars[:1], 14) == 0.0
+
+
+def test_rsi_matches_reference():
+    out = vectorized.rsi(CLOSES, 14)
+    assert np.isnan(out[:14]).all()
+    for i in range(14, len(CLOSES)):
+        assert out[i] == pytest.approx(ref_rsi(CLOSES[:i + 1], 14), rel=1e-9)
+    assert vectorized.rsi([1, 2, 3, 4], 3)[-1] == 100
@@ -0,0 +1,34 @@
+# File: tests/test_ledger.py
+
+import os
+import sys
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import pytest
+from ledger import BalanceLedger
+
+
+def test_fills_and_locks_keep_ccxt_shape():
+    ledger = BalanceLedger({"free": {"USDT": 1000.0}, "used": {}})
+    ledger.apply_fill("SOL/USDT", "buy", 2.0, 300.0, {"cost": 0.002, "currency": "SOL"})
+    assert ledger.lock("SOL", 5.0) == pytest.approx(1.998)     # never locks more than is free
+    bal = ledger.fetch_balance()
+    assert bal["free"]["SOL"] == 0.0 and bal["used"]["SOL"] == pytest.approx(1.998)
+    assert bal["SOL"]["total"] == pytest.approx(1.998)
+
+    ledger.unlock("SOL", 1.998)
+    ledger.apply_fill("SOL/USDT", "sell", 1.998, 320.0, {"cost": 0.32, "currency": "USDT"})
+    bal = ledger.fetch_balance()
+    assert bal["free"]["SOL"] == pytest.approx(0.0)
+    assert bal["free"]["USDT"] == pytest.approx(1000.0 - 300.0 + 320.0 - 0.32)
+
+
+def test_reconcile_adopts_exchange_and_reports_drift():
+    ledger = BalanceLedger({"free": {"USDT": 100.0, "SOL": 1.0}})
+    ledger.apply_fill("SOL/USDT", "sell", 1.0, 150.0)
+    assert ledger.reconcile({"free": {"USDT": 249.85}, "used": {"SOL": 0.0}}) == {
+        "USDT": pytest.approx(-0.15)
+    }
+    assert ledger.fetch_balance()["free"]["USDT"] == 249.85
@@ -0,0 +1,181 @@
+# File: tests/test_live_engine.py
+
+import os
+import sys
+import time
+import asyncio
+import concurrent.futures
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backend.app import main
+from backtests.engine import BacktestExchange, run_backtest
+from strategies.base import BaseStrategy
+from synthetic import generate_ohlcv, aggregate
+
+BARS = generate_ohlcv(150, "5m", seed=5, start_ts=1_700_000_000_000).tolist()
+
+
+class FakeExchange:
+    markets = {"SOL/USDT": {"limits": {"amount": {"min": 0.01}}}}
+
+    def start(self):
+        pass
+
+    async def initial_balance(self):
+        return self.fetch_balance()
+
+    def fetch_balance(self):
+        return {"free": {"USDT": 1000.0, "SOL": 0.0}}
+
+    def amount_to_precision(self, symbol, amount):
+        return f"{float(amount):.2f}"
+
+
+class ListFeeds:
+    """MultiTimeframe stand-in: both timeframes replay BARS, yielding to the loop per bar."""
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def feed(self, interval):
+        return self
+
+    async def ohlcv_stream(self):
+        for bar in BARS:
+            await asyncio.sleep(0)
+            yield list(bar)
+
+
+class EveryBar(BaseStrategy):
+    """Signals on every bar, so each bar records a trade."""
+    def on_bar(self, ohlcv, ctx=None):
+        return {"side": "buy", "amount": 0.1}
+
+
+@pytest.fixture
+def live(monkeypatch):
+    monkeypatch.setattr(main, "get_async_exchange", FakeExchange)
+    monkeypatch.setattr(main, "MultiTimeframe", ListFeeds)
+    monkeypatch.setattr(main, "MacdStrategy", EveryBar)
+    monkeypatch.setattr(main, "PAPER_TRADING", True)
+    monkeypatch.setattr(main, "log_trade_db", lambda *a, **k: None)
+    return main
+
+
+def test_slow_notifier_does_not_stall_other_symbols(live, monkeypatch):
+    sent = []
+    def slow_telegram(message):
+        time.sleep(0.02)   # a Telegram POST that takes its time
+        sent.append(message)
+    monkeypatch.setattr(live, "send_telegram", slow_telegram)
+
+    async def scenario():
+        ticks = 0
+
+        async def other_symbol():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        ticker = asyncio.create_task(other_symbol())
+        t0 = time.perf_counter()
+        await live.run_symbol("SOL/USDT")
+        elapsed = time.perf_counter() - t0
+        ticker.cancel()
+        return ticks, elapsed
+
+    ticks, elapsed = asyncio.run(scenario())
+    # len(BARS) blocking sends on the loop would take 3 s; off the loop they overlap
+    assert elapsed < 1.0
+    assert ticks >= 20
+    assert len(sent) >= len(BARS)
+
+
+class Trailer(BaseStrategy):
+    """Buys every 7th bar when flat; exits only through its hard and trailing stops."""
+    def __init__(self, exchange, config):
+        super().__init__(exchange, config)
+        self.entry_price = None
+
+    def on_bar(self, ohlcv, ctx=None):
+        ctx = self.context(ohlcv, ctx)
+        if self.entry_price is None and len(ctx) % 7 == 0:
+            self.entry_price = ctx.close
+            return {"side": "buy", "amount": 0.1}
+        return None
+
+    def stop_levels(self):
+        if self.entry_price is None:
+            return None, None
+        return self.entry_price * 0.99, 0.003
+
+    def on_stopped(self):
+        self.entry_price = None
+
+
+class MinuteFeeds:
+    """
+    MultiTimeframe stand-in over 1m bars: each 5m bar is delivered only once
+    the 1m consumer has taken the bars inside it, as the resampler orders them.
+    """
+    def __init__(self, minutes):
+        self.minutes = minutes
+        self.fast = asyncio.Queue()
+
+    def __call__(self, symbol):
+        return self
+
+    def feed(self, interval):
+        return _Stream(self._fast if interval == "1m" else self._slow)
+
+    async def _fast(self):
+        while True:
+            bar = await self.fast.get()
+            yield bar
+            self.fast.task_done()
+
+    async def _slow(self):
+        for group in np.asarray(self.minutes).reshape(-1, 5, 6):
+            for bar in group.tolist():
+                self.fast.put_nowait(bar)
+            await self.fast.join()
+            yield aggregate(group, 5)[0].tolist()
+
+
+class _Stream:
+    def __init__(self, gen):
+        self.ohlcv_stream = gen
+
+
+class InlineExecutor(concurrent.futures.ThreadPoolExecutor):
+    # keeps recorded trades in call order
+    def submit(self, fn, *args):
+        fut = concurrent.futures.Future()
+        fut.set_result(fn(*args))
+        return fut
+
+
+def test_live_stops_match_the_engine_on_the_same_bars(live, monkeypatch):
+    minutes = generate_ohlcv(5 * 400, "1m", seed=9, start_ts=1_700_000_100_000 // 300_000 * 300_000)
+    monkeypatch.setattr(live, "MultiTimeframe", MinuteFeeds(minutes))
+    monkeypatch.setattr(live, "MacdStrategy", Trailer)
+    monkeypatch.setattr(FakeExchange, "fetch_balance", lambda self: {"free": {"USDT": 1000.0, "SOL": 1.0}})
+    recorded = []
+    monkeypatch.setattr(live, "record_trade", lambda *a: recorded.append(a))
+
+    async def scenario():
+        asyncio.get_running_loop().set_default_executor(InlineExecutor())
+        await live.run_symbol("SOL/USDT")
+    asyncio.run(scenario())
+    live_exits = [a[3] for a in recorded if a[1] == "Trailer" and a[2] == "sell"]
+
+    result = run_backtest(Trailer(BacktestExchange("SOL/USDT"), {}), aggregate(minutes, 5),
+                          fee_pct=0.0, slippage_pct=0.0, fine_bars=minutes)
+    engine_exits = [t["exit_price"] for t in result["trades"]]
+    assert len(live_exits) >= 10
+    assert live_exits == engine_exits[:len(live_exits)]
+    assert len(engine_exits) - len(live_exits) <= 1   # the engine also closes what is open at the end
@@ -0,0 +1,49 @@
+# File: tests/test_macd_grid.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backtests.backtest_macd import macd_grid, run_backtest_macd
+from backtests.engine import bars_from_closes
+from utils import vectorized
+
+FEE, SLIP = 0.001, 0.0005
+
+def gen_closes(n, seed=9):
+    rng = random.Random(seed)
+    closes, price = [], 100.0
+    for _ in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.006)))
+        closes.append(price)
+    return closes
+
+CLOSES = gen_closes(500)
+
+
+def test_ema_rows_matches_ema_per_row():
+    macd, _, _ = vectorized.macd(CLOSES, 12, 26, 9)
+    rows = np.array([macd, macd, vectorized.ema(CLOSES, 5) - vectorized.ema(CLOSES, 8)])
+    out = vectorized.ema_rows(rows, [9, 4, 6])
+    for row, period, got in zip(rows, [9, 4, 6], out):
+        first = np.flatnonzero(~np.isnan(row))[0]
+        expected = np.concatenate((np.full(first, np.nan), vectorized.ema(row[first:], period)))
+        np.testing.assert_allclose(got, expected, rtol=1e-12)
+
+
+def test_macd_grid_matches_strategy_backtest():
+    rows = macd_grid(CLOSES, [5, 12], [13, 26], [4, 9], FEE, SLIP, workers=1)
+    assert [(r["fast"], r["slow"], r["signal"]) for r in rows] == [
+        (5, 13, 4), (5, 13, 9), (5, 26, 4), (5, 26, 9), (12, 13, 4), (12, 13, 9), (12, 26, 4), (12, 26, 9)
+    ]
+    bars = bars_from_closes(CLOSES)
+    for row in rows:
+        ref = run_backtest_macd(bars, row["fast"], row["slow"], row["signal"], FEE, SLIP)
+        assert row["trade_count"] == ref["stats"]["trades_count"]
+        assert row["total_pnl"] == pytest.approx(ref["total_pnl"], abs=1e-9)
+        assert row["win_rate"] == pytest.approx(ref["stats"]["win_rate"])
@@ -0,0 +1,62 @@
+# File: tests/test_monte_carlo.py
+
+import os
+import sys
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backtests import monte_carlo as mc_module
+from backtests.monte_carlo import monte_carlo, sweep_min_cells
+from backtests.grid_backtest import sma_pairs, run_backtest_detailed
+from tests.test_grid_backtest import CLOSES
+
+PNLS = [3.0, -1.0, 2.0, -4.0, 1.5]
+
+
+def path_drawdown(pnls):
+    equity = np.concatenate(([0.0], np.cumsum(pnls)))
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+def test_shuffle_keeps_final_pnl_and_bounds_drawdown():
+    res = monte_carlo(PNLS, 100.0, n_paths=5000, method="shuffle", seed=1)
+    for v in res["final_pnl"].values():
+        assert v == pytest.approx(sum(PNLS))
+    # Drawdown is at least the largest single loss, at most all losses in a row
+    assert res["max_drawdown"]["p5"] >= 4.0 - 1e-12
+    assert res["max_drawdown"]["p95"] <= path_drawdown(sorted(PNLS)) + 1e-12
+    assert res["max_drawdown"]["p95"] > res["max_drawdown"]["p5"]
+    assert len(res["equity_curves"]["p50"]) == len(PNLS)
+    assert res["equity_curves"]["p50"][-1] == pytest.approx(sum(PNLS))
+
+
+def test_bootstrap_ruin_and_blocking_are_consistent():
+    full = monte_carlo(PNLS, 4.0, n_paths=20000, ruin_fraction=1.0, seed=3)
+    blocked = monte_carlo(PNLS, 4.0, n_paths=20000, ruin_fraction=1.0, seed=3, curves=False)
+    assert blocked["final_pnl"] == full["final_pnl"]
+    assert 0.0 < full["risk_of_ruin"] < 1.0
+    # Every path that opens with the -4 trade is ruined: at least 1 in 5
+    assert full["risk_of_ruin"] >= 0.2 - 0.01
+    assert monte_carlo([], 10.0, n_paths=10)["risk_of_ruin"] == 0.0
+
+
+def test_grid_cells_carry_monte_carlo_summary():
+    rows = sma_pairs(CLOSES, [(5, 20), (10, 50)], 0.001, 0.0005, mc_paths=2000)
+    for row in rows:
+        pnls = run_backtest_detailed(CLOSES, row["fast"], row["slow"], 0.001, 0.0005)
+        ref = monte_carlo(pnls, CLOSES[0], n_paths=2000, seed=0, curves=False)
+        assert row["mc"]["trades"] == len(pnls)
+        assert row["mc"]["final_pnl"] == pytest.approx(ref["final_pnl"])
+
+
+def test_seeded_cells_reuse_index_matrix_and_raise_pool_threshold():
+    mc_module._seeded_indices.cache_clear()
+    a = monte_carlo(PNLS, 10.0, n_paths=3000, seed=0, curves=False)
+    b = monte_carlo([p * 2 for p in PNLS], 10.0, n_paths=3000, seed=0, curves=False)
+    info = mc_module._seeded_indices.cache_info()
+    assert (info.misses, info.hits) == (1, 1)          # same trade count: one matrix for both
+    assert b["final_pnl"] == pytest.approx({k: 2 * v for k, v in a["final_pnl"].items()})
+    assert sweep_min_cells(0, 500) > sweep_min_cells(2000, 500) > sweep_min_cells(100_000, 500)
@@ -0,0 +1,120 @@
+# File: tests/test_ohlcv_store.py
+
+import os
+import sys
+import time
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from ohlcv_store import OhlcvStore, load_ohlcv, load_covering, timeframe_ms
+
+TF = 300_000  # 5m
+
+class FakeExchange:
+    """
+    Serves 5m bars up to the last closed one, paging like ccxt.
+    """
+    def __init__(self, start):
+        self.start = start
+        self.calls = []
+
+    def fetch_ohlcv(self, symbol, timeframe, since, limit):
+        self.calls.append(since)
+        now = int(time.time() * 1000)
+        first = max(since, self.start)
+        first += (-(first - self.start)) % TF
+        out = []
+        ts = first
+        while len(out) < limit and ts <= now:  # includes the still-forming bar
+            out.append([ts, 1.0, 2.0, 0.5, float(ts // TF), 10.0])
+            ts += TF
+        return out
+
+@pytest.fixture
+def store(tmp_path):
+    return OhlcvStore(root=str(tmp_path))
+
+
+def test_timeframe_ms():
+    assert timeframe_ms("5m") == TF
+    assert timeframe_ms("1h") == 3_600_000
+
+
+def test_append_is_incremental_and_ordered(store):
+    store.append("SOL/USDT", "5m", [[TF * 2, 1, 1, 1, 2, 1], [TF, 1, 1, 1, 1, 1]])
+    assert store.append("SOL/USDT", "5m", [[TF * 2, 9, 9, 9, 9, 9], [TF * 3, 1, 1, 1, 3, 1]]) == 1
+    bars = store.read("SOL/USDT", "5m")
+    assert bars[:, 0].tolist() == [TF, TF * 2, TF * 3]
+    assert bars[:, 4].tolist() == [1.0, 2.0, 3.0]
+
+
+def test_range_reads_by_timestamp(store):
+    store.append("SOL/USDT", "5m", [[TF * i, 1, 1, 1, i, 1] for i in range(100)])
+    assert store.read("SOL/USDT", "5m", start=TF * 10, end=TF * 20)[:, 4].tolist() == list(range(10, 20))
+    assert store.read("SOL/USDT", "5m", end=TF * 20, limit=3)[:, 4].tolist() == [17, 18, 19]
+    assert store.read("ETH/USDT", "5m").shape == (0, 6)
+
+
+def test_torn_append_is_ignored(store):
+    store.append("SOL/USDT", "5m", [[TF, 1, 1, 1, 1, 1]])
+    with open(os.path.join(store.path("SOL/USDT", "5m"), "ts.bin"), "ab") as fh:
+        fh.write(np.int64(TF * 2).tobytes())   # crash after the first column
+    assert store.count("SOL/USDT", "5m") == 1
+    store.append("SOL/USDT", "5m", [[TF * 2, 1, 1, 1, 2, 1]])
+    assert store.read("SOL/USDT", "5m")[:, 4].tolist() == [1.0, 2.0]
+
+
+def test_sync_fetches_only_missing_closed_bars(store):
+    now = int(time.time() * 1000)
+    start = (now // TF - 2500) * TF
+    ex = FakeExchange(start)
+    added = store.sync("SOL/USDT", "5m", since=start, exchange=ex)
+    assert added == store.count("SOL/USDT", "5m") >= 2499
+    assert store.last_ts("SOL/USDT", "5m") + TF <= int(time.time() * 1000)
+    assert len(ex.calls) == 3
+
+    # Up to date: nothing to fetch (unless a 5m boundary just passed)
+    ex.calls.clear()
+    assert store.sync("SOL/USDT", "5m", exchange=ex) <= 1
+    assert len(ex.calls) <= 1
+
+
+def test_load_falls_back_to_stored_bars_offline(store, monkeypatch):
+    store.append("SOL/USDT", "5m", [[TF * i, 1, 1, 1, i, 1] for i in range(10)])
+    def offline(*a, **k):
+        raise ConnectionError("no network")
+    monkeypatch.setattr(store, "sync", offline)
+    assert load_ohlcv("SOL/USDT", "5m", limit=4, store=store)[:, 4].tolist() == [6, 7, 8, 9]
+
+
+def test_longer_history_backfills_the_head(store, monkeypatch):
+    now = int(time.time() * 1000)
+    ex = FakeExchange((now // TF - 5000) * TF)
+    sync = store.sync
+    monkeypatch.setattr(store, "sync", lambda *a, **k: sync(*a, exchange=ex, **k))
+
+    short = load_ohlcv("SOL/USDT", "5m", limit=500, store=store)
+    long = load_ohlcv("SOL/USDT", "5m", limit=2000, store=store)
+    assert len(short) == 500 and len(long) == 2000
+    assert np.array_equal(long[-500:], short) or long[-1, 0] > short[-1, 0]   # a boundary may pass
+    assert (np.diff(long[:, 0]) == TF).all()
+    assert long[:, 4].tolist() == (long[:, 0] // TF).tolist()
+
+    # Nothing older on the exchange: asked once, then remembered
+    ex.start = store.first_ts("SOL/USDT", "5m")
+    ex.calls.clear()
+    load_ohlcv("SOL/USDT", "5m", limit=3000, store=store)
+    load_ohlcv("SOL/USDT", "5m", limit=3000, store=store)
+    assert sum(c < ex.start for c in ex.calls) == 1
+
+
+def test_load_covering_spans_the_coarse_bars(store):
+    M = 60_000
+    store.append("SOL/USDT", "1m", [[M * i, 1, 1, 1, i, 1] for i in range(100)])
+    coarse = [[TF * i, 1, 1, 1, i, 1] for i in (4, 5, 6)]
+    fine = load_covering("SOL/USDT", "1m", coarse, sync=False, store=store)
+    assert fine[:, 0].tolist() == [M * i for i in range(20, 35)]
+    assert load_covering("SOL/USDT", "1m", [], sync=False, store=store).shape == (0, 6)
@@ -0,0 +1,59 @@
+# File: tests/test_optimizer.py
+
+import os
+import sys
+import math
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backtests import optimizer
+from backtests.grid_backtest import sma_pairs
+
+FEE, SLIP = 0.001, 0.0005
+
+def gen_bars(n, seed=5):
+    rng = random.Random(seed)
+    bars, price = [], 100.0
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.006) + 0.004 * math.sin(i / 60)))
+        bars.append([i * 300_000, price, price, price, price, 1.0])
+    return np.array(bars)
+
+BARS = gen_bars(1500)
+
+
+@pytest.mark.parametrize("method", ["halving", "surrogate"])
+def test_sma_search_gets_near_grid_optimum_on_a_small_budget(method):
+    lo_f, hi_f = optimizer.SPACES["sma"]["fast"]
+    lo_s, hi_s = optimizer.SPACES["sma"]["slow"]
+    pairs = [(f, s) for f in range(lo_f, hi_f + 1) for s in range(lo_s, hi_s + 1) if s > f]
+    grid = np.sort([r["total_pnl"] for r in sma_pairs(BARS[:, 4], pairs, FEE, SLIP)])
+
+    budget = len(pairs) // 20   # 5% of the exhaustive grid
+    res = optimizer.optimize("sma", BARS, method, budget, seed=0, fee_pct=FEE, slippage_pct=SLIP)
+    assert res["evaluations"] <= budget
+    assert res["best"]["slow"] > res["best"]["fast"]
+    assert np.searchsorted(grid, res["score"]) / len(grid) >= 0.98
+
+
+@pytest.mark.parametrize("strategy", sorted(optimizer.SPACES))
+def test_every_strategy_is_searchable(strategy):
+    res = optimizer.optimize(strategy, BARS[:400], "random", budget=6, seed=1, workers=1)
+    assert res["evaluations"] <= 6
+    assert set(res["best"]) == set(optimizer.SPACES[strategy])
+    for name, (lo, hi) in optimizer.SPACES[strategy].items():
+        assert lo <= res["best"][name] <= hi
+
+
+def test_objective_memoises_and_meters_cost():
+    obj = optimizer.Objective("sma", BARS, FEE, SLIP)
+    cell = {"fast": 5, "slow": 30}
+    first = obj([cell, cell], n_bars=500)
+    assert first[0] == first[1] and obj.cost == pytest.approx(500 / 1500)
+    obj([cell])
+    obj([cell])
+    assert obj.cost == pytest.approx(1 + 500 / 1500)
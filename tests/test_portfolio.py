@@ -0,0 +1,57 @@
+# File: tests/test_portfolio.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backtests import portfolio
+from backtests.engine import run_backtest
+
+FEE, SLIP = 0.001, 0.0005
+STEP = 300_000
+
+def gen_bars(n, seed, t0=0):
+    rng = random.Random(seed)
+    bars, price = [], 100.0
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.01)))
+        bars.append([t0 + i * STEP, price, price * 1.002, price * 0.998, price, 1.0])
+    return np.array(bars)
+
+# Staggered listings: symbols start at different times on a shared 5m grid
+BARS = {f"S{i}/USDT": gen_bars(400, i, t0=(i % 3) * 50 * STEP) for i in range(4)}
+
+
+def test_single_combo_compounds_engine_trades():
+    bars = BARS["S0/USDT"]
+    res = portfolio.run_portfolio({"S0/USDT": bars}, strategies=("sma",), initial_balance=1000.0,
+                                  order_fraction=0.5, fee_pct=FEE, slippage_pct=SLIP, workers=1)
+    ref = run_backtest(portfolio.make_strategy("sma", "S0/USDT"), bars, FEE, SLIP)
+    assert len(res["trades"]) == len(ref["trades"]) > 0
+
+    balance = 1000.0
+    for t in ref["trades"]:
+        cost = t["entry_price"] * (1 + SLIP) * (1 + FEE)
+        proceeds = t["exit_price"] * (1 - SLIP) * (1 - FEE)
+        balance += balance * 0.5 * (proceeds / cost - 1)
+    assert res["final_balance"] == pytest.approx(balance)
+    assert res["equity"][-1] == pytest.approx(balance)
+
+
+def test_portfolio_shares_balance_and_matches_pool(monkeypatch):
+    serial = portfolio.run_portfolio(BARS, fee_pct=FEE, slippage_pct=SLIP, workers=1)
+    assert len(serial["ts"]) == 400 + 2 * 50
+    assert set(serial["by_combo"]) == {(s, sym) for sym in BARS for s in portfolio.STRATEGIES}
+    assert serial["equity"][0] == pytest.approx(portfolio.PORTFOLIO_BALANCE)
+    assert serial["equity"][-1] == pytest.approx(serial["final_balance"])
+    assert serial["total_pnl"] == pytest.approx(sum(t["pnl"] for t in serial["trades"]))
+
+    monkeypatch.setattr(portfolio, "SWEEP_MIN_CELLS", 0)   # force the pool for a small run
+    pooled = portfolio.run_portfolio(BARS, fee_pct=FEE, slippage_pct=SLIP, workers=2)
+    assert pooled["trades"] == serial["trades"]
+    np.testing.assert_allclose(pooled["equity"], serial["equity"])
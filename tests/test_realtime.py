@@ -0,0 +1,302 @@
+# File: tests/test_realtime.py
+
+import os
+import sys
+import json
+import asyncio
+from contextlib import asynccontextmanager
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import aiohttp
+import realtime
+from realtime import FeedManager, MultiTimeframe, RESYNC, decode_frame, tick_price
+
+
+class FakeMessage:
+    type = aiohttp.WSMsgType.TEXT
+
+    def __init__(self, frame):
+        self.data = json.dumps(frame, separators=(",", ":"))   # compact, like Binance
+
+    def json(self):
+        return json.loads(self.data)
+
+
+class Garbage:
+    type = aiohttp.WSMsgType.TEXT
+    data = '{"stream":"solusdt@kline_1m","data":{"k":{"t":60000,"x":true'   # cut short
+
+
+class FakeSocket:
+    """Combined-stream socket: records control messages, replays pushed frames."""
+    def __init__(self):
+        self.sent = []
+        self.inbox = asyncio.Queue()
+
+    async def send_json(self, msg):
+        self.sent.append(msg)
+
+    def push(self, stream, t, closed=True):
+        k = {"t": t, "o": "1", "h": "2", "l": "0.5", "c": "1.5", "v": "10", "x": closed}
+        self.inbox.put_nowait(FakeMessage({"stream": stream, "data": {"e": "kline", "k": k}}))
+
+    def push_frame(self, frame):
+        self.inbox.put_nowait(FakeMessage(frame))
+
+    def drop(self):
+        self.inbox.put_nowait(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        msg = await self.inbox.get()
+        if msg is None:
+            raise StopAsyncIteration
+        return msg
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+def make_manager(per_socket, fetch=None):
+    sockets = []
+
+    @asynccontextmanager
+    async def connect(url):
+        ws = FakeSocket()
+        sockets.append(ws)
+        yield ws
+
+    feeds = FeedManager(streams_per_socket=per_socket, control_interval=0, connect=connect,
+                        fetch=fetch, reconnect_min=0, reconnect_max=0)
+    return feeds, sockets
+
+
+def test_streams_share_sockets_and_demultiplex():
+    async def scenario():
+        feeds, sockets = make_manager(per_socket=3)
+        symbols = ["SOL/USDT", "BTC/USDT"]
+        queues = {(s, i): feeds.subscribe(s, i) for s in symbols for i in ("1m", "5m")}
+        extra = feeds.subscribe("SOL/USDT", "1m")          # second consumer, same stream
+        await asyncio.sleep(0.01)
+        assert feeds.socket_count == 2 and len(sockets) == 2
+        subscribed = sorted(p for ws in sockets for m in ws.sent for p in m["params"])
+        assert subscribed == ["btcusdt@kline_1m", "btcusdt@kline_5m", "solusdt@kline_1m", "solusdt@kline_5m"]
+
+        for ws in sockets:
+            for m in ws.sent:
+                for stream in m["params"]:
+                    ws.push(stream, 60_000, closed=False)   # still forming: dropped
+                    ws.push(stream, 0)
+        await asyncio.sleep(0.01)
+        got = {key: drain(q) for key, q in queues.items()}
+        assert all(bars == [RESYNC, [0, 1.0, 2.0, 0.5, 1.5, 10.0]] for bars in got.values())
+        assert len(drain(extra)) == 2
+
+        # runtime unsubscribe: the stream goes with its last consumer, the socket with its last stream
+        feeds.unsubscribe("SOL/USDT", "1m", queues[("SOL/USDT", "1m")])
+        feeds.unsubscribe("SOL/USDT", "1m", extra)
+        feeds.unsubscribe("BTC/USDT", "5m", queues[("BTC/USDT", "5m")])
+        await asyncio.sleep(0.01)
+        sent = [m for ws in sockets for m in ws.sent if m["method"] == "UNSUBSCRIBE"]
+        assert sorted(p for m in sent for p in m["params"]) == ["btcusdt@kline_5m", "solusdt@kline_1m"]
+        assert feeds.socket_count == 1
+        await feeds.close()
+
+    asyncio.run(scenario())
+
+
+def test_managed_feed_is_a_drop_in_stream():
+    async def scenario():
+        feeds, sockets = make_manager(per_socket=10)
+        stream = feeds.feed("SOL/USDT", "5m").ohlcv_stream()
+        first = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.01)
+        sockets[0].push("solusdt@kline_5m", 300_000)
+        bar = await asyncio.wait_for(first, 1)
+        await stream.aclose()
+        return bar, feeds.socket_count
+
+    bar, sockets_left = asyncio.run(scenario())
+    assert bar[0] == 300_000 and sockets_left == 0
+
+
+def test_dropped_socket_reconnects_and_backfills_gaps():
+    async def scenario():
+        rest = {t: [t, 1.0, 1.0, 1.0, float(t // 60_000), 1.0] for t in range(0, 600_000, 60_000)}
+        calls = []
+
+        async def fetch(symbol, timeframe, since, limit):
+            calls.append(since)
+            return [rest[t] for t in sorted(rest) if t >= since][:2]     # two bars per page
+
+        feeds, sockets = make_manager(per_socket=10, fetch=fetch)
+        stream = feeds.feed("SOL/USDT", "1m").ohlcv_stream()
+        bars = []
+
+        async def consume():
+            async for bar in stream:
+                bars.append(bar[0] // 60_000)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        sockets[0].push("solusdt@kline_1m", 0)
+        sockets[0].push("solusdt@kline_1m", 180_000)         # 1 and 2 never arrived live
+        await asyncio.sleep(0.01)
+        sockets[0].drop()                                    # socket dies; 4..9 closed meanwhile
+        await asyncio.sleep(0.05)
+        sockets[1].inbox.put_nowait(Garbage())               # unreadable frame: reconnect, not die
+        await asyncio.sleep(0.05)
+        sockets[2].push("solusdt@kline_1m", 540_000)         # replayed live: dropped
+        await asyncio.sleep(0.01)
+        task.cancel()
+        return bars, calls, len(sockets)
+
+    bars, calls, connects = asyncio.run(scenario())
+    assert connects == 3
+    assert bars == list(range(10))
+    assert calls[0] == 60_000 and calls[1] == 240_000
+
+
+def test_single_stream_survives_garbage_frames(monkeypatch):
+    async def scenario():
+        sockets = []
+
+        class FakeSession:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                pass
+
+            @asynccontextmanager
+            async def ws_connect(self, url, heartbeat=None):
+                ws = FakeSocket()
+                sockets.append(ws)
+                yield ws
+
+        async def fetch(symbol, timeframe, since, limit):
+            return []
+
+        monkeypatch.setattr(realtime.aiohttp, "ClientSession", FakeSession)
+        backoff = realtime.Backoff
+        monkeypatch.setattr(realtime, "Backoff", lambda: backoff(0, 0))
+        stream = realtime.Realtime("SOL/USDT", "1m", fetch=fetch).ohlcv_stream()
+        bars = []
+
+        async def consume():
+            async for bar in stream:
+                bars.append(bar[0] // 60_000)
+
+        task = asyncio.create_task(consume())
+        await asyncio.sleep(0.01)
+        sockets[0].push("solusdt@kline_1m", 0)
+        sockets[0].inbox.put_nowait(Garbage())
+        await asyncio.sleep(0.05)
+        sockets[1].push("solusdt@kline_1m", 60_000)
+        await asyncio.sleep(0.01)
+        done = task.done()
+        task.cancel()
+        return bars, len(sockets), done
+
+    bars, connects, done = asyncio.run(scenario())
+    assert not done and connects == 2
+    assert bars == [0, 1]
+
+
+def test_decode_frame_skips_forming_klines_cheaply():
+    k = {"t": 60_000, "o": "1.5", "h": "2", "l": "1", "c": "1.75", "v": "3", "x": False}
+    forming = json.dumps({"stream": "solusdt@kline_1m", "data": {"k": k}}, separators=(",", ":"))
+    assert decode_frame(forming) is None
+    closed = forming.replace('"x":false', '"x":true')
+    assert decode_frame(closed) == ("solusdt@kline_1m", [60_000, 1.5, 2.0, 1.0, 1.75, 3.0])
+    # single-stream frames and non-compact JSON still decode, just without the shortcut
+    assert decode_frame(json.dumps({"k": k})) is None
+    assert decode_frame(json.dumps({"k": {**k, "x": True}}))[1][4] == 1.75
+
+
+class ListFeed:
+    def __init__(self, bars):
+        self.bars = bars
+        self.opened = 0
+
+    async def ohlcv_stream(self):
+        self.opened += 1
+        for bar in self.bars:
+            await asyncio.sleep(0)
+            yield bar
+        await asyncio.Event().wait()
+
+
+def test_multi_timeframe_serves_every_interval_from_one_stream():
+    minutes = [[t * 60_000, 10.0 + t, 11.0 + t, 9.0 + t, 10.5 + t, 1.0] for t in range(3, 31)]
+    source = ListFeed(minutes)
+
+    async def take(feed, n):
+        out = []
+        async for bar in feed.ohlcv_stream():
+            out.append(bar)
+            if len(out) == n:
+                return out
+
+    async def scenario():
+        mtf = MultiTimeframe("SOL/USDT", source=source)
+        return await asyncio.gather(take(mtf.feed("1m"), 28), take(mtf.feed("5m"), 5), take(mtf.feed("15m"), 1))
+
+    one, five, fifteen = asyncio.run(scenario())
+    assert source.opened == 1 and one == minutes
+    assert [b[0] for b in five] == [300_000, 600_000, 900_000, 1_200_000, 1_500_000]
+    assert five[0] == [300_000, 15.0, 20.0, 14.0, 19.5, 5.0]
+    assert fifteen == [[900_000, 25.0, 40.0, 24.0, 39.5, 15.0]]
+
+
+def test_tick_listeners_get_prices_without_queues():
+    async def scenario():
+        feeds, sockets = make_manager(per_socket=10)
+        kline = feeds.subscribe("SOL/USDT", "1m")
+        prices = []
+        feeds.add_tick_listener("SOL/USDT", "bookTicker", prices.append)
+        await asyncio.sleep(0.01)
+        ws = sockets[0]
+        assert sorted(p for m in ws.sent for p in m["params"]) == ["solusdt@bookTicker", "solusdt@kline_1m"]
+        for bid in ("150.10", "149.95"):
+            ws.push_frame({"stream": "solusdt@bookTicker",
+                           "data": {"u": 1, "s": "SOLUSDT", "b": bid, "B": "3", "a": "150.2", "A": "1"}})
+        ws.push("solusdt@kline_1m", 0)
+        await asyncio.sleep(0.01)
+        feeds.remove_tick_listener("SOL/USDT", "bookTicker", prices.append)
+        await asyncio.sleep(0.01)
+        unsubscribed = [p for m in ws.sent if m["method"] == "UNSUBSCRIBE" for p in m["params"]]
+        return prices, drain(kline)[-1], unsubscribed
+
+    prices, bar, unsubscribed = asyncio.run(scenario())
+    assert prices == [150.10, 149.95] and bar[0] == 0
+    assert unsubscribed == ["solusdt@bookTicker"]
+    assert tick_price('{"e":"trade","p":"151.25","q":"2"}', "trade") == 151.25
+
+
+def test_failing_tick_listener_does_not_drop_the_socket():
+    async def scenario():
+        feeds, sockets = make_manager(per_socket=10)
+        prices = []
+
+        def broken(price):
+            raise RuntimeError("dust")
+
+        feeds.add_tick_listener("SOL/USDT", "trade", broken)
+        feeds.add_tick_listener("SOL/USDT", "trade", prices.append)
+        await asyncio.sleep(0.01)
+        for p in ("150.1", "150.2"):
+            sockets[0].push_frame({"stream": "solusdt@trade", "data": {"e": "trade", "p": p, "q": "1"}})
+        await asyncio.sleep(0.01)
+        return prices, len(sockets)
+
+    prices, connects = asyncio.run(scenario())
+    assert prices == [150.1, 150.2] and connects == 1
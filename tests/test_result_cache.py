@@ -0,0 +1,69 @@
+# File: tests/test_result_cache.py
+
+import os
+import sys
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from backtests.result_cache import ResultCache
+from backtests.grid_backtest import sma_pairs
+from tests.test_grid_backtest import CLOSES
+
+FEE, SLIP = 0.001, 0.0005
+
+
+class DictRedis:
+    """Just the mget / pipeline-set surface the cache uses."""
+    def __init__(self):
+        self.data = {}
+
+    def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self):
+        return self
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def execute(self):
+        pass
+
+
+def counting_compute(closes, calls):
+    def compute(missing):
+        calls.append(list(missing))
+        return sma_pairs(closes, missing, FEE, SLIP)
+    return compute
+
+
+def test_overlapping_grid_only_computes_new_cells():
+    cache, calls = ResultCache(), []
+    first = cache.cells("sma", [(5, 20), (10, 30)], CLOSES, FEE, SLIP, counting_compute(CLOSES, calls))
+    second = cache.cells("sma", [(10, 30), (5, 50)], CLOSES, FEE, SLIP, counting_compute(CLOSES, calls))
+    assert calls == [[(5, 20), (10, 30)], [(5, 50)]]
+    assert second[0] == first[1]
+    assert second == sma_pairs(CLOSES, [(10, 30), (5, 50)], FEE, SLIP)
+
+
+def test_new_bars_and_costs_change_keys():
+    cache, calls = ResultCache(), []
+    cache.cells("sma", [(5, 20)], CLOSES, FEE, SLIP, counting_compute(CLOSES, calls))
+    longer = CLOSES + [CLOSES[-1] * 1.01]
+    cache.cells("sma", [(5, 20)], longer, FEE, SLIP, counting_compute(longer, calls))
+    cache.cells("sma", [(5, 20)], CLOSES, FEE, 0.0, counting_compute(CLOSES, calls))
+    assert len(calls) == 3
+
+
+def test_lru_is_bounded_and_falls_back_to_redis():
+    redis = DictRedis()
+    cache, calls = ResultCache(redis, maxsize=2), []
+    pairs = [(3, 10), (4, 10), (5, 10)]
+    rows = cache.cells("sma", pairs, CLOSES, FEE, SLIP, counting_compute(CLOSES, calls))
+    assert len(cache._lru) == 2 and len(redis.data) == 3
+
+    # A fresh process-local tier still hits Redis
+    again = ResultCache(redis).cells("sma", pairs, CLOSES, FEE, SLIP, counting_compute(CLOSES, calls))
+    assert len(calls) == 1
+    assert again == rows
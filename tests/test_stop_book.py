@@ -0,0 +1,48 @@
+# File: tests/test_stop_book.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.stop_book import StopBook, stop_level
+
+
+def test_hits_match_a_linear_scan_as_stops_move():
+    rng = random.Random(5)
+    book, stops = StopBook(), {}
+    for _ in range(5_000):
+        owner = rng.randrange(20)
+        if rng.random() < 0.6:
+            stop = rng.choice([None, round(rng.uniform(90, 100), 2)])
+            book.set(owner, stop)
+            if stop is None:
+                stops.pop(owner, None)
+            else:
+                stops[owner] = stop
+        else:
+            price = rng.uniform(88, 102)
+            expected = sorted((o for o, s in stops.items() if price <= s), key=lambda o: -stops[o])
+            assert [stops[o] for o in book.hit(price)] == [stops[o] for o in expected]
+            for o in expected:
+                del stops[o]
+        assert len(book) == len(stops)
+        assert book.trigger == max(stops.values(), default=float("-inf"))
+
+
+def test_quiet_ticks_leave_the_book_alone():
+    book = StopBook()
+    book.set("sma", 95.0)
+    book.set("sma", 97.0)       # moved: the 95.0 entry is stale
+    assert book.hit(97.5) == [] and "sma" in book
+    assert book.hit(97.0) == ["sma"] and book.hit(1.0) == []
+
+
+def test_stop_level_takes_the_higher_of_stop_and_trail():
+    assert stop_level(None, None, 100.0) is None
+    assert stop_level(95.0, None, None) == 95.0
+    assert stop_level(None, 0.01, 100.0) == 99.0
+    assert stop_level(99.5, 0.01, 100.0) == 99.5
+    assert stop_level(95.0, 0.01, 100.0) == 99.0
@@ -0,0 +1,59 @@
+# File: tests/test_synthetic.py
+
+import os
+import sys
+import asyncio
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import config
+import realtime
+from synthetic import MarketSimulator, SyntheticFeed, SyntheticMarket, generate_ohlcv
+
+
+async def take(agen, n):
+    out = []
+    async for item in agen:
+        out.append(item)
+        if len(out) == n:
+            break
+    return out
+
+
+def test_bars_are_continuous_and_well_formed():
+    sim = MarketSimulator(3, "5m", seed=5, start_ts=0)
+    bars = np.concatenate([sim.next(100), sim.next(50)], axis=1)
+    assert bars.shape == (3, 150, 6)
+    assert np.array_equal(bars[0, :, 0], np.arange(150) * 300_000)
+    np.testing.assert_allclose(bars[:, 1:, 1], bars[:, :-1, 4])
+    assert (bars[..., 2] >= np.maximum(bars[..., 1], bars[..., 4])).all()
+    assert (bars[..., 3] <= np.minimum(bars[..., 1], bars[..., 4])).all()
+    assert np.array_equal(generate_ohlcv(200, seed=7, start_ts=0), generate_ohlcv(200, seed=7, start_ts=0))
+
+
+def test_returns_show_volatility_clustering():
+    r = np.diff(np.log(generate_ohlcv(200_000, seed=3, start_ts=0)[:, 4]))
+    a = np.abs(r)
+    assert abs(np.corrcoef(r[:-1], r[1:])[0, 1]) < 0.02      # no linear predictability
+    assert np.corrcoef(a[:-1], a[1:])[0, 1] > 0.1             # but volatility persists
+    assert ((r - r.mean()) ** 4).mean() / r.var() ** 2 > 3.5  # fat tails
+
+
+def test_feeds_for_one_symbol_agree_across_intervals(monkeypatch):
+    fast = asyncio.run(take(SyntheticFeed("SOL/USDT", "1m", speed=None, start_ts=0).ohlcv_stream(), 10))
+    slow = asyncio.run(take(SyntheticFeed("SOL/USDT", "5m", speed=None, start_ts=0).ohlcv_stream(), 2))
+    assert slow[0][0] == fast[0][0] and slow[1][0] == fast[5][0]
+    assert slow[0][4] == fast[4][4] and slow[1][4] == fast[9][4]
+    assert slow[0][2] == max(b[2] for b in fast[:5])
+
+    monkeypatch.setattr(config, "SYNTHETIC_FEED", True)
+    assert isinstance(realtime.make_feed("SOL/USDT", "5m"), SyntheticFeed)
+
+
+def test_market_streams_every_symbol_each_bar():
+    symbols = [f"S{i}/USDT" for i in range(500)]
+    items = asyncio.run(take(SyntheticMarket(symbols, "1m", speed=None, seed=1).stream(), 1000))
+    assert [s for s, _ in items[:500]] == symbols
+    assert {bar[0] for _, bar in items[:500]} != {bar[0] for _, bar in items[500:]}
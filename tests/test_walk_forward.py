@@ -0,0 +1,79 @@
+# File: tests/test_walk_forward.py
+
+import os
+import sys
+import random
+
+# Ensure project root is on PYTHONPATH
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+import pytest
+from backtests import walk_forward as wf
+
+FEE, SLIP = 0.001, 0.0005
+MINUTE = 60_000
+
+def gen_bars(n, seed=4, t0=1_700_000_000_000):
+    rng = random.Random(seed)
+    bars, price = [], 100.0
+    for i in range(n):
+        price = max(1.0, price * (1 + rng.gauss(0, 0.006)))
+        bars.append([t0 + i * MINUTE, price, price, price, price, 1.0])
+    return np.array(bars)
+
+BARS = gen_bars(1200)
+
+
+def test_folds_sit_on_absolute_grid():
+    ts = BARS[:, 0]
+    folds = wf.make_folds(ts, 300, 100)
+    assert folds
+    for a, b, c in folds:
+        assert b - a == 300 and c - b == 100
+        assert (ts[b] // MINUTE) % 100 == 0
+    anchored = wf.make_folds(ts, 300, 100, anchored=True)
+    assert anchored and len({f[0] for f in anchored}) == 1
+    origin = anchored[0][0]
+    assert origin < 100 and (ts[origin] // MINUTE) % 100 == 0
+
+
+def test_walk_forward_reuses_folds_when_history_advances(monkeypatch):
+    cache = {}
+    first = wf.walk_forward(BARS[:1000], [3, 5], [10, 20], 300, 100, fee_pct=FEE, slippage_pct=SLIP,
+                            workers=1, cache=cache)
+    calls = []
+    run_fold = wf._run_fold
+    monkeypatch.setattr(wf, "_run_fold", lambda *a: calls.append(a[2]) or run_fold(*a))
+
+    second = wf.walk_forward(BARS, [3, 5], [10, 20], 300, 100, fee_pct=FEE, slippage_pct=SLIP,
+                             workers=1, cache=cache)
+    assert len(second["folds"]) == len(first["folds"]) + len(calls)
+    assert 0 < len(calls) <= 2
+    assert second["folds"][:len(first["folds"])] == first["folds"]
+    assert second["oos_total_pnl"] == pytest.approx(sum(f["oos_pnl"] for f in second["folds"]))
+
+
+def test_anchored_folds_are_reused_when_the_window_slides(monkeypatch):
+    cache = {}
+    start = next(i for i in range(100) if (BARS[i, 0] // MINUTE) % 100 == 50)
+    first = wf.walk_forward(BARS[start:start + 1000], [3, 5], [10, 20], 300, 100, anchored=True,
+                            fee_pct=FEE, slippage_pct=SLIP, workers=1, cache=cache)
+    calls = []
+    run_fold = wf._run_fold
+    monkeypatch.setattr(wf, "_run_fold", lambda *a: calls.append(a[2]) or run_fold(*a))
+
+    # One new bar, oldest dropped: same anchor, every fold from the cache
+    second = wf.walk_forward(BARS[start + 1:start + 1001], [3, 5], [10, 20], 300, 100, anchored=True,
+                             fee_pct=FEE, slippage_pct=SLIP, workers=1, cache=cache)
+    assert first["folds"] and not calls
+    assert second["folds"] == first["folds"]
+
+
+def test_walk_forward_parallel_matches_serial(monkeypatch):
+    monkeypatch.setattr(wf, "SWEEP_MIN_CELLS", 0)   # force the pool for a small history
+    serial = wf.walk_forward(BARS, [3, 5], [10, 20], 300, 100, fee_pct=FEE, slippage_pct=SLIP,
+                             workers=1, cache={})
+    pooled = wf.walk_forward(BARS, [3, 5], [10, 20], 300, 100, fee_pct=FEE, slippage_pct=SLIP,
+                             workers=2, cache={})
+    assert pooled == serial
@@ -0,0 +1,88 @@
+# File: utils/bar_buffer.py
+
+import numpy as np
+
+"""
+Fixed-capacity columnar storage for live OHLCV bars.
+"""
+
+COLUMNS = ("ts", "open", "high", "low", "close", "volume")
+
+
+class BarBuffer:
+    """
+    Ring buffer of the last `capacity` bars, one contiguous float64 column
+    per field. Each bar is written twice (at slot i and i + capacity), so the
+    most recent bars always form one contiguous slice and every read below
+    is a view rather than a copy. Appending never allocates.
+
+    Usage:
+        buf = BarBuffer(101)
+        buf.append([ts, o, h, l, c, v])
+        buf.close          # view of every close held, oldest first
+        buf.last(20)       # view of the last 20 closes
+        buf[-1][4]         # indexing still works like a list of bars
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = np.zeros((len(COLUMNS), 2 * capacity))
+        self._next = 0
+        self._len  = 0
+
+    def append(self, bar):
+        i = self._next
+        self._data[:, i] = bar[:6]
+        self._data[:, i + self.capacity] = bar[:6]
+        self._next = (i + 1) % self.capacity
+        self._len = min(self._len + 1, self.capacity)
+
+    def extend(self, bars):
+        for bar in bars:
+            self.append(bar)
+
+    def columns(self):
+        """(6, len) view of ts/open/high/low/close/volume, oldest bar first."""
+        stop = self._next + self.capacity
+        return self._data[:, stop - self._len:stop]
+
+    def last(self, n, column="close"):
+        """View of the last `n` values of `column`."""
+        return self.columns()[COLUMNS.index(column), -n:] if n else self._data[0, :0]
+
+    @property
+    def ts(self):
+        return self.columns()[0]
+
+    @property
+    def open(self):
+        return self.columns()[1]
+
+    @property
+    def high(self):
+        return self.columns()[2]
+
+    @property
+    def low(self):
+        return self.columns()[3]
+
+    @property
+    def close(self):
+        return self.columns()[4]
+
+    @property
+    def volume(self):
+        return self.columns()[5]
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, index):
+        """Bar(s) as rows: buf[-1][4] is the latest close."""
+        return self.columns().T[index]
+
+    def __iter__(self):
+        return iter(self.columns().T)
+
+    def tolist(self):
+        return self.columns().T.tolist()
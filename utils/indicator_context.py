@@ -0,0 +1,210 @@
+# File: utils/indicator_context.py
+
+import numpy as np
+
+from utils import vectorized
+from utils.bar_buffer import BarBuffer
+from utils.streaming import RollingSma, Ema, Rsi, Macd, Bollinger
+
+"""
+Shared, memoized indicator values for every strategy running on a symbol.
+"""
+
+# name -> fn(columns, *params) returning an array (or tuple of arrays)
+# with one value per bar. All of these are causal: the value at bar i only
+# depends on bars 0..i.
+INDICATORS = {
+    "sma":       lambda cols, period: vectorized.sma(cols[4], period),
+    "ema":       lambda cols, period: vectorized.ema(cols[4], period),
+    "rsi":       lambda cols, period: vectorized.rsi(cols[4], period),
+    "atr":       lambda cols, period: vectorized.atr(cols[2], cols[3], cols[4], period),
+    "macd":      lambda cols, fast, slow, signal: vectorized.macd(cols[4], fast, slow, signal),
+    "bollinger": lambda cols, period, k: vectorized.bollinger(cols[4], period, k),
+    "sma_cross": lambda cols, fast, slow: vectorized.crossover(
+        vectorized.sma(cols[4], fast), vectorized.sma(cols[4], slow)
+    ),
+}
+
+
+# Close-driven indicators StreamingContext keeps as O(1) state
+STREAMING = {
+    "sma":       RollingSma,
+    "ema":       Ema,
+    "rsi":       Rsi,
+    "macd":      Macd,
+    "bollinger": Bollinger,
+}
+
+
+def as_columns(ohlcv):
+    """
+    Return bars as a (6, n) float64 array of ts/open/high/low/close/volume
+    rows. A BarBuffer or NumPy (n, 6) array comes back as a view, not a copy.
+    """
+    if isinstance(ohlcv, BarBuffer):
+        return ohlcv.columns()
+    arr = np.asarray(ohlcv, dtype=np.float64)
+    if arr.size == 0:
+        return np.empty((6, 0))
+    return arr.T
+
+
+def _scalar(v):
+    v = float(v)
+    return None if v != v else v
+
+
+class IndicatorContext:
+    """
+    Per-symbol indicator cache.
+
+    Each distinct (indicator, params) series is computed once over the
+    current bar window and shared by every strategy that asks for it.
+    Values are read at `cursor`, which normally points at the latest bar.
+
+    - update(ohlcv) points the context at a new window (one per bar rollover)
+      and evicts everything cached for the previous one.
+    - seek(i) only moves the cursor. Since every indicator is causal, series
+      computed over a whole history stay valid at any earlier cursor, which
+      lets a backtest compute each series once instead of once per bar.
+    """
+    def __init__(self, ohlcv=None):
+        self._cols  = np.empty((6, 0))
+        self._cache = {}
+        self.cursor = -1
+        if ohlcv is not None:
+            self.update(ohlcv)
+
+    def update(self, ohlcv):
+        self._cols = as_columns(ohlcv)
+        self._cache.clear()
+        self.cursor = self._cols.shape[1] - 1
+
+    def seek(self, index):
+        self.cursor = index
+
+    def __len__(self):
+        return self.cursor + 1
+
+    @property
+    def closes(self):
+        """Closes up to and including the cursor (a view, not a copy)."""
+        return self._cols[4, :self.cursor + 1]
+
+    @property
+    def close(self):
+        return float(self._cols[4, self.cursor])
+
+    def series(self, name, *params):
+        """
+        Full series for `name` over the window, computed on first use.
+        """
+        key = (name,) + params
+        if key not in self._cache:
+            self._cache[key] = INDICATORS[name](self._cols, *params)
+        return self._cache[key]
+
+    def value(self, name, *params, back=0):
+        """
+        Value of `name` at `back` bars before the cursor (None if not warm).
+        Multi-line indicators return a tuple.
+        """
+        i = self.cursor - back
+        s = self.series(name, *params)
+        if isinstance(s, tuple):
+            return tuple(_scalar(line[i]) if i >= 0 else None for line in s)
+        return _scalar(s[i]) if i >= 0 else None
+
+    # ─── Convenience accessors ───────────────────────────────────────────────
+    def sma(self, period, back=0):
+        return self.value("sma", period, back=back)
+
+    def ema(self, period, back=0):
+        return self.value("ema", period, back=back)
+
+    def rsi(self, period, back=0):
+        return self.value("rsi", period, back=back)
+
+    def atr(self, period, back=0):
+        return self.value("atr", period, back=back)
+
+    def macd(self, fast, slow, signal, back=0):
+        return self.value("macd", fast, slow, signal, back=back)
+
+    def bollinger(self, period, num_std_dev, back=0):
+        return self.value("bollinger", period, num_std_dev, back=back)
+
+    def sma_cross(self, fast, slow, back=0):
+        return int(self.series("sma_cross", fast, slow)[self.cursor - back])
+
+
+def _sign(a, b, rtol=1e-9):
+    # vectorized.crossover's sign rule for one pair of values
+    if a is None or b is None:
+        return None
+    d = a - b
+    return 0 if abs(d) <= rtol * abs(b) else (1 if d > 0 else -1)
+
+
+class StreamingContext(IndicatorContext):
+    """
+    Live counterpart of IndicatorContext. push(bar) folds each new bar into
+    the streaming indicators of utils.streaming, so a bar costs O(1) per
+    indicator however long the window is, instead of a recompute over it.
+
+    Indicators are created on first request and warmed up from the bars in
+    `window` (the BarBuffer the caller appends to). Values reach one bar
+    back (`value` / `prev`); anything else falls back to the batch series
+    over the window. len() counts every bar pushed, not just those held.
+
+    Usage:
+        bars = BarBuffer(101)
+        ctx = StreamingContext(bars)
+        bars.append(bar); ctx.push(bar)
+        strategy.on_bar(bars, ctx)
+    """
+    def __init__(self, window):
+        super().__init__()
+        self.window   = window
+        self._streams = {}
+        self._seen    = 0
+
+    def push(self, bar):
+        self._seen += 1
+        close = bar[4]
+        for ind in self._streams.values():
+            ind.update(close)
+        super().update(self.window)
+
+    def __len__(self):
+        return self._seen
+
+    def _stream(self, key):
+        ind = self._streams.get(key)
+        if ind is None:
+            ind = STREAMING[key[0]](*key[1:])
+            for close in self.window.close.tolist():
+                ind.update(close)
+            self._streams[key] = ind
+        return ind
+
+    def value(self, name, *params, back=0):
+        if name in STREAMING and back <= 1:
+            ind = self._stream((name,) + params)
+            attr = "prev" if back else "value"
+            if hasattr(ind, attr):
+                return getattr(ind, attr)
+        return super().value(name, *params, back=back)
+
+    def sma_cross(self, fast, slow, back=0):
+        if back:
+            return super().sma_cross(fast, slow, back)
+        f, s = self._stream(("sma", fast)), self._stream(("sma", slow))
+        now, before = _sign(f.value, s.value), _sign(f.prev, s.prev)
+        if now is None or before is None:
+            return 0
+        if before <= 0 < now:
+            return 1
+        if before >= 0 > now:
+            return -1
+        return 0
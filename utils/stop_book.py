@@ -0,0 +1,89 @@
+# File: utils/stop_book.py
+
+import heapq
+import itertools
+import math
+
+"""
+Stop-loss levels checked against every tick.
+"""
+
+
+def stop_level(stop, trail, peak):
+    """
+    Effective long stop: the hard `stop` or, if higher, `trail` (a fraction)
+    below `peak`; None when neither applies.
+    """
+    trailing = peak * (1 - trail) if trail is not None and peak is not None else None
+    if stop is None:
+        return trailing
+    return stop if trailing is None else max(stop, trailing)
+
+
+class StopBook:
+    """
+    Long stops keyed by owner (e.g. a strategy), held in a max-heap so a
+    tick that breaches nothing costs a single float comparison against
+    `trigger`, the highest live stop. Moving or removing a stop leaves a
+    stale heap entry that is discarded lazily.
+
+    Usage:
+        book = StopBook()
+        book.set(strat, 98.5)          # add or move; None removes
+        for owner in book.hit(bid):    # every stop at or above `bid`, taken off the book
+            ...
+    """
+
+    def __init__(self):
+        self._heap  = []               # (-stop, seq, owner)
+        self._live  = {}               # owner -> (stop, seq)
+        self._seq   = itertools.count()
+        self.trigger = -math.inf
+
+    def set(self, owner, stop):
+        if stop is None:
+            self.remove(owner)
+            return
+        current = self._live.get(owner)
+        if current is not None and current[0] == stop:
+            return
+        seq = next(self._seq)
+        self._live[owner] = (stop, seq)
+        heapq.heappush(self._heap, (-stop, seq, owner))
+        if len(self._heap) > 2 * len(self._live) + 16:
+            self._heap = [(-s, q, o) for o, (s, q) in self._live.items()]
+            heapq.heapify(self._heap)
+        self._settle()
+
+    def remove(self, owner):
+        if self._live.pop(owner, None) is not None:
+            self._settle()
+
+    def hit(self, price):
+        """
+        Owners whose stop is at or above `price`, highest stop first; they
+        are removed from the book.
+        """
+        if price > self.trigger:
+            return []
+        hits = []
+        while self._heap and -self._heap[0][0] >= price:
+            _, seq, owner = heapq.heappop(self._heap)
+            if self._live.get(owner, (None, None))[1] == seq:
+                del self._live[owner]
+                hits.append(owner)
+        self._settle()
+        return hits
+
+    def _settle(self):
+        # drop stale entries from the top so `trigger` is the highest live stop
+        heap = self._heap
+        while heap and self._live.get(heap[0][2], (None, None))[1] != heap[0][1]:
+            heapq.heappop(heap)
+        self.trigger = -heap[0][0] if heap else -math.inf
+
+    def __len__(self):
+        return len(self._live)
+
+    def __contains__(self, owner):
+        return owner in self._live
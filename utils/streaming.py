@@ -0,0 +1,271 @@
+# File: utils/streaming.py
+
+from collections import deque
+import math
+
+"""
+Streaming versions of the indicators in utils.indicators.
+
+Each object keeps just enough state to fold in one new value (or bar) per
+call, so updating costs O(1) regardless of how much history has been seen.
+Outputs match the batch functions in utils.indicators bar for bar.
+"""
+
+
+class RollingSma:
+    """
+    Simple moving average over the last `period` values.
+    `value` is None until `period` values have been seen; `prev` holds the
+    value from the previous update.
+    """
+    def __init__(self, period):
+        self.period  = period
+        self._window = deque()
+        self._sum    = 0.0
+        self._count  = 0
+        self.value   = None
+        self.prev    = None
+
+    def update(self, value):
+        self._window.append(value)
+        self._sum += value
+        if len(self._window) > self.period:
+            self._sum -= self._window.popleft()
+
+        # Re-sum once per period so float drift never accumulates (amortised O(1))
+        self._count += 1
+        if self._count % self.period == 0:
+            self._sum = math.fsum(self._window)
+
+        self.prev = self.value
+        if len(self._window) == self.period:
+            self.value = self._sum / self.period
+        return self.value
+
+
+class Ema:
+    """
+    Exponential moving average with α = 2/(period+1), seeded with the simple
+    average of the first `period` values (same as utils.indicators.ema).
+    """
+    def __init__(self, period):
+        self.period = period
+        self.alpha  = 2 / (period + 1)
+        self._seed  = []
+        self.value  = None
+        self.prev   = None
+
+    def update(self, value):
+        self.prev = self.value
+        if self.value is None:
+            self._seed.append(value)
+            if len(self._seed) == self.period:
+                self.value = sum(self._seed) / self.period
+                self._seed = None
+        else:
+            self.value = (value - self.value) * self.alpha + self.value
+        return self.value
+
+
+class Macd:
+    """
+    MACD line, signal line and histogram, updated one close at a time.
+    `value` is a (macd, signal, hist) tuple; entries are None until warm.
+    """
+    def __init__(self, fast_period, slow_period, signal_period):
+        self.fast   = Ema(fast_period)
+        self.slow   = Ema(slow_period)
+        self.signal = Ema(signal_period)
+        self.value  = (None, None, None)
+        self.prev   = (None, None, None)
+
+    def update(self, close):
+        f = self.fast.update(close)
+        s = self.slow.update(close)
+        macd = sig = hist = None
+        if f is not None and s is not None:
+            macd = f - s
+            sig = self.signal.update(macd)
+            if sig is not None:
+                hist = macd - sig
+        self.prev  = self.value
+        self.value = (macd, sig, hist)
+        return self.value
+
+
+class Atr:
+    """
+    Average True Range fed with [ts, o, h, l, c, v] bars.
+
+    By default this is the rolling mean of the last `period` true ranges,
+    matching utils.indicators.atr (including its partial average while fewer
+    than `period` ranges exist). With wilder=True it uses Wilder's smoothing,
+    seeded from the first `period` true ranges.
+    """
+    def __init__(self, period, wilder=False):
+        self.period      = period
+        self.wilder      = wilder
+        self._prev_close = None
+        self._trs        = deque()
+        self._sum        = 0.0
+        self._count      = 0
+        self.value       = 0.0
+
+    def update(self, bar):
+        h, l, c = bar[2], bar[3], bar[4]
+        prev_close, self._prev_close = self._prev_close, c
+        if prev_close is None:
+            return self.value
+
+        tr = max(h - l, abs(h - prev_close), abs(l - prev_close))
+        self._count += 1
+
+        if self.wilder and self._count > self.period:
+            self.value = (self.value * (self.period - 1) + tr) / self.period
+            return self.value
+
+        self._trs.append(tr)
+        self._sum += tr
+        if len(self._trs) > self.period:
+            self._sum -= self._trs.popleft()
+        if self._count % self.period == 0:
+            self._sum = math.fsum(self._trs)
+        self.value = self._sum / len(self._trs)
+        return self.value
+
+
+class Rsi:
+    """
+    RSI over the last `period` close-to-close changes, using the same
+    averaging as vectorized.rsi. `value` is None until `period`
+    changes have been seen.
+    """
+    def __init__(self, period):
+        self.period      = period
+        self._prev_close = None
+        self._deltas     = deque()
+        self._gain_sum   = 0.0
+        self._loss_sum   = 0.0
+        self._gains      = 0
+        self._losses     = 0
+        self._count      = 0
+        self.value       = None
+        self.prev        = None
+
+    def update(self, close):
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return self.value
+
+        d = close - prev_close
+        self._deltas.append(d)
+        self._add(d, 1)
+        if len(self._deltas) > self.period:
+            self._add(self._deltas.popleft(), -1)
+
+        self._count += 1
+        if self._count % self.period == 0:
+            self._gain_sum = math.fsum(x for x in self._deltas if x > 0)
+            self._loss_sum = math.fsum(-x for x in self._deltas if x < 0)
+
+        self.prev = self.value
+        if len(self._deltas) < self.period:
+            return self.value
+
+        # Counting gains/losses lets an empty side be exactly zero, as in the batch version
+        avg_gain = self._gain_sum / self.period if self._gains else 0
+        avg_loss = self._loss_sum / self.period if self._losses else 0
+        if avg_loss == 0:
+            self.value = 100
+        else:
+            rs = avg_gain / avg_loss
+            self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+    def _add(self, d, sign):
+        if d > 0:
+            self._gain_sum += sign * d
+            self._gains    += sign
+        elif d < 0:
+            self._loss_sum -= sign * d
+            self._losses   += sign
+
+
+class Bollinger:
+    """
+    Bollinger Bands over a sliding window, using a windowed Welford update
+    for the mean and population variance. `value` is (lower, middle, upper),
+    all None until `period` closes have been seen.
+    """
+    def __init__(self, period=20, num_std_dev=2):
+        self.period      = period
+        self.num_std_dev = num_std_dev
+        self._window     = deque()
+        self._mean       = 0.0
+        self._m2         = 0.0
+        self._count      = 0
+        self.value       = (None, None, None)
+
+    def update(self, close):
+        self._window.append(close)
+        n = len(self._window)
+        if n <= self.period:
+            # Growing window: plain Welford step
+            d = close - self._mean
+            self._mean += d / n
+            self._m2   += d * (close - self._mean)
+        else:
+            # Sliding window: add `close` and drop the oldest value in one step
+            old = self._window.popleft()
+            new_mean = self._mean + (close - old) / self.period
+            self._m2 += (close - old) * (close - new_mean + old - self._mean)
+            self._mean = new_mean
+
+        self._count += 1
+        if self._count % self.period == 0:
+            self._mean = math.fsum(self._window) / len(self._window)
+            self._m2   = math.fsum((x - self._mean) ** 2 for x in self._window)
+
+        if len(self._window) < self.period:
+            return self.value
+
+        sd = math.sqrt(max(self._m2, 0.0) / self.period)
+        mid = self._mean
+        self.value = (mid - self.num_std_dev * sd, mid, mid + self.num_std_dev * sd)
+        return self.value
+
+
+class BarResampler:
+    """
+    Folds base bars (1m by default) into bars of `period_ms`, aligned to
+    multiples of the period since the epoch. update() returns the finished
+    bar as soon as the base bar that closes its bucket arrives, else None.
+
+    A bucket joined part-way (at start-up) is never emitted, since its open
+    would be wrong; one cut short by a gap is emitted as it stands when a
+    later bucket begins.
+    """
+    def __init__(self, period_ms, base_ms=60_000):
+        self.period = period_ms
+        self.base   = base_ms
+        self._bar   = None
+
+    def update(self, bar):
+        t = bar[0]
+        start = t - t % self.period
+        done = None
+        if self._bar is not None and start != self._bar[0]:
+            done, self._bar = self._bar, None
+
+        if self._bar is not None:
+            b = self._bar
+            b[2] = max(b[2], bar[2])
+            b[3] = min(b[3], bar[3])
+            b[4] = bar[4]
+            b[5] += bar[5]
+        elif t == start:
+            self._bar = [start, bar[1], bar[2], bar[3], bar[4], bar[5]]
+
+        if self._bar is not None and t + self.base >= start + self.period:
+            done, self._bar = self._bar, None
+        return done
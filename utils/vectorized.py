@@ -0,0 +1,288 @@
+# File: utils/vectorized.py
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+"""
+NumPy batch implementations of the indicators in utils.indicators.
+
+Every function takes a sequence (or float64 array) and returns float64
+arrays of the same length, with NaN wherever the list API returns None.
+utils.indicators wraps these to keep its None-padded list interface.
+"""
+
+# Rows of a sliding window processed per block, to bound temporary memory
+_BLOCK_ROWS = 65536
+
+
+def as_array(values):
+    """
+    Return `values` as a 1-D float64 array (no copy if it already is one).
+    """
+    return np.asarray(values, dtype=np.float64)
+
+
+def to_list(arr):
+    """
+    Convert a NaN-padded array back to the None-padded list API.
+    """
+    return [None if v != v else v for v in arr.tolist()]
+
+
+def sma(values, period):
+    """
+    Simple moving average from a single cumulative sum (see sma_matrix).
+    """
+    return sma_matrix(values, [period])[0]
+
+
+def sma_matrix(values, periods):
+    """
+    SMAs for several periods at once, one row per period, all derived from
+    one prefix-sum array. The series is shifted by its first value before
+    summing so prefix sums stay small and the subtraction doesn't lose
+    precision on long histories.
+    """
+    x = as_array(values)
+    out = np.full((len(periods), len(x)), np.nan)
+    if not len(x):
+        return out
+    base = x[0]
+    csum = np.concatenate(([0.0], np.cumsum(x - base)))
+    for row, period in enumerate(periods):
+        if len(x) >= period:
+            out[row, period - 1:] = (csum[period:] - csum[:-period]) / period + base
+    return out
+
+
+def rolling_mean_std(values, period):
+    """
+    Rolling mean and population standard deviation over strided windows.
+    Both come from the same window view so the bands stay consistent.
+    """
+    x = as_array(values)
+    mean = np.full(len(x), np.nan)
+    std = np.full(len(x), np.nan)
+    if len(x) < period:
+        return mean, std
+    windows = sliding_window_view(x, period)
+    for start in range(0, len(windows), _BLOCK_ROWS):
+        w = windows[start:start + _BLOCK_ROWS]
+        m = w.mean(axis=1)
+        mean[start + period - 1:start + period - 1 + len(w)] = m
+        std[start + period - 1:start + period - 1 + len(w)] = np.sqrt(
+            ((w - m[:, None]) ** 2).mean(axis=1)
+        )
+    return mean, std
+
+
+def rolling_std(values, period):
+    """
+    Rolling population standard deviation (statistics.pstdev per window).
+    """
+    return rolling_mean_std(values, period)[1]
+
+
+# EMA blocks: at most this many bars, and short enough that β^-len stays below e^_EMA_LOG_RANGE
+EMA_BLOCK = 4096
+_EMA_LOG_RANGE = 300.0
+
+
+def ema(values, period):
+    """
+    EMA with α = 2/(period+1), seeded with the SMA of the first `period`
+    values. The recurrence is solved in closed form block by block
+    (see _ema_from), so there is no per-bar Python step.
+    """
+    x = as_array(values)
+    out = np.full(len(x), np.nan)
+    if len(x) < period:
+        return out
+    seed = x[:period].sum() / period
+    out[period - 1] = seed
+    out[period:] = _ema_from(x[period:], 2 / (period + 1), seed)
+    return out
+
+
+def _ema_from(x, alpha, prev):
+    """
+    e_t = e_{t-1} + α (x_t - e_{t-1}) over `x`, starting from e = prev.
+    With β = 1 - α, inside a block e_{s+j} = β^(j+1) (prev + α Σ_{i<=j} β^-(i+1) x_{s+i}):
+    one cumsum per block, whose length keeps β^-len finite.
+    """
+    out = np.empty(len(x))
+    beta = 1.0 - alpha
+    if beta <= 0.0:
+        out[:] = x
+        return out
+    block = int(min(EMA_BLOCK, max(1.0, _EMA_LOG_RANGE / -np.log(beta))))
+    powers = beta ** np.arange(1, block + 1)
+    weights = alpha / powers
+    for start in range(0, len(x), block):
+        m = min(block, len(x) - start)
+        seg = powers[:m] * (prev + np.cumsum(x[start:start + m] * weights[:m]))
+        out[start:start + m] = seg
+        prev = seg[-1]
+    return out
+
+
+def true_ranges(high, low, close):
+    """
+    True Range for bars 1..n-1 (the first bar has no previous close).
+    """
+    h, l, c = as_array(high), as_array(low), as_array(close)
+    prev_close = c[:-1]
+    return np.maximum.reduce([
+        h[1:] - l[1:],
+        np.abs(h[1:] - prev_close),
+        np.abs(l[1:] - prev_close),
+    ])
+
+
+def macd(closes, fast_period, slow_period, signal_period):
+    """
+    Return (macd_line, signal_line, histogram) arrays.
+    """
+    macd_line = ema(closes, fast_period) - ema(closes, slow_period)
+    signal_line = np.full(len(macd_line), np.nan)
+    valid = np.flatnonzero(~np.isnan(macd_line))
+    if len(valid):
+        first = valid[0]
+        signal_line[first:] = ema(macd_line[first:], signal_period)
+    return macd_line, signal_line, macd_line - signal_line
+
+
+def bollinger(closes, period=20, num_std_dev=2):
+    """
+    Return (lower_band, middle_sma, upper_band) arrays.
+    """
+    middle, sd = rolling_mean_std(closes, period)
+    return middle - num_std_dev * sd, middle, middle + num_std_dev * sd
+
+
+def atr(high, low, close, period):
+    """
+    Rolling ATR series: at bar i, the mean of the last `period` true ranges
+    (or of all available ones early on), as utils.indicators.atr(bars[:i+1]).
+    """
+    out = np.zeros(len(as_array(close)))
+    trs = true_ranges(high, low, close)
+    if not len(trs):
+        return out
+    csum = np.concatenate(([0.0], np.cumsum(trs)))
+    counts = np.minimum(np.arange(1, len(trs) + 1), period)
+    ends = np.arange(1, len(trs) + 1)
+    out[1:] = (csum[ends] - csum[ends - counts]) / counts
+    return out
+
+
+def rsi(closes, period):
+    """
+    RSI over the last `period` close-to-close changes, gains and losses
+    each averaged over the whole window (the RsiStrategy definition). Window
+    sums are taken per window (not from a running total) so an all-gain
+    window has a loss sum of exactly zero.
+    """
+    x = as_array(closes)
+    out = np.full(len(x), np.nan)
+    if len(x) < period + 1:
+        return out
+    deltas = np.diff(x)
+    gains = sliding_window_view(np.where(deltas > 0, deltas, 0.0), period).sum(axis=1)
+    losses = sliding_window_view(np.where(deltas < 0, -deltas, 0.0), period).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = (gains / period) / (losses / period)
+        out[period:] = np.where(losses == 0, 100.0, 100 - 100 / (1 + rs))
+    return out
+
+
+def crossover(fast, slow, rtol=1e-9):
+    """
+    Crossover events between two series: +1 where `fast` moves from at or
+    below `slow` to above it, -1 for the reverse, 0 otherwise (and wherever
+    either side is NaN). Spreads within `rtol` of `slow` count as equal, so
+    rounding noise in flat markets doesn't read as a cross.
+    Works along the last axis, so 2-D inputs give one event row per pair.
+    """
+    fast, slow = as_array(fast), as_array(slow)
+    diff = fast - slow
+    sign = np.sign(diff)
+    sign[np.abs(diff) <= rtol * np.abs(slow)] = 0
+    valid = ~np.isnan(diff)
+    out = np.zeros(diff.shape, dtype=np.int8)
+    prev, now = sign[..., :-1], sign[..., 1:]
+    both = valid[..., :-1] & valid[..., 1:]
+    out[..., 1:][both & (prev <= 0) & (now > 0)] = 1
+    out[..., 1:][both & (prev >= 0) & (now < 0)] = -1
+    return out
+
+
+def long_positions(events):
+    """
+    Long/flat state per bar from +1/-1 crossover events (along the last
+    axis): a buy enters only when flat and a sell exits only when long, so
+    we're long exactly when the most recent non-zero event was a buy.
+    """
+    idx = np.where(events != 0, np.arange(events.shape[-1]), -1)
+    last = np.maximum.accumulate(idx, axis=-1)
+    latest = np.take_along_axis(events, np.maximum(last, 0), axis=-1)
+    return (last >= 0) & (latest > 0)
+
+
+def ema_rows(rows, periods):
+    """
+    EMA of each row of a 2-D array with its own period, matching ema() per row.
+    Each row may start with NaNs; its EMA is seeded from the SMA of its first
+    `period` valid values. The recurrence advances all rows together, one
+    vectorized step per bar, instead of one Python-level pass per row.
+    """
+    rows = np.asarray(rows, dtype=np.float64)
+    k, n = rows.shape
+    periods = np.asarray(periods)
+    valid = ~np.isnan(rows)
+    first = np.where(valid.any(axis=1), valid.argmax(axis=1), n)
+    seed_at = first + periods - 1
+    alpha = 2 / (periods + 1)
+
+    cols = rows.T.copy()  # (n, k): each bar's values for all rows are contiguous
+    out = np.full((n, k), np.nan)
+    seeds = np.full(k, np.nan)
+    for r in range(k):
+        if seed_at[r] < n:
+            seeds[r] = rows[r, first[r]:seed_at[r] + 1].sum() / periods[r]
+    if not k or seed_at.min() >= n:
+        return out.T.copy()
+
+    start = int(seed_at.min())
+    out[start] = np.where(seed_at == start, seeds, np.nan)
+    for t in range(start + 1, n):
+        prev = out[t - 1]
+        step = (cols[t] - prev) * alpha + prev
+        out[t] = np.where(seed_at == t, seeds, step)
+    return out.T.copy()
+
+
+def bucket_ranges(coarse_ts, fine_ts):
+    """
+    For each coarse bar i, the [lo, hi) slice of `fine_ts` (sorted) with
+    coarse_ts[i] <= ts < coarse_ts[i + 1]; the last bar spans one median step.
+    Consecutive ranges tile the fine series, so hi[i] == lo[i + 1].
+    """
+    coarse_ts = as_array(coarse_ts)
+    step = np.median(np.diff(coarse_ts)) if len(coarse_ts) > 1 else 0.0
+    bounds = np.append(coarse_ts, coarse_ts[-1] + step) if len(coarse_ts) else coarse_ts
+    edges = np.searchsorted(as_array(fine_ts), bounds)
+    return edges[:-1], edges[1:]
+
+
+def range_reduce(values, lo, hi, ufunc):
+    """
+    ufunc-reduction (np.minimum, np.maximum, ...) of values[lo[i]:hi[i]] for
+    consecutive ranges from bucket_ranges, in one reduceat pass; NaN where empty.
+    """
+    values = as_array(values)
+    out = np.full(len(lo), np.nan)
+    full = hi > lo
+    if full.any():
+        out[full] = ufunc.reduceat(values[:hi[full][-1]], lo[full])
+    return out